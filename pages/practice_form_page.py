@@ -1,20 +1,347 @@
-from typing import Dict
+from typing import Dict, List, Mapping, Optional
+import contextlib
+import functools
+import re
 import time
 from pathlib import Path
 import os
 import platform
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import ElementClickInterceptedException
+from selenium.common.exceptions import ElementClickInterceptedException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.keys import Keys
 
+from utils.annotate import RECT_JS, annotation_text
+from utils.command_timing import TimedWait
+from utils.locator_cache import LocatorCache
+from utils.screenshot_writer import grab_screenshot, save_screenshot
+from utils.step_retry import MAX_STEP_RETRIES, TRANSIENT, classify, merge_checkpoint, state_matches
+from utils.wait_engine import WaitEngine
+
+
+# Overlays recorrentes do demoqa removidos em `open()` (banner fixo, âncora de anúncio e rodapé)
+_REMOVE_OVERLAYS_JS = """
+['#fixedban', '#adplus-anchor', 'footer'].forEach(function (sel) {
+  var el = document.querySelector(sel);
+  if (el) { el.remove(); }
+});
+"""
+
+# Comentário (PT-BR): Scripts usados pelo preenchimento em lote (`fill_all`).
+# Os valores são aplicados com o setter nativo de `value` seguido de eventos
+# `input`/`change`, o que faz o React registrar a alteração como digitação real.
+# Componentes react-select recebem o texto e um `keydown` Enter; o datepicker é
+# aberto e preenchido pelos selects de mês/ano e clique no dia.
+_READ_STATE_FN = """
+function () {
+  function v(id) { var e = document.getElementById(id); return e ? e.value : null; }
+  function label(input) {
+    var l = document.querySelector("label[for='" + input.id + "']");
+    return l ? l.textContent.trim() : input.value;
+  }
+  function single(id) {
+    var c = document.getElementById(id); if (!c) return null;
+    var sv = c.querySelector('[class*="singleValue"]');
+    return sv ? sv.textContent.trim() : '';
+  }
+  var g = document.querySelector("input[name='gender']:checked");
+  var hobbies = [];
+  document.querySelectorAll("#hobbiesWrapper input[type='checkbox']").forEach(function (b) {
+    if (b.checked) hobbies.push(label(b));
+  });
+  var subjects = [];
+  document.querySelectorAll('#subjectsContainer [class*="multi-value__label"]').forEach(function (e) {
+    subjects.push(e.textContent.trim());
+  });
+  var up = document.getElementById('uploadPicture');
+  return {
+    first_name: v('firstName'), last_name: v('lastName'), email: v('userEmail'),
+    mobile: v('userNumber'), address: v('currentAddress'), birth_date: v('dateOfBirthInput'),
+    gender: g ? label(g) : '', hobbies: hobbies, subjects: subjects,
+    state: single('state'), city: single('city'),
+    picture: (up && up.files && up.files.length) ? up.files[0].name : ''
+  };
+}
+"""
+
+_FILL_ALL_JS = """
+var r = arguments[0];
+var errors = [];
+function fire(el, type) { el.dispatchEvent(new Event(type, {bubbles: true})); }
+function setValue(el, v) {
+  var proto = (el instanceof HTMLTextAreaElement) ? HTMLTextAreaElement.prototype
+    : (el instanceof HTMLSelectElement) ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+  Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, v);
+  fire(el, 'input'); fire(el, 'change');
+}
+function key(el, name, code) {
+  var ev = new KeyboardEvent('keydown', {key: name, bubbles: true, cancelable: true});
+  try {
+    Object.defineProperty(ev, 'keyCode', {get: function () { return code; }});
+    Object.defineProperty(ev, 'which', {get: function () { return code; }});
+  } catch (e) {}
+  el.dispatchEvent(ev);
+}
+function labelFor(input) { return document.querySelector("label[for='" + input.id + "']"); }
+function text(id, v) {
+  if (v === null || v === undefined) return;
+  var el = document.getElementById(id);
+  if (!el) { errors.push(id); return; }
+  setValue(el, String(v));
+}
+function selectByText(sel, t) {
+  for (var i = 0; i < sel.options.length; i++) {
+    if (sel.options[i].text === t) { setValue(sel, sel.options[i].value); return true; }
+  }
+  return false;
+}
+function pick(input, v) {
+  if (!input) return false;
+  input.focus(); setValue(input, v); key(input, 'Enter', 13);
+  return true;
+}
+text('firstName', r.first_name);
+text('lastName', r.last_name);
+text('userEmail', r.email);
+text('userNumber', r.mobile);
+text('currentAddress', r.address);
+if (r.gender) {
+  var hit = false;
+  document.querySelectorAll("input[name='gender']").forEach(function (radio) {
+    if (radio.value === r.gender) {
+      hit = true;
+      if (!radio.checked) (labelFor(radio) || radio).click();
+    }
+  });
+  if (!hit) errors.push('gender');
+}
+if (r.hobbies) {
+  document.querySelectorAll("#hobbiesWrapper input[type='checkbox']").forEach(function (box) {
+    var lb = labelFor(box);
+    var want = r.hobbies.indexOf(lb ? lb.textContent.trim() : box.value) >= 0;
+    if (box.checked !== want) (lb || box).click();
+  });
+}
+if (r.birth_day) {
+  var dob = document.getElementById('dateOfBirthInput');
+  if (!dob) { errors.push('dateOfBirthInput'); }
+  else {
+    dob.click();
+    var ms = document.querySelector('.react-datepicker__month-select');
+    var ys = document.querySelector('.react-datepicker__year-select');
+    var done = false;
+    if (ms && ys && selectByText(ms, r.birth_month) && selectByText(ys, String(r.birth_year))) {
+      var days = document.querySelectorAll('.react-datepicker__day:not(.react-datepicker__day--outside-month)');
+      for (var d = 0; d < days.length; d++) {
+        if (days[d].textContent.trim() === String(r.birth_day)) { days[d].click(); done = true; break; }
+      }
+    }
+    if (!done) {
+      // Fallback: digitação no formato exibido pelo input ("10 Oct 1990")
+      setValue(dob, r.birth_day + ' ' + String(r.birth_month).slice(0, 3) + ' ' + r.birth_year);
+    }
+    key(dob, 'Escape', 27);
+  }
+}
+if (r.subjects) {
+  var rm = document.querySelectorAll('#subjectsContainer [class*="multi-value__remove"]');
+  for (var j = rm.length - 1; j >= 0; j--) rm[j].click();
+  var si = document.getElementById('subjectsInput');
+  r.subjects.forEach(function (s) { if (!pick(si, s)) errors.push('subjectsInput'); });
+}
+if (r.state && !pick(document.querySelector('#state input'), r.state)) errors.push('state');
+if (r.city && !pick(document.querySelector('#city input'), r.city)) errors.push('city');
+if (document.activeElement && document.activeElement.blur) document.activeElement.blur();
+return {upload: document.getElementById('uploadPicture'), errors: errors, state: (""" + _READ_STATE_FN + """)()};
+"""
+
+
+# Comentário (PT-BR): Funções JS comuns à restauração do formulário (`reset()`)
+# e à restauração de campos antes de repetir uma etapa (`_restore_fields`).
+# `clearSelect` limpa um react-select pelo `clearValue()` da instância,
+# localizada a partir do nó DOM (fiber do React).
+_FORM_HELPERS_JS = """
+function fire(el, type) { el.dispatchEvent(new Event(type, {bubbles: true})); }
+function setValue(el, v) {
+  var proto = (el instanceof HTMLTextAreaElement) ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+  Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, v);
+  fire(el, 'input'); fire(el, 'change');
+}
+function escape(el) {
+  el.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27, bubbles: true}));
+}
+function labelFor(input) { return document.querySelector("label[for='" + input.id + "']"); }
+function clearSelect(container) {
+  if (!container) return;
+  for (var node = container.querySelector('input') || container; node; node = node.parentElement) {
+    var key = Object.keys(node).filter(function (k) {
+      return k.indexOf('__reactFiber$') === 0 || k.indexOf('__reactInternalInstance$') === 0;
+    })[0];
+    if (key) {
+      for (var f = node[key], i = 0; f && i < 30; f = f.return, i++) {
+        if (f.stateNode && typeof f.stateNode.clearValue === 'function') { f.stateNode.clearValue(); return; }
+      }
+      return;
+    }
+    if (node === container) return;
+  }
+}
+"""
+
+# Limpa os campos de uma etapa que falhou (ids de texto e react-selects) e
+# fecha o datepicker, se aberto, antes de repetir a etapa.
+_RESTORE_FIELDS_JS = _FORM_HELPERS_JS + """
+arguments[0].forEach(function (id) {
+  var el = document.getElementById(id);
+  if (el && el.value) setValue(el, '');
+});
+arguments[1].forEach(function (id) { clearSelect(document.getElementById(id)); });
+var dob = document.getElementById('dateOfBirthInput');
+if (dob && document.querySelector('.react-datepicker')) escape(dob);
+if (document.activeElement && document.activeElement.blur) document.activeElement.blur();
+"""
+
+# Comentário (PT-BR): Restaura o formulário ao estado inicial sem recarregar a
+# página (`reset()`). Campos de texto recebem '' com eventos compatíveis com
+# React; hobbies marcados são desmarcados pelo rótulo; chips de subjects são
+# removidos; Estado/Cidade são limpos pelo `clearValue()` do react-select; o upload é
+# esvaziado e a data volta para hoje. Devolve o estado lido na mesma chamada
+# (ou null se a aba não está no formulário), usado como verificação.
+_RESET_JS = """
+var url = arguments[0];
+function norm(u) { return String(u || '').split('#')[0].replace(/\\/$/, ''); }
+var form = document.getElementById('userForm');
+if (!form || norm(window.location.href) !== norm(url)) return null;
+""" + _FORM_HELPERS_JS + """
+var close = document.getElementById('closeLargeModal');
+if (close && close.offsetParent !== null) close.click();
+['firstName', 'lastName', 'userEmail', 'userNumber', 'currentAddress'].forEach(function (id) {
+  var el = document.getElementById(id);
+  if (el && el.value) setValue(el, '');
+});
+document.querySelectorAll("input[name='gender']:checked").forEach(function (radio) {
+  Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'checked').set.call(radio, false);
+  fire(radio, 'change');
+});
+document.querySelectorAll("#hobbiesWrapper input[type='checkbox']").forEach(function (box) {
+  if (box.checked) (labelFor(box) || box).click();
+});
+var rm = document.querySelectorAll('#subjectsContainer [class*="multi-value__remove"]');
+for (var j = rm.length - 1; j >= 0; j--) rm[j].click();
+clearSelect(document.getElementById('city'));
+clearSelect(document.getElementById('state'));
+var up = document.getElementById('uploadPicture');
+if (up && up.value) { up.value = ''; fire(up, 'change'); }
+var dob = document.getElementById('dateOfBirthInput');
+var M = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+var d = new Date();
+var today = (d.getDate() < 10 ? '0' : '') + d.getDate() + ' ' + M[d.getMonth()] + ' ' + d.getFullYear();
+if (dob) {
+  if (dob.value !== today) setValue(dob, today);
+  escape(dob);
+}
+form.classList.remove('was-validated');
+if (document.activeElement && document.activeElement.blur) document.activeElement.blur();
+window.scrollTo(0, 0);
+var state = (""" + _READ_STATE_FN + """)();
+state.today = today;
+return state;
+"""
+
+_PRISTINE_EMPTY = ("first_name", "last_name", "email", "mobile", "address", "gender", "state", "city", "picture")
+
+# Elementos estáticos do formulário: o mesmo nó DOM durante toda a vida da página
+_STATIC_LOCATORS = {
+    name: (By.ID, name)
+    for name in (
+        "firstName", "lastName", "userEmail", "userNumber", "dateOfBirthInput", "subjectsInput",
+        "uploadPicture", "currentAddress", "state", "city", "submit",
+    )
+}
+_STATIC_LOCATORS["state_input"] = (By.CSS_SELECTOR, "#state input")
+_STATIC_LOCATORS["city_input"] = (By.CSS_SELECTOR, "#city input")
+
+
+def _split_multi(value) -> Optional[list]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [v.strip() for v in re.split(r"[;,]", value) if v.strip()]
+    return [str(v) for v in value]
+
+
+def _step(fn):
+    """Atribui os comandos WebDriver emitidos pelo método à etapa de mesmo nome."""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        timeline = getattr(self.driver, "_command_timeline", None)
+        perf = getattr(self.driver, "_perf_recorder", None)
+        with contextlib.ExitStack() as stack:
+            # Etapa corrente: entra no nome das capturas e nos quadros da gravação
+            self._step_names.append(fn.__name__)
+            stack.callback(self._step_names.pop)
+            # Métricas do navegador (--perf-metrics) nas etapas `open`/`submit`;
+            # por fora da etapa da timeline, que não conta a marca e a coleta
+            if perf is not None:
+                stack.enter_context(perf.step(fn.__name__))
+            if timeline is not None:
+                stack.enter_context(timeline.step(fn.__name__))
+            return fn(self, *args, **kwargs)
+    return wrapper
+
+
+# Campos limpos antes de repetir uma etapa: chave do estado -> id do input / do react-select
+_RESTORE_TEXT_IDS = {
+    "first_name": "firstName", "last_name": "lastName", "email": "userEmail",
+    "mobile": "userNumber", "address": "currentAddress", "subjects": "subjectsInput",
+}
+_RESTORE_SELECT_IDS = {"state": "state", "city": "city"}
+
+
+def _retryable(expected):
+    """
+    Repete a etapa a partir do último checkpoint em falhas transitórias.
+
+    `expected(*args, **kwargs)` devolve os valores que a etapa deixa no
+    formulário (chaves de `read_form_state`); após o sucesso eles entram no
+    checkpoint da página. Fica abaixo de `@_step`, então as tentativas contam
+    na mesma etapa da linha do tempo.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            want = expected(*args, **kwargs)
+            attempt = 0
+            while True:
+                try:
+                    result = fn(self, *args, **kwargs)
+                except Exception as exc:
+                    action = self._recover_step(exc, want, attempt)
+                    if action == "raise":
+                        raise
+                    attempt += 1
+                    if action == "applied":
+                        # A falha veio depois de o valor chegar ao formulário
+                        result = None
+                    else:
+                        continue
+                if attempt:
+                    self.waits.record("retry_ok")
+                merge_checkpoint(self._checkpoint, want)
+                return result
+        return wrapper
+    return deco
+
 
 class PracticeFormPage:
     URL = "https://demoqa.com/automation-practice-form"
 
-    def __init__(self, driver, timeout: int = 20):
+    def __init__(self, driver, timeout: int = 20, base_url: Optional[str] = None, evidence: bool = True):
         self.driver = driver
+        # Comentário (PT-BR): Permite apontar para outro host (ex.: réplica local
+        # servida por `utils/local_server.py`). Prioridade: argumento > driver._base_url
+        # (definido em conftest por --form-base-url/--local-site) > URL pública.
+        base = base_url or getattr(driver, "_base_url", None)
+        self.url = self.form_url(base) if base else self.URL
         # Ajusta timeout padrão para ambientes mais lentos (macOS/CI)
         try:
             is_ci = (os.getenv("CI", "").lower() in ("1", "true", "yes")) or (
@@ -29,19 +356,62 @@ class PracticeFormPage:
         effective_timeout = timeout
         if is_macos or is_ci:
             effective_timeout = max(timeout, 40)
-        self.wait = WebDriverWait(driver, effective_timeout)
+        self._timeout = effective_timeout
+        # Comentário (PT-BR): Motor de espera compartilhado pelo driver (conftest
+        # cria um por sessão e reinicia o orçamento a cada teste).
+        self.waits = getattr(driver, "_wait_engine", None)
+        if self.waits is None:
+            self.waits = WaitEngine(driver)
+            try:
+                setattr(driver, "_wait_engine", self.waits)
+            except Exception:
+                pass
+        # Handles dos elementos estáticos (resolvidos em lote após `open()`)
+        self.locators = LocatorCache(self.waits, _STATIC_LOCATORS)
         # Delay configurável entre etapas, vindo do driver (definido em conftest)
         self._delay_s = float(getattr(driver, "_step_delay_seconds", 0.0) or 0.0)
         # Novo: delay específico para screenshots, em segundos
         # Comentário (PT-BR): Este delay é aplicado imediatamente antes da captura
         # da imagem para garantir que elementos tenham sido renderizados.
         self._shot_delay_s = float(getattr(driver, "_shot_delay_seconds", 0.0) or 0.0)
+        # Comentário (PT-BR): Prontidão da captura (--capture-readiness). `fixed`
+        # dorme os delays acima; `settle` espera a página estabilizar (uma chamada
+        # JS limitada a `_settle_timeout_ms`); `presentation` estabiliza e usa os
+        # delays como piso, para demonstrações em ritmo humano.
+        self._readiness = getattr(driver, "_capture_readiness", None) or "fixed"
+        self._settle_timeout_ms = int(getattr(driver, "_settle_timeout_ms", 2000) or 0)
+        # Comentário (PT-BR): Modo de anotação das evidências. `dom` injeta overlay e
+        # estilos na página; `image` lê só o retângulo do elemento e desenha o
+        # destaque na imagem capturada (fora da thread do teste, se houver writer).
+        self._annotation_mode = getattr(driver, "_annotation_mode", None) or "dom"
         # Diretório de screenshots por teste
         self._shots_dir = getattr(driver, "_screenshots_dir", None)
+        # Comentário (PT-BR): `evidence=False` (execuções de volume, ex.: dataset)
+        # desliga as screenshots de etapa e os delays de percepção humana.
+        if not evidence:
+            self._shots_dir = None
+            self._delay_s = self._shot_delay_s = 0.0
         # Identificador do teste atual para correlação
         self._nodeid = getattr(driver, "_current_nodeid", "test")
-        # Contador de etapas
+        # Contador de etapas e pilha das etapas `@_step` em execução
         self._step_idx = 0
+        self._step_names: List[str] = []
+        # Reaproveita a página já carregada em `open()` (desligado por --fresh-page)
+        self._reuse_page = bool(getattr(driver, "_reuse_page", True))
+        # Comentário (PT-BR): Checkpoint das etapas concluídas (valores que devem
+        # estar no formulário) e orçamento global de novas tentativas (--step-retries,
+        # definido em conftest; sem orçamento, as falhas apenas são classificadas).
+        self._checkpoint: Dict[str, object] = {}
+        self._retry_budget = getattr(driver, "_retry_budget", None)
+
+    @classmethod
+    def form_url(cls, base_url: str) -> str:
+        """Monta a URL do formulário a partir de uma URL base (host/porta)."""
+        path = cls.URL.rsplit("/", 1)[-1]
+        base = base_url.rstrip("/")
+        if base.endswith("/" + path):
+            return base
+        return f"{base}/{path}"
 
     def _sanitize(self, s: str) -> str:
         return (
@@ -61,7 +431,7 @@ class PracticeFormPage:
         estará como 'complete', mas mantemos uma espera curta e resiliente.
         """
         try:
-            WebDriverWait(self.driver, timeout_s).until(
+            TimedWait(self.driver, timeout_s).until(
                 lambda d: d.execute_script("return document.readyState") == "complete"
             )
         except Exception:
@@ -69,75 +439,138 @@ class PracticeFormPage:
             # a captura seguirá mesmo assim para não interromper o fluxo.
             pass
 
-    def _pause_and_capture(self, label: str):
-        # Pausa para percepção humana nas ações (se configurada)
-        if self._delay_s and self._delay_s > 0:
-            time.sleep(self._delay_s)
-        # Aguarda página totalmente carregada antes da captura
-        self._wait_page_loaded(timeout_s=5.0)
-        # Aplica delay específico de screenshot, se configurado
-        if self._shot_delay_s and self._shot_delay_s > 0:
-            time.sleep(self._shot_delay_s)
+    def _sleep(self, seconds: float):
+        # Pausas fixas passam pela linha do tempo (se instrumentada) para
+        # separar tempo ocioso de esperas e comandos reais.
+        timeline = getattr(self.driver, "_command_timeline", None)
+        if timeline is not None:
+            timeline.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _pause_and_capture(
+        self,
+        label: str,
+        annotation: Optional[Mapping[str, object]] = None,
+        region: Optional[Mapping[str, float]] = None,
+    ):
+        if self._readiness == "fixed":
+            # Pausa para percepção humana nas ações (se configurada)
+            if self._delay_s and self._delay_s > 0:
+                self._sleep(self._delay_s)
+            # Aguarda página totalmente carregada antes da captura
+            self._wait_page_loaded(timeout_s=5.0)
+            # Aplica delay específico de screenshot, se configurado
+            if self._shot_delay_s and self._shot_delay_s > 0:
+                self._sleep(self._shot_delay_s)
+        elif self._shots_dir:
+            # Espera só o necessário para a página estabilizar (inclui readyState)
+            t0 = time.perf_counter()
+            self.waits.settle(max_ms=self._settle_timeout_ms)
+            if self._readiness == "presentation":
+                remaining = self._delay_s + self._shot_delay_s - (time.perf_counter() - t0)
+                if remaining > 0:
+                    self._sleep(remaining)
         # Captura screenshot de etapa
-        try:
-            if self._shots_dir:
+        method = self._step_names[-1] if self._step_names else None
+        try:
+            recorder = getattr(self.driver, "_step_recorder", None)
+            if self._shots_dir and recorder is not None:
+                # Gravação única por teste (--record-steps): a etapa vira um quadro do APNG
+                b64, _, pending_annotation, _ = grab_screenshot(self.driver, annotation, region)
+                recorder.add_frame(
+                    b64, f"{self._step_idx:02d}_{self._sanitize(label)}", pending_annotation, step=method
+                )
+                self._step_idx += 1
+            elif self._shots_dir:
                 ts = time.strftime("%Y%m%d-%H%M%S")
-                name = f"{self._sanitize(self._nodeid)}_step_{self._step_idx:02d}_{self._sanitize(label)}_{ts}.png"
+                suffix = f"@{method}" if method else ""
+                name = f"{self._sanitize(self._nodeid)}_step_{self._step_idx:02d}_{self._sanitize(label)}{suffix}_{ts}.png"
                 p = Path(self._shots_dir) / name
-                self.driver.save_screenshot(str(p))
+                # Com gravação assíncrona habilitada, só a captura ocorre aqui
+                # `region` permite recortar a captura no elemento (perfis com clip)
+                save_screenshot(self.driver, p, annotation, region)
                 self._step_idx += 1
         except Exception:
             # Evita falhas do teste por causa de captura
             self._step_idx += 1
 
+    @_step
     def open(self):
-        self.driver.get(self.URL)
-        # Comentário (PT-BR): Após navegação, remover overlays recorrentes
-        # e aguardar carregamento do documento.
-        self.driver.execute_script("var b=document.getElementById('fixedban'); if(b){b.remove();}")
-        self.driver.execute_script("var a=document.getElementById('adplus-anchor'); if(a){a.remove();}")
-        self.driver.execute_script("var f=document.querySelector('footer'); if(f){f.remove();}")
+        # Comentário (PT-BR): Se a aba já está no formulário (teste anterior na
+        # mesma sessão), restaura-o no lugar em vez de navegar de novo; o custo
+        # de carregamento da página é pago uma vez por navegador.
+        self._checkpoint = {}
+        if self._reuse_page and self.reset():
+            self.locators.warm()
+            self._pause_and_capture("open")
+            return
+        self.driver.get(self.url)
+        # Comentário (PT-BR): Após navegação, remover overlays recorrentes (uma
+        # única chamada) e aguardar carregamento do documento. Com bloqueio de
+        # requisições (--block-requests) os anúncios nem chegam a ser carregados.
+        self.driver.execute_script(_REMOVE_OVERLAYS_JS)
         self._wait_page_loaded(timeout_s=10.0)
-        # Comentário (PT-BR): Verifica elemento chave da página; se não presente,
-        # faz uma tentativa de atualização para recuperar possíveis travamentos.
-        try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, "dateOfBirthInput"))
-            )
-        except Exception:
+        # Comentário (PT-BR): Verifica os elementos chave (data de nascimento e
+        # telefone, usados cedo) em uma única sonda. Só navega de novo quando o
+        # documento não contém o formulário (navegação falhou); nos demais casos
+        # o wait específico de cada etapa falhará com contexto adequado.
+        key_fields = [(By.ID, "dateOfBirthInput"), (By.ID, "userNumber")]
+        try:
+            self.waits.wait_all(key_fields, "present", timeout=20)
+        except TimeoutException:
             try:
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.ID, "dateOfBirthInput"))
-                )
+                if self.driver.execute_script("return !document.getElementById('userForm');"):
+                    self.waits.record("recover_renavigate")
+                    self.driver.get(self.url)
+                    self._wait_page_loaded(timeout_s=10.0)
+                    self.waits.wait_all(key_fields, "present", timeout=20)
             except Exception:
-                # Comentário (PT-BR): Não interromper aqui; seguiremos e o wait
-                # específico falhará com contexto adequado.
                 pass
-        # Novo: garantir também a presença do campo de telefone, que é usado cedo
+        self.locators.warm()
+        self._pause_and_capture("open")
+
+    @_step
+    def reset(self) -> bool:
+        """
+        Restaura o formulário ao estado inicial sem recarregar a página.
+
+        Uma única chamada JS limpa campos, hobbies, subjects, Estado/Cidade,
+        upload e data (hoje), fecha modal/datepicker abertos e devolve o estado
+        lido, que é conferido aqui. Retorna False se a aba não está no
+        formulário ou se algum campo não voltou ao estado inicial; nesse caso
+        cabe ao chamador navegar de novo (`open()` faz isso automaticamente).
+        """
         try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, "userNumber"))
-            )
+            state = self.driver.execute_script(_RESET_JS, self.url)
         except Exception:
-            try:
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.ID, "userNumber"))
-                )
-            except Exception:
-                pass
-        self._pause_and_capture("open")
+            state = None
+        if not state:
+            return False
+        pristine = (
+            not any(state.get(k) for k in _PRISTINE_EMPTY)
+            and not state.get("hobbies")
+            and not state.get("subjects")
+            and state.get("birth_date") == state.get("today")
+        )
+        self.waits.record("page_reset" if pristine else "page_reset_failed")
+        return pristine
 
     def _annotate_and_capture(self, element, field_label: str, value: str, state: str = "ativo/focado"):
+        if self._annotation_mode == "image":
+            try:
+                rect = self.driver.execute_script(RECT_JS, element)
+            except Exception:
+                rect = None
+            annotation = dict(rect, text=annotation_text(field_label, str(value), state)) if rect else None
+            self._pause_and_capture(f"{self._sanitize(field_label)}", annotation, rect)
+            return
         try:
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", element)
         except Exception:
             pass
         try:
-            overlay_id = self.driver.execute_script(
+            region = self.driver.execute_script(
                 """
                 var el = arguments[0]; var label=arguments[1]; var val=arguments[2]; var st=arguments[3];
                 var r = el.getBoundingClientRect();
@@ -163,7 +596,13 @@ class PracticeFormPage:
                 el.setAttribute('data-shot-prev-boxshadow', prev_boxshadow||'');
                 el.style.outline='2px solid #58a6ff';
                 el.style.boxShadow='0 0 0 3px #58a6ff inset, 0 0 8px rgba(88,166,255,.7)';
-                return id;
+                // Região anotada (elemento + rótulo) para perfis de captura com recorte
+                var lr = ov.getBoundingClientRect();
+                var x0 = Math.min(r.left, lr.left), y0 = Math.min(r.top, lr.top);
+                return {id: id, x: x0, y: y0,
+                        width: Math.max(r.right, lr.right) - x0, height: Math.max(r.bottom, lr.bottom) - y0,
+                        viewport_width: window.innerWidth, viewport_height: window.innerHeight,
+                        scroll_x: window.scrollX, scroll_y: window.scrollY};
                 """,
                 element,
                 field_label,
@@ -171,9 +610,10 @@ class PracticeFormPage:
                 state,
             )
         except Exception:
-            overlay_id = None
+            region = None
+        overlay_id = region.get("id") if isinstance(region, dict) else None
         # Captura com anotação aplicada
-        self._pause_and_capture(f"{self._sanitize(field_label)}")
+        self._pause_and_capture(f"{self._sanitize(field_label)}", region=region)
         # Limpa overlay e restaura estilos
         try:
             self.driver.execute_script(
@@ -191,86 +631,111 @@ class PracticeFormPage:
         except Exception:
             pass
 
-    # --- Fillers ---
-    def fill_name(self, first_name: str, last_name: str):
-        first_el = self.wait.until(EC.visibility_of_element_located((By.ID, "firstName")))
-        first_el.send_keys(first_name)
-        self._annotate_and_capture(first_el, "Nome Completo (Primeiro Nome)", first_name)
+    # --- Novas tentativas por etapa ---
+    def _recover_step(self, exc: BaseException, want: Mapping[str, object], attempt: int) -> str:
+        """
+        Decide como tratar a falha de uma etapa: `raise`, `retry` ou `applied`.
 
-        # Aguarda sobrenome com resiliência (evita travas de rede/resposta do driver)
-        try:
-            last_el = self.wait.until(EC.element_to_be_clickable((By.ID, "lastName")))
-        except Exception:
-            try:
-                # Tentativa de recuperação: refresh e re-wait
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                last_el = self.wait.until(EC.element_to_be_clickable((By.ID, "lastName")))
-            except Exception:
-                # Último recurso: presença simples para não bloquear o fluxo
-                last_el = self.wait.until(EC.presence_of_element_located((By.ID, "lastName")))
+        Comentário (PT-BR): Só falhas transitórias (timeout, stale, clique
+        interceptado) são repetidas, até `MAX_STEP_RETRIES` por chamada e dentro
+        do orçamento global. Antes de repetir, uma leitura do formulário (uma
+        chamada JS) confirma que os valores das etapas anteriores continuam lá;
+        se algo se perdeu, a falha sobe (repetir a etapa não bastaria). Se os
+        valores da própria etapa já estão no formulário, ela é dada como feita;
+        senão, seus campos são limpos e a etapa roda de novo.
+        """
+        category = classify(exc)
+        self.waits.record(f"failure_{category}")
+        budget = self._retry_budget
+        if category not in TRANSIENT or budget is None or budget.total == 0:
+            return "raise"
+        if attempt >= MAX_STEP_RETRIES:
+            self.waits.record("retry_failed")
+            return "raise"
+        if budget.remaining <= 0:
+            self.waits.record("retry_budget_exhausted")
+            return "raise"
+        if self.waits.budget_left is not None and self.waits.budget_left <= 0:
+            # Orçamento de espera do teste esgotado: a repetição falharia de imediato
+            self.waits.record("retry_wait_budget")
+            return "raise"
+        try:
+            state = self.read_form_state()
+        except Exception:
+            state = None
+        if state is None or not all(state_matches(state, k, v) for k, v in self._checkpoint.items()):
+            self.waits.record("retry_checkpoint_lost")
+            return "raise"
+        budget.take()
+        self.waits.record("retries")
+        if all(state_matches(state, k, v) for k, v in want.items()):
+            self.waits.record("retry_applied")
+            return "applied"
+        if category == "stale":
+            self.locators.invalidate()
+        # A etapa roda inteira de novo: limpa todos os seus campos (evita digitar duas vezes)
+        self._restore_fields(want)
+        return "retry"
 
+    def _restore_fields(self, keys) -> None:
+        """Limpa os campos (chaves do estado) deixados pela metade por uma etapa que falhou."""
+        text_ids = [_RESTORE_TEXT_IDS[k] for k in keys if k in _RESTORE_TEXT_IDS]
+        select_ids = [_RESTORE_SELECT_IDS[k] for k in keys if k in _RESTORE_SELECT_IDS]
         try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", last_el)
+            self.driver.execute_script(_RESTORE_FIELDS_JS, text_ids, select_ids)
         except Exception:
             pass
-        try:
-            last_el.click()
-        except Exception:
+
+    # --- Fillers ---
+    def _click_and_type(self, name: str, text: str):
+        """Centraliza, clica (com fallback JS) e digita no elemento estático `name`."""
+        def act(el):
             try:
-                self.driver.execute_script("arguments[0].click();", last_el)
+                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
             except Exception:
                 pass
-        last_el.send_keys(last_name)
+            try:
+                el.click()
+            except ElementClickInterceptedException:
+                try:
+                    self.driver.execute_script("arguments[0].click();", el)
+                except Exception:
+                    pass
+            el.send_keys(text)
+            return el
+
+        return self.locators.run(name, act, "clickable", self._timeout)
+
+    @_step
+    @_retryable(lambda first_name, last_name: {"first_name": first_name, "last_name": last_name})
+    def fill_name(self, first_name: str, last_name: str):
+        def type_first(el):
+            el.send_keys(first_name)
+            return el
+
+        first_el = self.locators.run("firstName", type_first, "visible", self._timeout)
+        self._annotate_and_capture(first_el, "Nome Completo (Primeiro Nome)", first_name)
+
+        # Aguarda sobrenome com resiliência (evita travas de rede/resposta do driver)
+        last_el = self._click_and_type("lastName", last_name)
         self._annotate_and_capture(last_el, "Nome Completo (Sobrenome)", last_name)
 
+    @_step
+    @_retryable(lambda email: {"email": email})
     def fill_email(self, email: str):
-        # Aguarda presença/clicabilidade com recuperação em caso de travas
-        try:
-            el = self.wait.until(EC.element_to_be_clickable((By.ID, "userEmail")))
-        except Exception:
-            try:
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                el = self.wait.until(EC.element_to_be_clickable((By.ID, "userEmail")))
-            except Exception:
-                el = self.wait.until(EC.presence_of_element_located((By.ID, "userEmail")))
-        # Centraliza no viewport e tenta o clique com fallback JS
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-        except Exception:
-            pass
-        try:
-            el.click()
-        except ElementClickInterceptedException:
-            try:
-                self.driver.execute_script("arguments[0].click();", el)
-            except Exception:
-                pass
-        el.send_keys(email)
+        # Handle em cache; centraliza no viewport e tenta o clique com fallback JS
+        el = self._click_and_type("userEmail", email)
         self._annotate_and_capture(el, "E-mail", email)
 
+    @_step
+    @_retryable(lambda gender_label="Male": {"gender": gender_label})
     def select_gender(self, gender_label: str = "Male"):
         # Fecha overlays (ex.: datepicker) e aguarda label com resiliência
         try:
             self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
         except Exception:
             pass
-        try:
-            label = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, f"//label[text()='{gender_label}']"))
-            )
-        except Exception:
-            try:
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                label = self.wait.until(
-                    EC.element_to_be_clickable((By.XPATH, f"//label[text()='{gender_label}']"))
-                )
-            except Exception:
-                label = self.wait.until(
-                    EC.presence_of_element_located((By.XPATH, f"//label[text()='{gender_label}']"))
-                )
+        label = self.waits.clickable((By.XPATH, f"//label[text()='{gender_label}']"), timeout=self._timeout)
         # Centraliza e tenta clicar com fallback JS
         try:
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", label)
@@ -285,52 +750,38 @@ class PracticeFormPage:
                 pass
         self._annotate_and_capture(label, "Gênero", gender_label, state="selecionado")
 
+    @_step
+    @_retryable(lambda number: {"mobile": number})
     def fill_mobile(self, number: str):
-        # Aguarda elemento estar clicável e centraliza no viewport
-        try:
-            el = self.wait.until(EC.element_to_be_clickable((By.ID, "userNumber")))
-        except Exception:
-            # Tentativa de recuperação: refresh + novo wait
-            try:
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                el = self.wait.until(EC.element_to_be_clickable((By.ID, "userNumber")))
-            except Exception:
-                # Como último recurso, tenta presença simples para evitar travas
-                el = self.wait.until(EC.presence_of_element_located((By.ID, "userNumber")))
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-        except Exception:
-            pass
-        try:
-            el.click()
-        except ElementClickInterceptedException:
-            try:
-                self.driver.execute_script("arguments[0].click();", el)
-            except Exception:
-                pass
-        el.send_keys(number)
+        # Handle em cache (ou espera por clicável), centraliza no viewport e digita
+        el = self._click_and_type("userNumber", number)
         self._annotate_and_capture(el, "Telefone", number)
 
+    @_step
+    @_retryable(lambda day, month_text, year: {"birth_date": (day, month_text, year)})
     def set_birth_date(self, day: int, month_text: str, year: int):
         # Abre o datepicker
-        dob = self.wait.until(EC.element_to_be_clickable((By.ID, "dateOfBirthInput")))
-        # Garantir visibilidade e centralização para reduzir interceptações
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", dob)
-        except Exception:
-            pass
-        try:
-            dob.click()
-        except ElementClickInterceptedException:
-            # fallback JS caso algo esteja sobrepondo o input
-            self.driver.execute_script("arguments[0].click();", dob)
+        def open_picker(dob):
+            # Garantir visibilidade e centralização para reduzir interceptações
+            try:
+                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", dob)
+            except Exception:
+                pass
+            try:
+                dob.click()
+            except ElementClickInterceptedException:
+                # fallback JS caso algo esteja sobrepondo o input
+                self.driver.execute_script("arguments[0].click();", dob)
+
+        self.locators.run("dateOfBirthInput", open_picker, "clickable", self._timeout)
         # Seleciona mês e ano
-        month_select = self.wait.until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "react-datepicker__month-select"))
-        )
-        year_select = self.wait.until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "react-datepicker__year-select"))
+        month_select, year_select = self.waits.wait_all(
+            [
+                (By.CLASS_NAME, "react-datepicker__month-select"),
+                (By.CLASS_NAME, "react-datepicker__year-select"),
+            ],
+            "clickable",
+            timeout=self._timeout,
         )
         # Define mês e ano
         month_select.click()
@@ -338,69 +789,71 @@ class PracticeFormPage:
         year_select.click()
         year_select.find_element(By.XPATH, f".//option[text()='{year}']").click()
         # Seleciona dia dentro do mês corrente
-        day_el = self.wait.until(
-            EC.element_to_be_clickable(
-                (
-                    By.XPATH,
-                    f"//div[contains(@class,'react-datepicker__day') and not(contains(@class,'outside-month')) and text()='{day}']",
-                )
-            )
+        day_el = self.waits.clickable(
+            (
+                By.XPATH,
+                f"//div[contains(@class,'react-datepicker__day') and not(contains(@class,'outside-month')) and text()='{day}']",
+            ),
+            timeout=self._timeout,
         )
         day_el.click()
         # Após seleção, anotar no input de Data de Nascimento
         try:
-            dob_input = self.driver.find_element(By.ID, "dateOfBirthInput")
+            dob_input = self.locators.element("dateOfBirthInput", timeout=self._timeout)
             val = f"{day} {month_text},{year}"
             self._annotate_and_capture(dob_input, "Data de Nascimento", val)
         except Exception:
             self._pause_and_capture("set_birth_date")
 
+    @_step
+    @_retryable(lambda subject_text: {"subjects": subject_text})
     def add_subject(self, subject_text: str):
         # Fecha qualquer overlay remanescente (ex.: datepicker) antes de focar
         try:
             self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
         except Exception:
             pass
-        # Aguarda elemento clicável com recuperação em caso de travas
-        try:
-            subj = self.wait.until(EC.element_to_be_clickable((By.ID, "subjectsInput")))
-        except Exception:
+        # Handle em cache (ou espera por clicável); centraliza, clica e digita
+        def type_subject(subj):
             try:
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                subj = self.wait.until(EC.element_to_be_clickable((By.ID, "subjectsInput")))
+                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", subj)
             except Exception:
-                subj = self.wait.until(EC.presence_of_element_located((By.ID, "subjectsInput")))
-        # Centraliza e tenta clicar com fallback JS
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", subj)
-        except Exception:
-            pass
-        try:
-            subj.click()
-        except ElementClickInterceptedException:
+                pass
+            try:
+                subj.click()
+            except ElementClickInterceptedException:
+                try:
+                    self.driver.execute_script("arguments[0].click();", subj)
+                except Exception:
+                    pass
+            # Digita e confirma com ENTER
+            subj.send_keys(subject_text)
             try:
-                self.driver.execute_script("arguments[0].click();", subj)
+                subj.send_keys(Keys.ENTER)
+            except StaleElementReferenceException:
+                raise
             except Exception:
-                pass
-        # Digita e confirma com ENTER
-        subj.send_keys(subject_text)
-        try:
-            subj.send_keys(Keys.ENTER)
-        except Exception:
-            subj.send_keys("\n")
+                subj.send_keys("\n")
+            return subj
+
+        subj = self.locators.run("subjectsInput", type_subject, "clickable", self._timeout)
         self._annotate_and_capture(subj, "Matéria", subject_text)
 
+    @_step
+    @_retryable(lambda hobby_label="Sports": {"hobbies": hobby_label})
     def check_hobby(self, hobby_label: str = "Sports"):
-        label = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, f"//label[text()='{hobby_label}']"))
-        )
+        label = self.waits.clickable((By.XPATH, f"//label[text()='{hobby_label}']"), timeout=self._timeout)
         label.click()
         self._annotate_and_capture(label, "Hobby", hobby_label, state="selecionado")
 
+    @_step
+    @_retryable(lambda file_path: {"picture": file_path})
     def upload_picture(self, file_path: str):
-        el = self.wait.until(EC.presence_of_element_located((By.ID, "uploadPicture")))
-        el.send_keys(file_path)
+        def attach(el):
+            el.send_keys(file_path)
+            return el
+
+        el = self.locators.run("uploadPicture", attach, "present", self._timeout)
         try:
             from pathlib import Path as _P
             fname = _P(file_path).name
@@ -408,108 +861,82 @@ class PracticeFormPage:
             fname = file_path
         self._annotate_and_capture(el, "Upload de Arquivo", fname, state="selecionado")
 
+    @_step
+    @_retryable(lambda address: {"address": address})
     def fill_address(self, address: str):
-        # Aguarda presença/clicabilidade para reduzir falhas em ambientes lentos
-        try:
-            el = self.wait.until(EC.element_to_be_clickable((By.ID, "currentAddress")))
-        except Exception:
-            try:
-                self.driver.refresh()
-                self._wait_page_loaded(timeout_s=10.0)
-                el = self.wait.until(EC.element_to_be_clickable((By.ID, "currentAddress")))
-            except Exception:
-                el = self.wait.until(EC.presence_of_element_located((By.ID, "currentAddress")))
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-        except Exception:
-            pass
-        try:
-            el.click()
-        except Exception:
+        # Handle em cache (ou espera por clicável) para reduzir falhas em ambientes lentos
+        el = self._click_and_type("currentAddress", address)
+        self._annotate_and_capture(el, "Endereço", address)
+
+    def _choose_option(self, name: str, text: str):
+        """Abre o React-Select `name` (Estado/Cidade), digita o texto e confirma."""
+        def open_select(container):
             try:
-                self.driver.execute_script("arguments[0].click();", el)
+                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", container)
             except Exception:
                 pass
-        el.send_keys(address)
-        self._annotate_and_capture(el, "Endereço", address)
+            try:
+                # Primeiro tenta clicar normalmente
+                container.click()
+            except ElementClickInterceptedException:
+                # Fallback via JS em caso de overlay/interceptação
+                self.driver.execute_script("arguments[0].click();", container)
 
-    def select_state(self, state_text: str):
-        # Abre o combo React-Select com maior robustez
-        state_container = self.wait.until(EC.presence_of_element_located((By.ID, "state")))
-        try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", state_container)
-        except Exception:
-            pass
-        try:
-            # Primeiro tenta clicar normalmente
-            self.wait.until(EC.element_to_be_clickable((By.ID, "state"))).click()
-        except ElementClickInterceptedException:
-            # Fallback via JS em caso de overlay/interceptação
-            self.driver.execute_script("arguments[0].click();", state_container)
+        def type_option(internal_input):
+            internal_input.send_keys(text)
+            # Confirma seleção
+            internal_input.send_keys("\n")
 
+        self.locators.run(name, open_select, "clickable", self._timeout)
         # React-Select fornece um input interno; digita o texto e confirma com ENTER
         try:
-            internal_input = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#state input"))
-            )
-            internal_input.send_keys(state_text)
-            # Confirma seleção
-            internal_input.send_keys("\n")
+            self.locators.run(f"{name}_input", type_option, "present", self._timeout)
         except Exception:
             # Fallback: selecionar pelo texto visível do option
-            option = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, f"//div[contains(@id,'option') and text()='{state_text}']"))
+            option = self.waits.clickable(
+                (By.XPATH, f"//div[contains(@id,'option') and text()='{text}']"), timeout=self._timeout
             )
             option.click()
+
+    @_step
+    @_retryable(lambda state_text: {"state": state_text})
+    def select_state(self, state_text: str):
+        # Abre o combo React-Select com maior robustez
+        self._choose_option("state", state_text)
         try:
-            el_state = self.driver.find_element(By.ID, "state")
+            el_state = self.locators.element("state", timeout=self._timeout)
             self._annotate_and_capture(el_state, "Estado", state_text, state="selecionado")
         except Exception:
             self._pause_and_capture(f"select_state_{self._sanitize(state_text)}")
 
+    @_step
+    @_retryable(lambda city_text: {"city": city_text})
     def select_city(self, city_text: str):
-        city_container = self.wait.until(EC.presence_of_element_located((By.ID, "city")))
+        self._choose_option("city", city_text)
         try:
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", city_container)
-        except Exception:
-            pass
-        try:
-            self.wait.until(EC.element_to_be_clickable((By.ID, "city"))).click()
-        except ElementClickInterceptedException:
-            self.driver.execute_script("arguments[0].click();", city_container)
-
-        try:
-            internal_input = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#city input"))
-            )
-            internal_input.send_keys(city_text)
-            internal_input.send_keys("\n")
-        except Exception:
-            option = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, f"//div[contains(@id,'option') and text()='{city_text}']"))
-            )
-            option.click()
-        try:
-            el_city = self.driver.find_element(By.ID, "city")
+            el_city = self.locators.element("city", timeout=self._timeout)
             self._annotate_and_capture(el_city, "Cidade", city_text, state="selecionado")
         except Exception:
             self._pause_and_capture(f"select_city_{self._sanitize(city_text)}")
 
+    @_step
     def submit(self):
-        submit_btn = self.wait.until(EC.element_to_be_clickable((By.ID, "submit")))
-        try:
-            submit_btn.click()
-        except ElementClickInterceptedException:
-            # fallback JS caso algo ainda esteja sobrepondo
-            self.driver.execute_script("arguments[0].click();", submit_btn)
+        def click(submit_btn):
+            try:
+                submit_btn.click()
+            except ElementClickInterceptedException:
+                # fallback JS caso algo ainda esteja sobrepondo
+                self.driver.execute_script("arguments[0].click();", submit_btn)
+
+        self.locators.run("submit", click, "clickable", self._timeout)
         self._pause_and_capture("submit")
 
+    @_step
     def get_submission_table(self) -> Dict[str, str]:
         # Aguarda modal
-        self.wait.until(EC.visibility_of_element_located((By.ID, "example-modal-sizes-title-lg")))
-        rows = self.wait.until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table tbody tr"))
-        )
+        self.waits.visible((By.ID, "example-modal-sizes-title-lg"), timeout=self._timeout)
+        self.waits.present((By.CSS_SELECTOR, "table tbody tr"), timeout=self._timeout)
+        rows = self.driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
         result = {}
         for r in rows:
             cols = r.find_elements(By.TAG_NAME, "td")
@@ -520,8 +947,53 @@ class PracticeFormPage:
         self._pause_and_capture("submission_table")
         return result
 
+    @_step
     def close_modal(self):
         # fecha modal se necessário
-        close_btn = self.wait.until(EC.element_to_be_clickable((By.ID, "closeLargeModal")))
+        close_btn = self.waits.clickable((By.ID, "closeLargeModal"), timeout=self._timeout)
         close_btn.click()
-        self._pause_and_capture("close_modal")
\ No newline at end of file
+        self._pause_and_capture("close_modal")
+
+    # --- Preenchimento em lote ---
+    @_step
+    def fill_all(self, record: Mapping[str, object], capture: bool = True) -> Dict[str, object]:
+        """
+        Preenche todo o formulário em poucas chamadas ao WebDriver.
+
+        Comentário (PT-BR): Um único `execute_script` aplica todos os campos com
+        eventos compatíveis com React (inclusive react-select de Estado/Cidade e
+        datepicker); o upload usa um `send_keys` no input de arquivo. Indicado para
+        execuções de volume; os métodos por campo seguem disponíveis para evidência
+        passo a passo.
+
+        Chaves aceitas em `record`: first_name, last_name, email, gender, mobile,
+        birth_day, birth_month, birth_year, subjects, hobbies, picture, address,
+        state, city. `subjects`/`hobbies` aceitam lista ou texto separado por `;`/`,`.
+        Chaves ausentes deixam o campo como está.
+
+        Retorna o estado lido do formulário após o preenchimento.
+        """
+        payload = {k: record.get(k) for k in (
+            "first_name", "last_name", "email", "gender", "mobile", "address", "state", "city",
+            "birth_day", "birth_month", "birth_year",
+        )}
+        payload["subjects"] = _split_multi(record.get("subjects"))
+        payload["hobbies"] = _split_multi(record.get("hobbies"))
+        result = self.driver.execute_script(_FILL_ALL_JS, payload) or {}
+        errors = list(result.get("errors") or [])
+        if errors:
+            raise ValueError(f"Campos não encontrados no formulário: {', '.join(errors)}")
+        state = dict(result.get("state") or {})
+        picture = record.get("picture")
+        if picture:
+            upload = result.get("upload") or self.locators.element("uploadPicture", timeout=self._timeout)
+            upload.send_keys(str(picture))
+            state["picture"] = Path(str(picture)).name
+        if capture:
+            self._pause_and_capture("fill_all")
+        return state
+
+    @_step
+    def read_form_state(self) -> Dict[str, object]:
+        """Lê os valores atuais de todos os campos em uma única chamada."""
+        return dict(self.driver.execute_script("return (" + _READ_STATE_FN + ")();") or {})
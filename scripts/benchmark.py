@@ -0,0 +1,244 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pages.practice_form_page import PracticeFormPage  # noqa: E402
+from utils.driver_factory import build_chrome_driver  # noqa: E402
+from utils.file_utils import create_temp_jpg  # noqa: E402
+from utils.local_server import LATENCY_PROFILES, LocalPracticeFormServer  # noqa: E402
+from utils.request_blocking import apply_request_blocking, parse_blocklist  # noqa: E402
+from utils.stats import summarize  # noqa: E402
+
+
+DEFAULT_BASELINE = ROOT / "reports" / "benchmark" / "baseline.json"
+
+# Campos que precisam coincidir para que a baseline seja comparável
+BASELINE_KEYS = ("target", "mode", "latency", "block_requests", "fresh_page")
+
+# Códigos de saída: 0 = ok; 1 = iteração com falha ou regressão; 2 = baseline
+# incompatível (comparação recusada) ou não gravada por causa de falhas
+EXIT_OK, EXIT_REGRESSION, EXIT_BASELINE = 0, 1, 2
+
+# Mesmos dados do teste E2E passo a passo
+RECORD = {
+    "first_name": "João",
+    "last_name": "da Silva",
+    "email": "joao@email.com",
+    "gender": "Male",
+    "mobile": "9999999999",
+    "birth_day": 10,
+    "birth_month": "October",
+    "birth_year": 1990,
+    "subjects": ["Maths"],
+    "hobbies": ["Sports"],
+    "address": "Rua dos Testes, 123",
+    "state": "NCR",
+    "city": "Delhi",
+}
+
+
+def _reset(page: PracticeFormPage) -> bool:
+    """Restaura o formulário como `open()` faz ao reaproveitar a página (reset + cache aquecido)."""
+    if not page.reset():
+        return False
+    page.locators.warm()
+    return True
+
+
+def _steps(page: PracticeFormPage, mode: str, picture: str, reuse: bool = False):
+    """Sequência (nome, chamada) de uma iteração do fluxo."""
+    r = RECORD
+    # Comentário (PT-BR): `open` mede sempre o carregamento da página; com a
+    # página reaproveitada a iteração começa por `reset` (restauração no lugar).
+    first = ("reset", lambda: _reset(page)) if reuse else ("open", page.open)
+    if mode == "bulk":
+        return [
+            first,
+            ("fill_all", lambda: page.fill_all(dict(r, picture=picture), capture=False)),
+            ("submit", page.submit),
+            ("get_submission_table", page.get_submission_table),
+            ("close_modal", page.close_modal),
+        ]
+    return [
+        first,
+        ("fill_name", lambda: page.fill_name(r["first_name"], r["last_name"])),
+        ("fill_email", lambda: page.fill_email(r["email"])),
+        ("select_gender", lambda: page.select_gender(r["gender"])),
+        ("fill_mobile", lambda: page.fill_mobile(r["mobile"])),
+        ("set_birth_date", lambda: page.set_birth_date(r["birth_day"], r["birth_month"], r["birth_year"])),
+        ("add_subject", lambda: page.add_subject(r["subjects"][0])),
+        ("check_hobby", lambda: page.check_hobby(r["hobbies"][0])),
+        ("upload_picture", lambda: page.upload_picture(picture)),
+        ("fill_address", lambda: page.fill_address(r["address"])),
+        ("select_state", lambda: page.select_state(r["state"])),
+        ("select_city", lambda: page.select_city(r["city"])),
+        ("submit", page.submit),
+        ("get_submission_table", page.get_submission_table),
+        ("close_modal", page.close_modal),
+    ]
+
+
+def run_iteration(driver, base_url, mode: str, picture: str, reuse: bool = False):
+    """Executa o fluxo uma vez; retorna ({etapa: segundos}, erro ou None)."""
+    page = PracticeFormPage(driver, base_url=base_url)
+    timings = {}
+    t_start = time.perf_counter()
+    for name, call in _steps(page, mode, picture, reuse):
+        t0 = time.perf_counter()
+        try:
+            result = call()
+            if name == "reset" and not result:
+                # Formulário não restaurado (aba em outra página): navega e mede como `open`
+                name, t0 = "open", time.perf_counter()
+                page.open()
+        except Exception as e:
+            return timings, f"{name}: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        timings[name] = time.perf_counter() - t0
+        if name == "get_submission_table" and result.get("Student Name") != f"{RECORD['first_name']} {RECORD['last_name']}":
+            return timings, f"{name}: tabela de submissão inesperada: {result}"
+    timings["total"] = time.perf_counter() - t_start
+    return timings, None
+
+
+def baseline_mismatch(current: dict, baseline: dict):
+    """Campos de configuração que diferem da baseline ([(campo, baseline, atual)])."""
+    return [(k, baseline.get(k), current.get(k)) for k in BASELINE_KEYS if baseline.get(k) != current.get(k)]
+
+
+def compare(current: dict, baseline: dict, metric: str, threshold: float, min_delta: float):
+    """Lista de regressões (etapa, base, atual, variação) acima do limite."""
+    regressions = []
+    for step, cur in current["steps"].items():
+        base = baseline.get("steps", {}).get(step)
+        if not base or not base.get("count"):
+            continue
+        b, c = float(base[metric]), float(cur[metric])
+        if c > b * (1.0 + threshold) and (c - b) >= min_delta:
+            regressions.append((step, b, c, (c - b) / b if b else float("inf")))
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark do fluxo E2E do formulário (tempos por etapa e percentis)")
+    ap.add_argument("-n", "--iterations", type=int, default=10)
+    ap.add_argument("--warmup", type=int, default=1, help="Iterações descartadas antes da medição (padrão: 1)")
+    ap.add_argument("--mode", choices=("steps", "bulk"), default="steps", help="steps = métodos por campo; bulk = fill_all")
+    target = ap.add_mutually_exclusive_group()
+    target.add_argument("--local", action="store_true", help="Usa a réplica local do formulário")
+    target.add_argument("--base-url", default=None, help="URL base alternativa (padrão: demoqa.com)")
+    ap.add_argument("--latency", default="none", help=f"Latência da réplica local: {', '.join(LATENCY_PROFILES)} ou <base_ms>:<jitter_ms>")
+    ap.add_argument("--headed", action="store_true")
+    ap.add_argument(
+        "--fresh-page",
+        action="store_true",
+        help="Navega em toda iteração (sem reaproveitar a página); sem a opção, as iterações seguintes medem `reset`",
+    )
+    ap.add_argument("--block-requests", default=None, help="Bloqueio de requisições via CDP (ex.: ads,analytics; ver tests/conftest.py)")
+    ap.add_argument("--output", default=None, help="JSON desta execução (padrão: reports/benchmark/<timestamp>.json)")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    ap.add_argument("--save-baseline", action="store_true", help="Grava esta execução como nova baseline")
+    ap.add_argument("--metric", choices=("p50", "p95", "p99", "mean"), default="p95")
+    ap.add_argument("--threshold", type=float, default=0.20, help="Regressão tolerada sobre a baseline (0.20 = +20%%)")
+    ap.add_argument("--min-delta", type=float, default=0.05, help="Diferença mínima em segundos para contar regressão")
+    ns = ap.parse_args(argv)
+
+    server = LocalPracticeFormServer(ns.latency).start() if ns.local else None
+    base_url = server.base_url if server else ns.base_url
+    target_url = PracticeFormPage.form_url(base_url) if base_url else PracticeFormPage.URL
+    picture = create_temp_jpg()
+    samples = {}
+    failures = []
+    print(
+        f"[bench] Alvo: {target_url} | modo={ns.mode} | página={'nova' if ns.fresh_page else 'reaproveitada'} | "
+        f"iterações={ns.iterations} (+{ns.warmup} aquecimento)"
+    )
+
+    driver = build_chrome_driver(headed=ns.headed)
+    # `open()` sempre navega; o reaproveitamento é medido à parte, na etapa `reset`
+    driver._reuse_page = False
+    apply_request_blocking(driver, parse_blocklist(ns.block_requests))
+    try:
+        for i in range(ns.warmup + ns.iterations):
+            timings, error = run_iteration(driver, base_url, ns.mode, picture, reuse=not ns.fresh_page and i > 0)
+            label = "aquecimento" if i < ns.warmup else f"{i - ns.warmup + 1}/{ns.iterations}"
+            if error:
+                print(f"[bench] Iteração {label}: FALHA ({error})")
+                if i >= ns.warmup:
+                    failures.append(error)
+                continue
+            print(f"[bench] Iteração {label}: {timings['total']:.2f}s")
+            if i >= ns.warmup:
+                for step, secs in timings.items():
+                    samples.setdefault(step, []).append(secs)
+    finally:
+        driver.quit()
+        if server is not None:
+            server.stop()
+
+    result = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        # Comentário (PT-BR): A réplica local sobe em porta efêmera a cada execução;
+        # a chave da baseline usa só o caminho (a latência já é um campo à parte).
+        "target": f"local:{urlparse(target_url).path}" if ns.local else target_url,
+        "url": target_url,
+        "local": bool(ns.local),
+        "latency": ns.latency if ns.local else None,
+        "mode": ns.mode,
+        "block_requests": ns.block_requests,
+        "fresh_page": bool(ns.fresh_page),
+        "iterations": ns.iterations,
+        "failures": failures,
+        "platform": {"system": platform.system(), "release": platform.release(), "python": platform.python_version()},
+        "steps": {step: summarize(values) for step, values in samples.items()},
+    }
+    out = Path(ns.output) if ns.output else ROOT / "reports" / "benchmark" / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    print(f"\n{'etapa':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'máx':>9}")
+    for step, st in result["steps"].items():
+        print(f"{step:<22}{st['p50']:>8.3f}s{st['p95']:>8.3f}s{st['p99']:>8.3f}s{st['max']:>8.3f}s")
+    print(f"[bench] Resultado: {out} | falhas={len(failures)}")
+
+    exit_code = EXIT_REGRESSION if failures else EXIT_OK
+    baseline_path = Path(ns.baseline)
+    if baseline_path.is_file() and not ns.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        mismatch = baseline_mismatch(result, baseline)
+        if mismatch:
+            # Comentário (PT-BR): Tempos de outro alvo/modo não dizem nada sobre
+            # esta execução; comparar geraria regressões (ou aprovações) falsas.
+            print(f"[bench] Comparação recusada: baseline {baseline_path} é de outra configuração:")
+            for key, b, c in mismatch:
+                print(f"  {key}: baseline={b!r} atual={c!r}")
+            print("[bench] Grave uma baseline para esta configuração com --save-baseline (ou use --baseline <arquivo>)")
+            return EXIT_BASELINE
+        regressions = compare(result, baseline, ns.metric, ns.threshold, ns.min_delta)
+        if regressions:
+            exit_code = EXIT_REGRESSION
+            print(f"[bench] REGRESSÃO ({ns.metric} > baseline +{ns.threshold:.0%}):")
+            for step, b, c, pct in regressions:
+                print(f"  {step}: {b:.3f}s -> {c:.3f}s ({pct:+.0%})")
+        else:
+            print(f"[bench] Sem regressões de {ns.metric} acima de {ns.threshold:.0%} em relação a {baseline_path}")
+    if ns.save_baseline:
+        if failures:
+            print(f"[bench] Baseline NÃO gravada: {len(failures)} iteração(ões) falharam")
+            return EXIT_BASELINE
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(result, ensure_ascii=False, indent=1), encoding="utf-8")
+        print(f"[bench] Baseline gravada em {baseline_path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.browser_daemon import BrowserDaemon  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Gerencia o navegador persistente (chromedriver + Chrome) reaproveitado pelo pytest com --reuse-browser"
+    )
+    ap.add_argument("action", choices=("start", "stop", "restart", "status"))
+    ap.add_argument("--headed", action="store_true", help="Sessão com janela visível (padrão: headless)")
+    ap.add_argument("--slot", default="main", help="Nome do daemon (padrão: main; workers do xdist usam gw0, gw1, ...)")
+    ns = ap.parse_args(argv)
+
+    daemon = BrowserDaemon(slot=ns.slot, headed=ns.headed)
+    if ns.action in ("stop", "restart"):
+        stopped = daemon.stop()
+        print(f"[Daemon] {ns.slot}: {'encerrado' if stopped else 'nenhum daemon registrado'}")
+    if ns.action in ("start", "restart"):
+        st = daemon.start()
+        stats = daemon.stats()
+        origin = "novo chromedriver" if stats["launches"] else ("nova sessão" if stats["new_sessions"] else "sessão existente")
+        print(f"[Daemon] {ns.slot}: {st.get('url')} sessão={st.get('session_id')} ({origin})")
+    if ns.action == "status":
+        st = daemon.status()
+        if not st.get("url"):
+            print(f"[Daemon] {ns.slot}: não iniciado")
+            return 1
+        print(
+            f"[Daemon] {ns.slot}: {'no ar' if st['running'] else 'parado'} | {st['url']} pid={st.get('pid')} "
+            f"sessão={st.get('session_id')} headed={st.get('headed')} desde={st.get('created_at')}"
+        )
+        return 0 if st["running"] else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
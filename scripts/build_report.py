@@ -0,0 +1,49 @@
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.report_builder import ReportBuilder  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Gera (incrementalmente) reports/summary.html a partir do JUnit XML, das screenshots e das linhas do tempo"
+    )
+    ap.add_argument("--reports-dir", default=str(ROOT / "reports"))
+    ap.add_argument("--screenshots-dir", default=str(ROOT / "screenshots"))
+    ap.add_argument("--timeline-dir", default=None, help="Linhas do tempo de --instrument (padrão: <reports-dir>/timeline)")
+    ap.add_argument(
+        "--junit",
+        action="append",
+        default=None,
+        help="Arquivo JUnit XML (repetível; padrão: <reports-dir>/junit*.xml)",
+    )
+    ap.add_argument("--workers", type=int, default=None, help="Processos para gerar miniaturas (padrão: núcleos da CPU)")
+    ap.add_argument("--thumb-width", type=int, default=320, help="Largura das miniaturas em px (padrão: 320)")
+    ap.add_argument("--recent-runs", type=int, default=30, help="Execuções listadas no histórico do resumo (padrão: 30)")
+    ns = ap.parse_args(argv)
+
+    builder = ReportBuilder(
+        ns.reports_dir,
+        ns.screenshots_dir,
+        timeline_dir=ns.timeline_dir,
+        junit_files=[Path(p) for p in ns.junit] if ns.junit else None,
+        workers=ns.workers,
+        thumb_width=ns.thumb_width,
+        recent_runs=ns.recent_runs,
+    )
+    st = builder.build()
+    print(
+        f"[Report] {Path(ns.reports_dir) / 'summary.html'}: execuções={st['runs']} (novas={st['runs_new']}) "
+        f"imagens={st['images']} miniaturas novas={st['thumbs_new']} reaproveitadas={st['thumbs_reused']} "
+        f"erros={st['thumb_errors']} páginas escritas={st['pages_written']} em {st['elapsed_s']:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,18 @@
+import argparse
+import codecs
+import html as html_lib
+import json
+import os
 import re
 import sys
+import threading
 import time
-from urllib.parse import urljoin, urlparse
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 PAGES = [
@@ -12,30 +21,298 @@ PAGES = [
     "reports/cases.html",
 ]
 
+DEFAULT_CACHE = Path(__file__).resolve().parents[1] / "reports" / ".link_cache.json"
 
-def find_links(html: str):
-    # capture full <a ...> tags and attributes
-    links = []
-    for m in re.finditer(r"<a[^>]+>", html, flags=re.IGNORECASE):
-        tag = m.group(0)
-        href_m = re.search(r"href\s*=\s*['\"]([^'\"]+)['\"]", tag, flags=re.IGNORECASE)
-        if not href_m:
-            continue
-        href = href_m.group(1)
-        target_m = re.search(r"target\s*=\s*['\"]([^'\"]+)['\"]", tag, flags=re.IGNORECASE)
-        rel_m = re.search(r"rel\s*=\s*['\"]([^'\"]+)['\"]", tag, flags=re.IGNORECASE)
-        aria_m = re.search(r"aria-label\s*=\s*['\"]([^'\"]+)['\"]", tag, flags=re.IGNORECASE)
-        links.append({
+# HEAD responses that do not say anything about the resource; retry with GET
+HEAD_FALLBACK_STATUS = {403, 405, 501}
+
+
+_TAG_DELIM = re.compile(r"[\"'>]")
+_ATTR_RE = re.compile(r"""([^\s"'>/=]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_RAW_TEXT_END = {"script": re.compile(r"</script", re.IGNORECASE), "style": re.compile(r"</style", re.IGNORECASE)}
+_LOOKAHEAD = 8
+
+
+class LinkStreamParser:
+    """
+    Incremental `<a>` extractor for arbitrarily large HTML.
+
+    Text is fed in chunks; only the text of the current `<a ...>` tag is kept
+    (capped at `max_tag` chars). Everything else - other tags and their
+    attribute values (e.g. megabytes of base64 `src`/`data-*`), comments and
+    script/style bodies - is skipped with `str.find`/regex scans and never
+    accumulated, so memory stays flat regardless of document size.
+    """
+
+    def __init__(self, max_tag: int = 64 * 1024):
+        self.max_tag = max_tag
+        self._pending = ""
+        self._state = "text"
+        self._quote = None
+        self._end = None
+        self._tag = []
+        self._tag_len = 0
+
+    def feed(self, data: str, final: bool = False):
+        """Consumes a chunk and returns the links completed within it."""
+        buf = self._pending + data
+        self._pending = ""
+        out = []
+        i, n = 0, len(buf)
+        while i < n:
+            state = self._state
+            if state == "text":
+                j = buf.find("<", i)
+                if j < 0:
+                    break
+                head = buf[j + 1:j + 1 + _LOOKAHEAD]
+                if len(head) < _LOOKAHEAD and not final:
+                    # Not enough text to classify the tag; wait for the next chunk
+                    self._pending = buf[j:]
+                    return out
+                low = head.lower()
+                if low.startswith("!--"):
+                    self._state, self._end, i = "skip", "-->", j + 4
+                elif low.startswith("script") or low.startswith("style"):
+                    name = "script" if low.startswith("script") else "style"
+                    self._state, self._end, i = "raw", name, j + 1 + len(name)
+                elif low[:1] == "a" and (len(low) == 1 or low[1] in " \t\r\n/>"):
+                    self._state, self._tag, self._tag_len, i = "a_tag", ["<a"], 2, j + 2
+                else:
+                    self._state, i = "tag", j + 1
+            elif state in ("tag", "a_tag"):
+                if self._quote:
+                    k = buf.find(self._quote, i)
+                    stop = n if k < 0 else k + 1
+                    self._keep(buf, i, stop)
+                    if k >= 0:
+                        self._quote = None
+                    i = stop
+                    continue
+                m = _TAG_DELIM.search(buf, i)
+                stop = n if m is None else m.end()
+                self._keep(buf, i, stop)
+                i = stop
+                if m is None:
+                    continue
+                if m.group() == ">":
+                    if state == "a_tag":
+                        link = self._link("".join(self._tag))
+                        if link is not None:
+                            out.append(link)
+                        self._tag, self._tag_len = [], 0
+                    self._state = "text"
+                else:
+                    self._quote = m.group()
+            elif state == "skip":
+                k = buf.find(self._end, i)
+                if k < 0:
+                    # Keep a tail in case the terminator is split across chunks
+                    self._pending = buf[max(i, n - len(self._end) + 1):]
+                    return out
+                self._state, i = "text", k + len(self._end)
+            else:  # raw text element (script/style): skip to its end tag
+                m = _RAW_TEXT_END[self._end].search(buf, i)
+                if m is None:
+                    self._pending = buf[max(i, n - len(self._end) - 1):]
+                    return out
+                self._state, i = "tag", m.end()
+        return out
+
+    def close(self):
+        """Flushes buffered lookahead at end of document."""
+        return self.feed("", final=True)
+
+    def _keep(self, buf: str, start: int, stop: int) -> None:
+        if self._state != "a_tag" or self._tag_len >= self.max_tag:
+            return
+        piece = buf[start:min(stop, start + self.max_tag - self._tag_len)]
+        self._tag.append(piece)
+        self._tag_len += len(piece)
+
+    @staticmethod
+    def _link(tag: str):
+        attrs = {}
+        for m in _ATTR_RE.finditer(tag, 2):
+            name = m.group(1).lower()
+            if name not in attrs:
+                value = next(v for v in m.groups()[1:] if v is not None)
+                attrs[name] = html_lib.unescape(value)
+        href = attrs.get("href")
+        if not href:
+            return None
+        return {
             "tag": tag,
             "href": href,
-            "target": (target_m.group(1) if target_m else None),
-            "rel": (rel_m.group(1) if rel_m else None),
-            "aria": (aria_m.group(1) if aria_m else None),
-        })
-    return links
+            "target": attrs.get("target") or None,
+            "rel": attrs.get("rel") or None,
+            "aria": attrs.get("aria-label") or None,
+        }
+
+
+def iter_links(chunks, encoding: str = "utf-8"):
+    """Yields link records from an iterable of `bytes`/`str` chunks as soon as they are parsed."""
+    parser = LinkStreamParser()
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        yield from parser.feed(chunk)
+    yield from parser.feed(decoder.decode(b"", final=True))
+    yield from parser.close()
+
+
+def find_links(html: str):
+    return list(iter_links([html]))
+
+
+class LinkCache:
+    """On-disk cache of probe results keyed by URL, with ETag/Last-Modified validators."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._data = {}
+        if self.path and self.path.is_file():
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+
+    def get(self, url: str):
+        with self._lock:
+            return self._data.get(url)
+
+    def put(self, url: str, entry: dict) -> None:
+        with self._lock:
+            self._data[url] = entry
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            payload = json.dumps(self._data, indent=1, sort_keys=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".part")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class LinkChecker:
+    """
+    Concurrent URL prober.
+
+    Each absolute URL (fragment stripped) is probed once per run, no matter how
+    many pages link to it. Requests share one pooled `requests.Session`; a
+    per-host semaphore bounds concurrency against any single server. A probe
+    sends HEAD first (conditional, when the cache holds validators) and falls
+    back to a streamed GET when HEAD is unsupported or fails.
+    """
 
+    def __init__(self, workers: int = 16, per_host: int = 4, timeout: float = 8.0, cache: LinkCache = None):
+        self.timeout = timeout
+        self.per_host = max(1, per_host)
+        self.cache = cache or LinkCache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(4, workers), pool_maxsize=max(4, workers))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="link-check")
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._host_slots = {}
+        self.stats = {"probed": 0, "deduped": 0, "head": 0, "get": 0, "not_modified": 0}
 
-def check_link(base_url: str, page_url: str, link: dict):
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            sem = self._host_slots.get(host)
+            if sem is None:
+                sem = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def submit(self, url: str) -> Future:
+        url = urldefrag(url)[0]
+        with self._lock:
+            fut = self._futures.get(url)
+            if fut is not None:
+                self.stats["deduped"] += 1
+                return fut
+            fut = self._executor.submit(self._probe, url)
+            self._futures[url] = fut
+            return fut
+
+    def spawn(self, fn, *args) -> Future:
+        """Runs `fn` on the worker pool (used to scan pages concurrently)."""
+        return self._executor.submit(fn, *args)
+
+    def stream_links(self, url: str, chunk_size: int = 64 * 1024):
+        """Streams a page and yields its links while the body is still downloading."""
+        with self._slot(url):
+            with self.session.get(url, timeout=self.timeout, stream=True) as resp:
+                resp.raise_for_status()
+                yield from iter_links(resp.iter_content(chunk_size), resp.encoding or "utf-8")
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _probe(self, url: str) -> dict:
+        self._count("probed")
+        result = {"status": None, "ok": False, "errors": [], "cached": False}
+        cached = self.cache.get(url)
+        headers = {}
+        if cached and cached.get("ok"):
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        try:
+            with self._slot(url):
+                self._count("head")
+                resp = self.session.head(url, timeout=self.timeout, allow_redirects=True, headers=headers)
+                if resp.status_code == 304 and cached:
+                    self._count("not_modified")
+                    result.update(status=cached["status"], ok=True, cached=True)
+                    return result
+                if resp.status_code in HEAD_FALLBACK_STATUS:
+                    self._count("get")
+                    resp = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+                    resp.close()
+        except requests.RequestException:
+            try:
+                with self._slot(url):
+                    self._count("get")
+                    resp = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+                    resp.close()
+            except Exception as e:
+                result["errors"].append(str(e))
+                return result
+        except Exception as e:
+            result["errors"].append(str(e))
+            return result
+        result["status"] = resp.status_code
+        if 200 <= resp.status_code < 400:
+            result["ok"] = True
+            self.cache.put(url, {
+                "status": resp.status_code,
+                "ok": True,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            })
+        else:
+            result["errors"].append(f"HTTP {resp.status_code}")
+        return result
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        self.cache.save()
+
+
+def check_link(base_url: str, page_url: str, link: dict, checker: LinkChecker):
+    """Static checks for one link occurrence; the HTTP probe is shared via `checker`."""
     href = link["href"]
     absolute = urljoin(page_url, href)
     parsed = urlparse(absolute)
@@ -49,6 +326,7 @@ def check_link(base_url: str, page_url: str, link: dict):
         "errors": [],
         "warnings": [],
         "is_external": is_external,
+        "probe": checker.submit(absolute),
     }
 
     # Protocol adequacy
@@ -63,59 +341,84 @@ def check_link(base_url: str, page_url: str, link: dict):
     if not link.get("aria"):
         result["warnings"].append("Link should include aria-label for accessibility")
 
-    # Resolve and request
-    try:
-        resp = requests.get(absolute, timeout=8)
-        result["status"] = resp.status_code
-        if 200 <= resp.status_code < 400:
-            result["ok"] = True
-        else:
-            result["errors"].append(f"HTTP {resp.status_code}")
-    except Exception as e:
-        result["errors"].append(str(e))
+    return result
+
 
+def _resolve(result: dict) -> dict:
+    probe = result.pop("probe").result()
+    result["status"] = probe["status"]
+    result["ok"] = probe["ok"]
+    result["errors"].extend(probe["errors"])
+    result["cached"] = probe["cached"]
     return result
 
 
-def main():
-    base = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000/"
-    session = requests.Session()
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Verifica os links dos relatórios HTML")
+    ap.add_argument("base", nargs="?", default="http://localhost:8000/")
+    ap.add_argument("--pages", nargs="+", default=PAGES, help="Páginas relativas à base")
+    ap.add_argument("--workers", type=int, default=16, help="Requisições simultâneas (padrão: 16)")
+    ap.add_argument("--per-host", type=int, default=4, help="Requisições simultâneas por host (padrão: 4)")
+    ap.add_argument("--timeout", type=float, default=8.0)
+    ap.add_argument("--cache", default=str(DEFAULT_CACHE), help="Arquivo do cache de validação (ETag/Last-Modified)")
+    ap.add_argument("--no-cache", action="store_true")
+    ns = ap.parse_args(argv)
+
+    base = ns.base
+    t0 = time.perf_counter()
+    checker = LinkChecker(
+        workers=ns.workers,
+        per_host=ns.per_host,
+        timeout=ns.timeout,
+        cache=LinkCache(None if ns.no_cache else ns.cache),
+    )
 
     print(f"[check] Base URL: {base}")
     overall_ok = True
     report = []
 
-    for page in PAGES:
-        page_url = urljoin(base, page)
+    def scan(page_url):
+        # Each link is submitted to the checker as soon as the parser emits it
+        return [check_link(base, page_url, link, checker) for link in checker.stream_links(page_url)]
+
+    pages = {urljoin(base, page): checker.spawn(scan, urljoin(base, page)) for page in ns.pages}
+    per_page = []
+    for page_url, fut in pages.items():
         try:
-            html = session.get(page_url, timeout=8).text
+            per_page.append((page_url, fut.result()))
         except Exception as e:
             overall_ok = False
             print(f"[error] Falha ao abrir página {page_url}: {e}")
-            continue
-        links = find_links(html)
-        print(f"[page] {page_url} — {len(links)} links encontrados")
-        for link in links:
-            r = check_link(base, page_url, link)
+
+    for page_url, results in per_page:
+        print(f"[page] {page_url} — {len(results)} links encontrados")
+        for r in results:
+            r = _resolve(r)
             report.append(r)
             status = r["status"]
             if not r["ok"]:
                 overall_ok = False
                 print(f"  [broken] {r['absolute']} — status={status} errors={r['errors']}")
             else:
-                print(f"  [ok] {r['absolute']} — status={status}")
+                print(f"  [ok] {r['absolute']} — status={status}{' (cache)' if r['cached'] else ''}")
             for w in r["warnings"]:
                 print(f"    [warn] {w}")
+    checker.close()
 
     print("\nResumo:")
     total = len(report)
     oks = sum(1 for r in report if r["ok"]) if report else 0
+    st = checker.stats
     print(f"  Total links: {total}")
     print(f"  OK: {oks}")
     print(f"  Broken: {total - oks}")
+    print(
+        f"  URLs únicas: {st['probed']} (HEAD={st['head']} GET={st['get']} "
+        f"304={st['not_modified']} duplicadas={st['deduped']}) em {time.perf_counter() - t0:.2f}s"
+    )
 
     sys.exit(0 if overall_ok else 1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.screenshot_store import ScreenshotStore  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Gera (incrementalmente) screenshots/index.json e, opcionalmente, armazena as imagens por conteúdo"
+    )
+    ap.add_argument("--screenshots-dir", default=str(ROOT / "screenshots"))
+    ap.add_argument("--output", default=None, help="Caminho do índice (padrão: <screenshots-dir>/index.json)")
+    ap.add_argument("--store", action="store_true", help="Move as imagens para store/<aa>/<sha256>.<ext> (deduplicação exata)")
+    ap.add_argument(
+        "--dedupe",
+        type=int,
+        default=None,
+        metavar="BITS",
+        help="Com --store: reaproveita o blob da mesma etapa se o dHash diferir em até BITS bits (ex.: 4)",
+    )
+    ns = ap.parse_args(argv)
+
+    screens = Path(ns.screenshots_dir)
+    if not screens.is_dir():
+        print(f"[Index] Diretório de screenshots inexistente: {screens}")
+        return 0
+    store = ScreenshotStore(screens, store=ns.store, dedupe_distance=ns.dedupe, index_path=ns.output)
+    st = store.update()
+    print(
+        f"[Index] Gerado {store.index_path} com {st['total']} itens "
+        f"(novos={st['indexed']} inalterados={st['reused']} removidos={st['dropped']})"
+    )
+    if ns.store:
+        print(
+            f"[Index] Blobs novos={st['new_blobs']} dedupe exato={st['dedup_exact']} "
+            f"perceptual={st['dedup_perceptual']} economia={st['bytes_saved'] / 1048576:.1f}MB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.retention import RetentionEngine  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description=(
+            "Mantém screenshots/ dentro de um orçamento de tamanho e de arquivos, arquivando em zip "
+            "as capturas de etapa mais antigas (capturas de falha e finais são preservadas)"
+        )
+    )
+    ap.add_argument("--screenshots-dir", default=str(ROOT / "screenshots"))
+    ap.add_argument("--max-mb", type=float, default=None, help="Tamanho máximo de screenshots/ em MB")
+    ap.add_argument("--max-files", type=int, default=None, help="Quantidade máxima de arquivos em screenshots/")
+    ap.add_argument(
+        "--archive-mb",
+        type=float,
+        default=None,
+        help="Tamanho máximo de screenshots/archive em MB (padrão: o mesmo de --max-mb)",
+    )
+    ap.add_argument("--no-archive", action="store_true", help="Remove sem arquivar em zip")
+    ap.add_argument("--dry-run", action="store_true", help="Apenas lista o que seria removido")
+    ns = ap.parse_args(argv)
+
+    if ns.max_mb is None and ns.max_files is None:
+        ap.error("informe --max-mb e/ou --max-files")
+    engine = RetentionEngine(
+        ns.screenshots_dir,
+        max_bytes=int(ns.max_mb * 1048576) if ns.max_mb is not None else None,
+        max_files=ns.max_files,
+        archive=not ns.no_archive,
+        archive_max_bytes=int(ns.archive_mb * 1048576) if ns.archive_mb is not None else None,
+    )
+    if ns.dry_run:
+        for u in engine.plan()["evict"]:
+            print(f"[Retention] removeria ({u['outcome']}): {u['rel']}")
+    st = engine.enforce(dry_run=ns.dry_run)
+    by_outcome = " ".join(f"{k}={v}" for k, v in st["by_outcome"].items())
+    print(
+        f"[Retention] arquivos {st['files_before']} -> {st['files_after']}, "
+        f"{st['bytes_before'] / 1048576:.1f}MB -> {st['bytes_after'] / 1048576:.1f}MB; "
+        f"removidos={st['evicted']} ({by_outcome}) protegidos={st['protected']} "
+        f"erros={st['errors']} em {st['elapsed_s']:.2f}s"
+    )
+    if st["archive"]:
+        print(f"[Retention] arquivo: {st['archive']} ({st['archive_bytes'] / 1048576:.1f}MB)")
+    if st["archives_dropped"]:
+        print(f"[Retention] zips antigos removidos: {st['archives_dropped']}")
+    if st["over_budget"]:
+        print("[Retention] aviso: capturas protegidas (falha/final) já excedem o orçamento")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
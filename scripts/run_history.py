@@ -0,0 +1,116 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.run_history import RunHistory  # noqa: E402
+
+
+DEFAULT_DB = ROOT / "reports" / "history.sqlite"
+
+
+def _ingest(hist: RunHistory, ns) -> None:
+    junit = [Path(p) for p in ns.junit] if ns.junit else sorted((ROOT / "reports").glob("junit*.xml"))
+    for pattern in ns.junit_glob or []:
+        junit += sorted(ROOT.glob(pattern))
+    st = hist.ingest(
+        junit_files=junit,
+        logs_dir=Path(ns.logs_dir),
+        timeline_dir=Path(ns.timeline_dir),
+        screenshots_dir=Path(ns.screenshots_dir),
+    )
+    counts = hist.counts()
+    print(
+        f"[History] novos: junit={st['junit']} logs={st['gh_logs']} linhas do tempo={st['timelines']} "
+        f"gravações={st['recordings']} execuções por captura={st['screenshot_runs']} "
+        f"(inalterados={st['skipped']} erros={st['errors']})"
+    )
+    print(
+        f"[History] banco: execuções={counts['runs']} testes={counts['tests']} etapas={counts['steps']} "
+        f"falhas={counts['failures']} plataformas={counts['platforms']}"
+    )
+
+
+def _steps(hist: RunHistory, ns) -> None:
+    stats = hist.step_stats(ns.step, ns.os, ns.last, ns.percentile)
+    if not stats:
+        print("[History] nenhuma etapa encontrada para o filtro")
+        return
+    pct = f"p{ns.percentile:g}"
+    print(f"{'etapa':<28} {'execuções':>9} {'n':>5} {'p50':>9} {pct:>9} {'max':>9} (ms)")
+    for name, st in sorted(stats.items(), key=lambda e: e[1]["pct"], reverse=True):
+        print(f"{name:<28} {st['runs']:>9} {st['count']:>5} {st['p50']:>9.0f} {st['pct']:>9.0f} {st['max']:>9.0f}")
+
+
+def _trend(hist: RunHistory, ns) -> None:
+    series = hist.step_trend(ns.step, ns.os, ns.last)
+    if not series:
+        print(f"[History] nenhuma amostra de {ns.step}")
+        return
+    for e in series:
+        print(f"{e['started_at'] or '?':<20} n={e['count']:<3} p50={e['p50']:>8.0f} max={e['max']:>8.0f} ms ({e['source']})")
+    half = len(series) // 2
+    if half:
+        before = sum(e["p50"] for e in series[:half]) / half
+        after = sum(e["p50"] for e in series[half:]) / (len(series) - half)
+        delta = (after - before) / before * 100.0 if before else 0.0
+        print(f"[History] {ns.step}: média do p50 {before:.0f} -> {after:.0f} ms ({delta:+.1f}%) entre as metades da série")
+
+
+def _flaky(hist: RunHistory, ns) -> None:
+    rows = hist.flaky_tests(ns.os, ns.last)
+    if not rows:
+        print("[History] nenhuma falha nas execuções consideradas")
+        return
+    for r in rows:
+        cats = " ".join(f"{k}={v}" for k, v in sorted(r["categories"].items())) or "-"
+        kind = "instável" if r["flaky"] else "falha"
+        print(f"{kind:<9} {r['failed']}/{r['runs']}  {r['test']}  [{cats}]")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Histórico de execuções em SQLite (JUnit, logs do GitHub Actions, linhas do tempo e capturas)"
+    )
+    ap.add_argument("--db", default=str(DEFAULT_DB), help=f"Banco SQLite (padrão: {DEFAULT_DB.relative_to(ROOT)})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("ingest", help="Ingere apenas arquivos novos ou alterados")
+    p.add_argument("--junit", action="append", default=None, help="Arquivo JUnit XML (repetível; padrão: reports/junit*.xml)")
+    p.add_argument(
+        "--junit-glob",
+        action="append",
+        default=None,
+        help="Padrão glob relativo à raiz para JUnit adicionais (ex.: 'reports_all/**/junit.xml')",
+    )
+    p.add_argument("--logs-dir", default=str(ROOT / "logs"))
+    p.add_argument("--timeline-dir", default=str(ROOT / "reports" / "timeline"))
+    p.add_argument("--screenshots-dir", default=str(ROOT / "screenshots"))
+
+    for name, help_text in (
+        ("steps", "Percentis por etapa (ex.: steps --step select_state --os macOS --last 30)"),
+        ("trend", "Série por execução de uma etapa, para achar regressões"),
+        ("flaky", "Testes com falhas/resultados mistos e categorias de falha"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        if name != "flaky":
+            p.add_argument("--step", required=name == "trend", default=None, help="Nome da etapa (ex.: select_state)")
+        p.add_argument("--os", default=None, help="Filtra por SO: Linux, Windows ou macOS")
+        p.add_argument("--last", type=int, default=30, help="Últimas N execuções (padrão: 30; 0 = todas)")
+        if name == "steps":
+            p.add_argument("--percentile", type=float, default=95.0, help="Percentil exibido além do p50 (padrão: 95)")
+    ns = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    with RunHistory(ns.db) as hist:
+        {"ingest": _ingest, "steps": _steps, "trend": _trend, "flaky": _flaky}[ns.cmd](hist, ns)
+    print(f"[History] {ns.cmd} em {(time.perf_counter() - t0) * 1000.0:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -71,7 +71,7 @@ function Run-Demo {
     try {
         $indexPath = Join-Path $screensDir 'index.json'
         Write-Host "Gerando índice de screenshots em '$indexPath'" -ForegroundColor Cyan
-        & powershell -NoProfile -ExecutionPolicy Bypass -File (Join-Path $Root 'scripts\generate_index_json.ps1') -ScreenshotsDir $screensDir -OutputPath $indexPath
+        & $pythonExe (Join-Path $Root 'scripts\generate_index.py') --screenshots-dir $screensDir --output $indexPath
     } catch {
         Write-Warning ("Falha ao gerar index.json de screenshots: {0}" -f $_.Exception.Message)
     }
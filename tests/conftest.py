@@ -1,5 +1,4 @@
 import os
-import platform
 import sys
 from pathlib import Path
 
@@ -8,19 +7,29 @@ project_root = Path(__file__).resolve().parents[1]
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-# ClientConfig foi introduzido em versões mais novas do Selenium; manter compatibilidade.
-try:
-    from selenium.webdriver.common.client_config import ClientConfig  # type: ignore
-    _HAS_CLIENT_CONFIG = True
-except Exception:
-    ClientConfig = None  # type: ignore
-    _HAS_CLIENT_CONFIG = False
-from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
 
+from utils.browser_daemon import BrowserDaemon
+from utils.capture import CAPTURE_PROFILES, parse_capture_profile
+from utils.datasets import ThroughputMeter, count_records
+from utils.command_timing import CommandTimeline, merge_summaries
+from utils.driver_factory import apply_delay_settings, build_chrome_driver
+from utils.driver_pool import DriverPool
+from utils.driver_resolver import DriverResolver
+from utils.file_utils import worker_id
+from utils.local_server import LATENCY_PROFILES, LocalPracticeFormServer
+from utils.perf_metrics import PerfRecorder, aggregate, summary_html
+from utils.request_blocking import BLOCK_CATEGORIES, apply_request_blocking, parse_blocklist
+from utils.retention import RetentionEngine
+from utils.run_history import RunHistory, current_platform
+from utils.screenshot_store import ScreenshotStore
+from utils.screenshot_writer import ScreenshotWriter, save_screenshot
+from utils.step_recorder import StepRecorder
+from utils.step_retry import RetryBudget
+from utils.stats import Histogram
+from utils.wait_engine import WaitEngine
+
+
 def _sanitize_nodeid(nodeid: str) -> str:
     return (
         nodeid.replace("::", "_")
@@ -52,164 +61,575 @@ def pytest_addoption(parser):
         default=None,
         help="Delay (milissegundos) ANTES da captura de cada screenshot (ex.: 800)",
     )
+    # Comentário (PT-BR): Prontidão da captura. `fixed` aplica os delays acima;
+    # `settle` espera só até a página estabilizar (animações, DOM e quadros);
+    # `presentation` espera estabilizar e usa os delays como tempo mínimo.
+    parser.addoption(
+        "--capture-readiness",
+        action="store",
+        default=None,
+        choices=("fixed", "settle", "presentation"),
+        help="Espera antes de cada screenshot de etapa: fixed, settle ou presentation (equivale a CAPTURE_READINESS)",
+    )
+    parser.addoption(
+        "--settle-timeout-ms",
+        action="store",
+        default=None,
+        help="Limite (ms) da espera de estabilização nos modos settle/presentation (padrão: 2000; equivale a SETTLE_TIMEOUT_MS)",
+    )
+    # Comentário (PT-BR): Pool de sessões pré-aquecidas por processo. Combine com
+    # `-n <N>` (pytest-xdist) para distribuir os testes entre N workers.
+    parser.addoption(
+        "--browser-pool",
+        action="store",
+        default=None,
+        help="Quantidade de sessões Chrome pré-aquecidas por worker (ex.: 2; 0 = sessão única)",
+    )
+    # Comentário (PT-BR): Gravação assíncrona de screenshots. A etapa do teste
+    # paga apenas a captura; decodificação/escrita ocorrem em threads de background.
+    parser.addoption(
+        "--async-screenshots",
+        action="store_true",
+        default=False,
+        help="Grava screenshots em background (equivale a ASYNC_SCREENSHOTS=1)",
+    )
+    parser.addoption(
+        "--screenshot-workers",
+        action="store",
+        default="2",
+        help="Threads de gravação de screenshots no modo assíncrono (padrão: 2)",
+    )
+    parser.addoption(
+        "--screenshot-queue",
+        action="store",
+        default="8",
+        help="Máximo de screenshots pendentes antes de bloquear a etapa (padrão: 8)",
+    )
+    parser.addoption(
+        "--screenshot-reencode",
+        action="store",
+        default=None,
+        help="Re-encode opcional em background: png, jpeg ou webp",
+    )
+    # Comentário (PT-BR): Instrumentação de comandos WebDriver (duração, payload,
+    # etapa do Page Object) com linha do tempo JSON por teste.
+    parser.addoption(
+        "--instrument",
+        action="store_true",
+        default=False,
+        help="Registra a linha do tempo de comandos WebDriver (equivale a WEBDRIVER_INSTRUMENT=1)",
+    )
+    parser.addoption(
+        "--timeline-dir",
+        action="store",
+        default=None,
+        help="Pasta dos JSONs de linha do tempo por teste (padrão: reports/timeline)",
+    )
+    # Comentário (PT-BR): Alvo do formulário. Por padrão usa o demoqa.com; com
+    # --local-site sobe uma réplica local (sem anúncios/rede) com latência injetada.
+    parser.addoption(
+        "--form-base-url",
+        action="store",
+        default=None,
+        help="URL base do site do formulário (equivale a PRACTICE_FORM_BASE_URL)",
+    )
+    parser.addoption(
+        "--local-site",
+        action="store_true",
+        default=False,
+        help="Serve uma réplica local do formulário do DemoQA (equivale a LOCAL_SITE=1)",
+    )
+    parser.addoption(
+        "--latency-profile",
+        action="store",
+        default=None,
+        help=f"Latência por requisição da réplica local: {', '.join(LATENCY_PROFILES)} ou <base_ms>:<jitter_ms>",
+    )
+    # Comentário (PT-BR): Armazenamento por conteúdo. Ao final da execução as
+    # imagens novas são movidas para screenshots/store/ (chave = sha256) e o
+    # índice screenshots/index.json é atualizado de forma incremental.
+    parser.addoption(
+        "--screenshot-store",
+        action="store_true",
+        default=False,
+        help="Armazena screenshots por hash e atualiza screenshots/index.json (equivale a SCREENSHOT_STORE=1)",
+    )
+    parser.addoption(
+        "--screenshot-dedupe",
+        action="store",
+        default=None,
+        help="Com --screenshot-store: distância máxima de dHash (bits) para reaproveitar a imagem da mesma etapa",
+    )
+    # Comentário (PT-BR): Perfil de captura (CDP Page.captureScreenshot): formato,
+    # qualidade, escala e recorte no elemento anotado. `full` = PNG completo.
+    parser.addoption(
+        "--capture-profile",
+        action="store",
+        default=None,
+        help=(
+            f"Perfil de captura: {', '.join(CAPTURE_PROFILES)} ou chave=valor "
+            "(format=webp,quality=70,scale=0.5,clip=1,margin=32); equivale a CAPTURE_PROFILE"
+        ),
+    )
+    # Comentário (PT-BR): Anotação das screenshots de etapa. `dom` (padrão) injeta
+    # overlay/estilos na página; `image` desenha o destaque na imagem com Pillow.
+    parser.addoption(
+        "--annotation-mode",
+        action="store",
+        default=None,
+        choices=("dom", "image"),
+        help="Como anotar as screenshots de etapa: dom ou image (equivale a SCREENSHOT_ANNOTATION)",
+    )
+    # Comentário (PT-BR): Orçamento total de espera por teste. Todas as esperas do
+    # Page Object consomem deste saldo; esgotado, a próxima espera falha na hora.
+    parser.addoption(
+        "--wait-budget",
+        action="store",
+        default=None,
+        help="Orçamento de espera por teste em segundos (padrão: 120; equivale a WAIT_BUDGET_S; 0 = sem limite)",
+    )
+    # Comentário (PT-BR): Bloqueio de requisições via CDP antes da navegação
+    # (anúncios, analytics, fontes, imagens ou padrões de URL próprios).
+    parser.addoption(
+        "--block-requests",
+        action="store",
+        default=None,
+        help=(
+            f"Bloqueia requisições: {', '.join(BLOCK_CATEGORIES)}, all, padrões de URL ou @arquivo "
+            "separados por vírgula (ex.: ads,analytics,*example.com*); equivale a BLOCK_REQUESTS"
+        ),
+    )
+    # Comentário (PT-BR): Navegador persistente entre execuções (desenvolvimento
+    # local). A sessão fica aberta ao final e a próxima execução se conecta a ela.
+    parser.addoption(
+        "--reuse-browser",
+        action="store_true",
+        default=False,
+        help="Reaproveita um Chrome persistente (scripts/browser_daemon.py) entre execuções (equivale a REUSE_BROWSER=1)",
+    )
+    # Comentário (PT-BR): Submissão em massa a partir de um dataset CSV/JSONL,
+    # lido em streaming e dividido em lotes (um teste por lote).
+    parser.addoption(
+        "--dataset",
+        action="store",
+        default=None,
+        help="Dataset CSV/JSONL para tests/test_practice_form_dataset.py (equivale a DATASET)",
+    )
+    parser.addoption(
+        "--dataset-chunk",
+        action="store",
+        default=None,
+        help="Registros por teste (lote) do dataset (padrão: 100; equivale a DATASET_CHUNK)",
+    )
+    # Comentário (PT-BR): Por padrão `open()` reaproveita o formulário já carregado
+    # (reset no lugar); --fresh-page força a navegação completa a cada teste.
+    parser.addoption(
+        "--fresh-page",
+        action="store_true",
+        default=False,
+        help="Navega de novo em todo open() em vez de restaurar o formulário no lugar (equivale a FRESH_PAGE=1)",
+    )
+    # Comentário (PT-BR): Métricas do navegador em `open()`/`submit()` (Navigation
+    # Timing, FCP/LCP, long tasks e waterfall de requisições), um JSON por teste.
+    parser.addoption(
+        "--perf-metrics",
+        action="store_true",
+        default=False,
+        help="Grava métricas de desempenho da página por teste em reports/perf (equivale a PERF_METRICS=1)",
+    )
+    # Comentário (PT-BR): Gravação das etapas em um único APNG reduzido por teste
+    # (com sidecar JSON quadro -> etapa) no lugar de um PNG por etapa.
+    parser.addoption(
+        "--record-steps",
+        action="store_true",
+        default=False,
+        help="Grava as etapas de cada teste em um APNG animado + JSON (equivale a RECORD_STEPS=1)",
+    )
+    parser.addoption(
+        "--record-width",
+        action="store",
+        default=None,
+        help="Largura máxima (px) dos quadros da gravação de etapas (padrão: 960; equivale a RECORD_WIDTH)",
+    )
+    # Comentário (PT-BR): Novas tentativas por etapa no PracticeFormPage. Falhas
+    # transitórias (timeout, stale, clique interceptado) repetem só a etapa a
+    # partir do checkpoint verificado, até N vezes no processo inteiro.
+    parser.addoption(
+        "--step-retries",
+        action="store",
+        default=None,
+        help="Orçamento global de novas tentativas de etapa por processo (padrão: 0; equivale a STEP_RETRIES)",
+    )
+    # Comentário (PT-BR): Retenção de screenshots ao final da execução. Acima do
+    # orçamento, capturas de etapa de execuções aprovadas (as menos usadas
+    # primeiro) vão para screenshots/archive/*.zip; `_fail_` e `_end_` ficam.
+    parser.addoption(
+        "--retention-max-mb",
+        action="store",
+        default=None,
+        help="Tamanho máximo de screenshots/ em MB ao final da execução (equivale a RETENTION_MAX_MB)",
+    )
+    parser.addoption(
+        "--retention-max-files",
+        action="store",
+        default=None,
+        help="Quantidade máxima de arquivos em screenshots/ ao final da execução (equivale a RETENTION_MAX_FILES)",
+    )
+    parser.addoption(
+        "--retention-archive-mb",
+        action="store",
+        default=None,
+        help="Tamanho máximo de screenshots/archive em MB (padrão: o de --retention-max-mb; equivale a RETENTION_ARCHIVE_MB)",
+    )
+    # Comentário (PT-BR): Histórico em SQLite. Ao final da execução ingere o
+    # JUnit desta sessão, linhas do tempo, gravações/capturas e logs do CI
+    # (apenas arquivos novos); consultas via scripts/run_history.py.
+    parser.addoption(
+        "--history-db",
+        action="store",
+        default=None,
+        help="Banco SQLite do histórico de execuções, ex.: reports/history.sqlite (equivale a HISTORY_DB)",
+    )
 
 
-@pytest.fixture(scope="session")
-def driver(request):
-    options = Options()
+def _is_headed(config) -> bool:
     # Headless estável em Chrome 109+ (pode ser desativado com --headed ou env PYTEST_HEADED=1)
     env_headed = os.getenv("PYTEST_HEADED", "").lower() in ("1", "true", "yes")
-    # Comentário (PT-BR): Detecta ambiente de CI e plataforma para ajustes finos
-    is_ci = os.getenv("CI", "").lower() in ("1", "true", "yes") or os.getenv("GITHUB_ACTIONS", "").lower() in ("1", "true", "yes")
-    system = platform.system().lower()
-    is_macos = system == "darwin"
-    is_windows = system == "windows"
     try:
-        headed = request.config.getoption("--headed") or env_headed
+        return bool(config.getoption("--headed")) or env_headed
     except Exception:
-        headed = env_headed
-    if not headed:
-        # Comentário (PT-BR): Usar headless new (estável no Chrome 109+) em todos os ambientes.
-        options.add_argument("--headless=new")
-    else:
-        # Garantir janela visível/maximizada em modo apresentação
-        try:
-            options.add_argument("--start-maximized")
-        except Exception:
-            pass
-    options.add_argument("--window-size=2560,1440")
-    options.add_argument("--force-device-scale-factor=1")
-    options.add_argument("--high-dpi-support=1")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-infobars")
-    # Comentário (PT-BR): Flags adicionais para estabilidade em headless CI
-    options.add_argument("--disable-software-rasterizer")
-    options.add_argument("--disable-background-timer-throttling")
-    options.add_argument("--disable-backgrounding-occluded-windows")
-    options.add_argument("--disable-renderer-backgrounding")
-    # Comentário (PT-BR): Evitar porta fixa de remote debugging em todos os SOs
-    # para reduzir conflitos com alocação do ChromeDriver em CI.
-    # Estratégia de carregamento: em CI usar 'normal' para estabilidade; local 'eager'.
-    try:
-        # Em macOS, usar sempre 'eager' para evitar esperas por recursos pesados
-        # que podem causar travamentos/timeout no runner do Actions.
-        pls = "eager" if is_macos else ("normal" if is_ci else "eager")
-        options.page_load_strategy = pls
+        return env_headed
+
+
+def _pool_size(config) -> int:
+    # Prioridade: --browser-pool > BROWSER_POOL_SIZE env > 0 (sessão única)
+    raw = None
+    try:
+        raw = config.getoption("--browser-pool")
+    except Exception:
+        raw = None
+    if raw is None:
+        raw = os.getenv("BROWSER_POOL_SIZE")
+    try:
+        return max(0, int(raw)) if raw not in (None, "") else 0
+    except Exception:
+        return 0
+
+
+def _instrument_enabled(config) -> bool:
+    env_on = os.getenv("WEBDRIVER_INSTRUMENT", "").lower() in ("1", "true", "yes")
+    try:
+        return bool(config.getoption("--instrument")) or env_on
+    except Exception:
+        return env_on
+
+
+def _command_timeline(config):
+    # Uma linha do tempo por processo, compartilhada pelas sessões do pool
+    timeline = getattr(config, "_command_timeline", None)
+    if timeline is None and _instrument_enabled(config):
+        timeline = CommandTimeline()
+        config._command_timeline = timeline
+    return timeline
+
+
+def _new_driver(config, driver=None):
+    # `driver` já aberto (daemon): aplica apenas a instrumentação e configurações
+    driver = driver or build_chrome_driver(headed=_is_headed(config))
+    timeline = _command_timeline(config)
+    if timeline is not None:
+        timeline.install(driver)
+    step_delay_opt = None
+    shot_delay_opt = None
+    try:
+        step_delay_opt = config.getoption("--step-delay")
+        shot_delay_opt = config.getoption("--shot-delay-ms")
     except Exception:
         pass
+    apply_delay_settings(driver, step_delay_opt, shot_delay_opt)
+    # Antes de qualquer navegação: a sessão nunca busca os recursos bloqueados
+    apply_request_blocking(driver, _blocklist(config))
+    if _perf_enabled(config):
+        PerfRecorder(driver).install()
+    return driver
+
+
+def _perf_enabled(config) -> bool:
+    env_on = os.getenv("PERF_METRICS", "").lower() in ("1", "true", "yes")
+    try:
+        return bool(config.getoption("--perf-metrics")) or env_on
+    except Exception:
+        return env_on
+
+
+def _perf_dir(config) -> Path:
+    # Ao lado do junit.xml quando informado (--junitxml), senão reports/perf
+    xmlpath = getattr(config.option, "xmlpath", None)
+    return Path(xmlpath).resolve().parent / "perf" if xmlpath else Path(project_root, "reports", "perf")
+
 
-    chrome_path = os.environ.get("CHROME_PATH")
-    if chrome_path:
-        options.binary_location = chrome_path
-    else:
-        # Fallback específico para macOS: tentar localizar binário do Chrome
-        # em caminhos padrão caso CHROME_PATH não esteja definido.
-        if is_macos:
-            mac_candidates = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                "/Applications/Google Chrome Beta.app/Contents/MacOS/Google Chrome Beta",
-                "/Applications/Chromium.app/Contents/MacOS/Chromium",
-            ]
-            for p in mac_candidates:
-                try:
-                    if os.path.exists(p):
-                        options.binary_location = p
-                        break
-                except Exception:
-                    pass
-
-    service = Service(ChromeDriverManager().install())
-    # Timeout HTTP do executor via ClientConfig (evita deprecation warnings)
-    # Afinamento por plataforma: no macOS runner do GitHub, comandos podem
-    # demorar mais; aumentar o timeout para reduzir ReadTimeout em operações
-    # legítimas (ex.: renderização, rolagem, screenshots).
-    exec_timeout = 45
-    if is_ci:
-        # Base mais generosa para CI em geral
-        exec_timeout = 60
-        # macOS: aumentar ainda mais para evitar ReadTimeoutError (urllib3)
-        if is_macos:
-            exec_timeout = 120
-    if _HAS_CLIENT_CONFIG and ClientConfig is not None:
-        # Ajuste correto: usar request_timeout/read_timeout em ClientConfig
-        driver = webdriver.Chrome(
-            service=service,
-            options=options,
-            client_config=ClientConfig(request_timeout=exec_timeout, read_timeout=exec_timeout),
+def _record_width(config):
+    """Largura dos quadros da gravação de etapas, ou None se a gravação está desligada."""
+    env_on = os.getenv("RECORD_STEPS", "").lower() in ("1", "true", "yes")
+    try:
+        enabled = bool(config.getoption("--record-steps")) or env_on
+        raw = config.getoption("--record-width")
+    except Exception:
+        enabled, raw = env_on, None
+    if not enabled:
+        return None
+    raw = raw if raw not in (None, "") else os.getenv("RECORD_WIDTH")
+    try:
+        return max(64, int(raw)) if raw not in (None, "") else 960
+    except Exception:
+        return 960
+
+
+def _dataset(config):
+    try:
+        path = config.getoption("--dataset")
+        chunk = config.getoption("--dataset-chunk")
+    except Exception:
+        path, chunk = None, None
+    path = path or os.getenv("DATASET")
+    chunk = chunk or os.getenv("DATASET_CHUNK")
+    try:
+        chunk = max(1, int(chunk)) if chunk not in (None, "") else 100
+    except Exception:
+        chunk = 100
+    return (Path(path), chunk) if path else (None, chunk)
+
+
+def pytest_generate_tests(metafunc):
+    # Um parâmetro (arquivo, início, tamanho) por lote; o dataset só é contado, não carregado
+    if "dataset_chunk" not in metafunc.fixturenames:
+        return
+    path, chunk = _dataset(metafunc.config)
+    if path is None:
+        metafunc.parametrize(
+            "dataset_chunk", [pytest.param(None, marks=pytest.mark.skip(reason="sem --dataset/DATASET"))]
         )
-    else:
-        driver = webdriver.Chrome(service=service, options=options)
-        try:
-            # Compatibilidade com Selenium antigo:
-            driver.command_executor.set_timeout(exec_timeout)
-        except Exception:
-            pass
-    # Timeout específico de carregamento de página
+        return
+    total = count_records(path)
+    params = [(path, start, min(chunk, total - start)) for start in range(0, total, chunk)]
+    metafunc.parametrize("dataset_chunk", params, ids=[f"records[{s}:{s + n}]" for _, s, n in params])
+
+
+@pytest.fixture(scope="session")
+def dataset_stats(request):
+    meter = ThroughputMeter()
+    yield meter
+    if meter.records:
+        _publish_stats(request.config, "dataset", meter.summary())
+
+
+def _browser_daemon(config):
+    env_on = os.getenv("REUSE_BROWSER", "").lower() in ("1", "true", "yes")
     try:
-        driver.set_page_load_timeout(90 if (is_ci and is_macos) else 60)
+        enabled = bool(config.getoption("--reuse-browser")) or env_on
     except Exception:
-        pass
-    driver.implicitly_wait(0)
+        enabled = env_on
+    if not enabled:
+        return None
+    # Um daemon por worker do xdist (cada processo usa a sua sessão)
+    return BrowserDaemon(slot=worker_id() or "main", headed=_is_headed(config))
+
 
-    if headed:
+def _fresh_page(config) -> bool:
+    env_on = os.getenv("FRESH_PAGE", "").lower() in ("1", "true", "yes")
+    try:
+        return bool(config.getoption("--fresh-page")) or env_on
+    except Exception:
+        return env_on
+
+
+def _blocklist(config):
+    try:
+        spec = config.getoption("--block-requests")
+    except Exception:
+        spec = None
+    return parse_blocklist(spec or os.getenv("BLOCK_REQUESTS"))
+
+
+def _retry_budget(config):
+    # Um orçamento por processo (cada worker do xdist tem o seu)
+    budget = getattr(config, "_retry_budget", None)
+    if budget is None:
         try:
-            driver.maximize_window()
+            raw = config.getoption("--step-retries")
         except Exception:
-            pass
+            raw = None
+        raw = raw if raw not in (None, "") else os.getenv("STEP_RETRIES", "0")
+        try:
+            total = max(0, int(raw))
+        except Exception:
+            total = 0
+        budget = config._retry_budget = RetryBudget(total)
+    return budget
+
 
-    # Garantir resolução mínima de 1920x1080 mesmo em headless
+def _capture_readiness(config):
     try:
-        driver.set_window_size(2560, 1440)
+        mode = config.getoption("--capture-readiness")
+        raw = config.getoption("--settle-timeout-ms")
     except Exception:
-        pass
+        mode, raw = None, None
+    mode = (mode or os.getenv("CAPTURE_READINESS") or "fixed").lower()
+    raw = raw if raw not in (None, "") else os.getenv("SETTLE_TIMEOUT_MS")
+    try:
+        limit_ms = max(0, int(raw)) if raw not in (None, "") else 2000
+    except Exception:
+        limit_ms = 2000
+    return (mode if mode in ("fixed", "settle", "presentation") else "fixed"), limit_ms
 
-    # Configuração de delay entre etapas (segundos)
-    # Prioridade: --step-delay > STEP_DELAY_MS env > STEP_DELAY_S env > padrão 0
-    step_delay_opt = None
+
+def _annotation_mode(config) -> str:
     try:
-        step_delay_opt = request.config.getoption("--step-delay")
+        mode = config.getoption("--annotation-mode")
     except Exception:
-        step_delay_opt = None
-    env_ms = os.getenv("STEP_DELAY_MS")
-    env_s = os.getenv("STEP_DELAY_S")
-    delay_seconds = 0.0
-    try:
-        if step_delay_opt is not None:
-            delay_seconds = float(step_delay_opt)
-        elif env_ms:
-            delay_seconds = float(env_ms) / 1000.0
-        elif env_s:
-            delay_seconds = float(env_s)
+        mode = None
+    mode = (mode or os.getenv("SCREENSHOT_ANNOTATION") or "dom").lower()
+    return mode if mode in ("dom", "image") else "dom"
+
+
+def _capture_profile(config):
+    try:
+        spec = config.getoption("--capture-profile")
     except Exception:
-        delay_seconds = 0.0
+        spec = None
+    return parse_capture_profile(spec or os.getenv("CAPTURE_PROFILE"))
 
-    # Armazena no driver para que Page Objects possam utilizar
-    setattr(driver, "_step_delay_seconds", delay_seconds)
 
-    # Configuração de delay específico para screenshots (milissegundos)
-    # Comentário (PT-BR): Prioridade: --shot-delay-ms > SCREENSHOT_DELAY_MS/env > SHOT_DELAY_MS/env > delay_time/env.
-    # O valor é convertido para segundos e disponibilizado no driver.
-    shot_delay_opt = None
+def _wait_budget(config):
+    raw = None
     try:
-        shot_delay_opt = request.config.getoption("--shot-delay-ms")
+        raw = config.getoption("--wait-budget")
     except Exception:
-        shot_delay_opt = None
-    env_shot_ms = os.getenv("SCREENSHOT_DELAY_MS") or os.getenv("SHOT_DELAY_MS") or os.getenv("delay_time")
-    shot_delay_seconds = 0.0
-    try:
-        if shot_delay_opt is not None:
-            shot_delay_seconds = float(shot_delay_opt) / 1000.0
-        elif env_shot_ms:
-            shot_delay_seconds = float(env_shot_ms) / 1000.0
+        raw = None
+    if raw is None:
+        raw = os.getenv("WAIT_BUDGET_S")
+    try:
+        budget = float(raw) if raw not in (None, "") else 120.0
     except Exception:
-        shot_delay_seconds = 0.0
+        budget = 120.0
+    return budget if budget > 0 else None
+
+
+def _driver_scope(fixture_name, config) -> str:
+    # Comentário (PT-BR): Com pool habilitado cada teste toma uma sessão emprestada;
+    # sem pool, mantém-se uma única sessão por processo (comportamento original).
+    return "function" if _pool_size(config) > 0 else "session"
+
+
+def _publish_stats(config, key: str, stats) -> None:
+    # Comentário (PT-BR): Guarda métricas para o resumo do terminal e, em workers
+    # do xdist, envia ao processo controlador (disponíveis em `node.workeroutput`).
+    store = getattr(config, "_run_stats", None) or {}
+    store[key] = stats
+    config._run_stats = store
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput.setdefault("run_stats", {})[key] = stats
+
+
+def _collected_stats(config, key: str):
+    entries = [
+        (name, stats[key])
+        for name, stats in getattr(config, "_worker_run_stats", [])
+        if key in stats
+    ]
+    local = (getattr(config, "_run_stats", None) or {}).get(key)
+    if local and getattr(config, "workeroutput", None) is None:
+        entries.append((worker_id() or "main", local))
+    return sorted(entries, key=lambda e: e[0])
+
+
+@pytest.fixture(scope="session")
+def local_site(request):
+    config = request.config
+    env_local = os.getenv("LOCAL_SITE", "").lower() in ("1", "true", "yes")
     try:
-        setattr(driver, "_shot_delay_seconds", shot_delay_seconds)
+        enabled = bool(config.getoption("--local-site")) or env_local
+        profile = config.getoption("--latency-profile") or os.getenv("LOCAL_SITE_LATENCY")
     except Exception:
-        pass
+        enabled, profile = env_local, os.getenv("LOCAL_SITE_LATENCY")
+    if not enabled:
+        yield None
+        return
+    server = LocalPracticeFormServer(latency_profile=profile).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def form_base_url(request, local_site):
+    # Prioridade: réplica local > --form-base-url > PRACTICE_FORM_BASE_URL > site público (None)
+    if local_site is not None:
+        return local_site.base_url
+    try:
+        opt = request.config.getoption("--form-base-url")
+    except Exception:
+        opt = None
+    return opt or os.getenv("PRACTICE_FORM_BASE_URL") or None
+
+
+@pytest.fixture(scope="session")
+def screenshot_writer(request):
+    config = request.config
+    env_async = os.getenv("ASYNC_SCREENSHOTS", "").lower() in ("1", "true", "yes")
+    try:
+        enabled = bool(config.getoption("--async-screenshots")) or env_async
+    except Exception:
+        enabled = env_async
+    # Comentário (PT-BR): No modo de anotação `image` o desenho (decodificação,
+    # Pillow e re-encode) nunca roda na thread do teste: o gravador é sempre criado.
+    enabled = enabled or _annotation_mode(config) == "image"
+    if not enabled:
+        yield None
+        return
+    writer = ScreenshotWriter(
+        max_workers=int(config.getoption("--screenshot-workers") or 2),
+        max_pending=int(config.getoption("--screenshot-queue") or 8),
+        reencode=config.getoption("--screenshot-reencode"),
+    )
+    yield writer
+    # Flush no teardown da sessão: garante que nenhuma imagem pendente se perca
+    writer.close()
+    _publish_stats(config, "screenshot_writer", writer.stats())
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    size = _pool_size(request.config)
+    if size <= 0:
+        yield None
+        return
+    # Sem --fresh-page a sessão devolvida mantém a aba no formulário para o reset() no lugar
+    pool = DriverPool(lambda: _new_driver(request.config), size=size, keep_page=not _fresh_page(request.config))
+    yield pool
+    pool.close()
+    _publish_stats(request.config, "driver_pool", pool.stats())
+
+
+@pytest.fixture(scope=_driver_scope)
+def driver(request):
+    pool = request.getfixturevalue("driver_pool") if _pool_size(request.config) > 0 else None
+    if pool is not None:
+        driver = pool.acquire()
+        yield driver
+        pool.release(driver)
+        return
+
+    daemon = _browser_daemon(request.config)
+    if daemon is not None:
+        driver = _new_driver(request.config, daemon.acquire())
+        yield driver
+        # Não encerra: limpa o estado e deixa a sessão para a próxima execução
+        daemon.release(driver)
+        _publish_stats(request.config, "browser_daemon", daemon.stats())
+        return
+
+    driver = _new_driver(request.config)
 
     yield driver
 
@@ -219,18 +639,54 @@ def driver(request):
 @pytest.fixture(scope="session")
 def screenshots_dir() -> Path:
     d = Path(project_root, "screenshots")
+    # Comentário (PT-BR): Em execução paralela (pytest-xdist) cada worker grava em
+    # sua própria subpasta para evitar colisões de nomes entre processos.
+    wid = worker_id()
+    if wid:
+        d = d / wid
     d.mkdir(parents=True, exist_ok=True)
     return d
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _platform_properties(request, record_testsuite_property):
+    # Comentário (PT-BR): SO/CI/headless/Python nas propriedades do JUnit, lidas
+    # pelo histórico de execuções (utils/run_history.py).
+    props = {
+        name: "" if value is None else str(value)
+        for name, value in current_platform(headless=not _is_headed(request.config)).items()
+    }
+    for name, value in props.items():
+        record_testsuite_property(name, value)
+    return props
+
+
+@pytest.fixture(autouse=True)
+def _platform_test_properties(request, _platform_properties):
+    # Com pytest-xdist o XML é gravado no controlador e `record_testsuite_property`
+    # não tem efeito nos workers; as propriedades vão então em cada caso de teste
+    # (`user_properties`, o mesmo caminho de `record_property`)
+    if worker_id():
+        request.node.user_properties.extend(_platform_properties.items())
+
+
 @pytest.fixture(autouse=True)
-def _auto_screenshot_fixture(request, driver, screenshots_dir):
+def _auto_screenshot_fixture(request, driver, screenshots_dir, screenshot_writer, form_base_url):
     # Disponibiliza driver e pasta para hooks
     request.node._driver = driver
     request.node._screenshots_dir = screenshots_dir
     # Também expõe no driver para uso por Page Objects
     try:
         setattr(driver, "_screenshots_dir", screenshots_dir)
+        setattr(driver, "_screenshot_writer", screenshot_writer)
+        setattr(driver, "_base_url", form_base_url)
+        setattr(driver, "_annotation_mode", _annotation_mode(request.config))
+        readiness, settle_ms = _capture_readiness(request.config)
+        setattr(driver, "_capture_readiness", readiness)
+        setattr(driver, "_settle_timeout_ms", settle_ms)
+        setattr(driver, "_capture_profile", _capture_profile(request.config))
+        setattr(driver, "_reuse_page", not _fresh_page(request.config))
+        setattr(driver, "_retry_budget", _retry_budget(request.config))
     except Exception:
         pass
     # Armazena nodeid no driver para correlação com screenshots de etapas
@@ -238,16 +694,84 @@ def _auto_screenshot_fixture(request, driver, screenshots_dir):
         setattr(driver, "_current_nodeid", request.node.nodeid)
     except Exception:
         pass
+    timeline = getattr(driver, "_command_timeline", None)
+    if timeline is not None:
+        timeline.begin_test(request.node.nodeid)
+    waits = getattr(driver, "_wait_engine", None)
+    if waits is None:
+        waits = WaitEngine(driver)
+        try:
+            setattr(driver, "_wait_engine", waits)
+        except Exception:
+            pass
+    waits.begin_test(_wait_budget(request.config))
+    perf = getattr(driver, "_perf_recorder", None)
+    if perf is not None:
+        perf.begin_test(request.node.nodeid)
+    recorder = None
+    record_width = _record_width(request.config)
+    if record_width:
+        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+        recorder = StepRecorder(
+            screenshots_dir / f"{_sanitize_nodeid(request.node.nodeid)}_recording_{ts}.apng", width=record_width
+        )
+    try:
+        setattr(driver, "_step_recorder", recorder)
+    except Exception:
+        pass
     yield
+    if recorder is not None:
+        setattr(driver, "_step_recorder", None)
+        st = recorder.close()
+        totals = getattr(request.config, "_recording_stats", None)
+        if totals is None:
+            totals = request.config._recording_stats = {"tests": 0, "frames": 0, "bytes": 0, "encode_s": 0.0, "errors": 0}
+        totals["tests"] += 1
+        for k in ("frames", "bytes", "encode_s", "errors"):
+            totals[k] += st[k]
+    metrics = getattr(request.config, "_wait_metrics", None)
+    if metrics is None:
+        metrics = request.config._wait_metrics = {}
+    for k, v in waits.pop_metrics().items():
+        metrics[k] = metrics.get(k, 0) + v
+    if perf is not None:
+        try:
+            row = perf.end_test(_perf_dir(request.config), _sanitize_nodeid(request.node.nodeid))
+        except Exception:
+            row = None
+        if row:
+            rows = getattr(request.config, "_perf_rows", None)
+            if rows is None:
+                rows = request.config._perf_rows = []
+            rows.append(row)
+    if timeline is not None:
+        timeline_dir = request.config.getoption("--timeline-dir") or Path(project_root, "reports", "timeline")
+        try:
+            timeline.end_test(Path(timeline_dir), _sanitize_nodeid(request.node.nodeid))
+        except Exception:
+            pass
     try:
         # Em teardown, captura de screenshot final sem alterar timeout do executor
         ts = datetime.now().strftime("%Y%m%d-%H%M%S")
         fname = f"{_sanitize_nodeid(request.node.nodeid)}_end_{ts}.png"
-        driver.save_screenshot(str(screenshots_dir / fname))
+        save_screenshot(driver, screenshots_dir / fname)
     except Exception:
         pass
 
 
+def pytest_report_header(config):
+    # Comentário (PT-BR): Mostra só o que já está fixado no cache (sem trava e sem rede);
+    # a resolução, e o seu tempo, ficam para build_chrome_driver ao abrir o Chrome.
+    try:
+        res = DriverResolver().peek()
+    except Exception as e:
+        return f"chromedriver: cache ilegível ({type(e).__name__}: {e})"
+    if res is None:
+        return "chromedriver: não fixado no cache (resolvido ao abrir o primeiro Chrome)"
+    chrome = f", Chrome {res.chrome_version}" if res.chrome_version else ""
+    return f"chromedriver: {res.version or '?'} ({res.source}{chrome}): {res.path}"
+
+
 def pytest_runtest_makereport(item, call):
     try:
         report = pytest.TestReport.from_item_and_call(item, call)
@@ -261,6 +785,299 @@ def pytest_runtest_makereport(item, call):
             try:
                 ts = datetime.now().strftime("%Y%m%d-%H%M%S")
                 fname = f"{_sanitize_nodeid(item.nodeid)}_fail_{ts}.png"
-                driver.save_screenshot(str(screenshots_dir / fname))
+                save_screenshot(driver, screenshots_dir / fname)
+            except Exception:
+                pass
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    stats = getattr(node, "workeroutput", {}).get("run_stats")
+    if stats:
+        collected = getattr(node.config, "_worker_run_stats", [])
+        collected.append((node.gateway.id, stats))
+        node.config._worker_run_stats = collected
+
+
+def _screenshot_store(config):
+    env_on = os.getenv("SCREENSHOT_STORE", "").lower() in ("1", "true", "yes")
+    try:
+        enabled = bool(config.getoption("--screenshot-store")) or env_on
+        dedupe = config.getoption("--screenshot-dedupe")
+    except Exception:
+        enabled, dedupe = env_on, None
+    if not enabled:
+        return None
+    dedupe = dedupe if dedupe not in (None, "") else os.getenv("SCREENSHOT_DEDUPE")
+    try:
+        distance = int(dedupe) if dedupe not in (None, "") else None
+    except Exception:
+        distance = None
+    return ScreenshotStore(Path(project_root, "screenshots"), store=True, dedupe_distance=distance)
+
+
+def _retention(config):
+    def value(option, env, cast):
+        try:
+            raw = config.getoption(option)
+        except Exception:
+            raw = None
+        raw = raw if raw not in (None, "") else os.getenv(env)
+        try:
+            return cast(raw) if raw not in (None, "") else None
+        except Exception:
+            return None
+
+    max_mb = value("--retention-max-mb", "RETENTION_MAX_MB", float)
+    max_files = value("--retention-max-files", "RETENTION_MAX_FILES", int)
+    if max_mb is None and max_files is None:
+        return None
+    archive_mb = value("--retention-archive-mb", "RETENTION_ARCHIVE_MB", float)
+    return RetentionEngine(
+        Path(project_root, "screenshots"),
+        max_bytes=int(max_mb * 1048576) if max_mb is not None else None,
+        max_files=max_files,
+        archive_max_bytes=int(archive_mb * 1048576) if archive_mb is not None else None,
+    )
+
+
+def _history_db(config):
+    try:
+        path = config.getoption("--history-db")
+    except Exception:
+        path = None
+    path = path or os.getenv("HISTORY_DB")
+    return Path(project_root, path) if path else None
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    # trylast: roda após o teardown das fixtures de sessão (writer já esvaziado)
+    timeline = getattr(session.config, "_command_timeline", None)
+    if timeline is not None:
+        _publish_stats(session.config, "command_timeline", timeline.summary())
+    wait_metrics = getattr(session.config, "_wait_metrics", None)
+    if wait_metrics:
+        _publish_stats(session.config, "wait_engine", dict(wait_metrics))
+    recording = getattr(session.config, "_recording_stats", None)
+    if recording:
+        _publish_stats(session.config, "step_recording", dict(recording))
+    perf_rows = getattr(session.config, "_perf_rows", None)
+    if perf_rows:
+        _publish_stats(session.config, "perf", perf_rows)
+    # Apenas no processo controlador: workers do xdist já terminaram de gravar
+    if getattr(session.config, "workeroutput", None) is None:
+        store = _screenshot_store(session.config)
+        if store is not None:
+            try:
+                session.config._run_stats = getattr(session.config, "_run_stats", None) or {}
+                session.config._run_stats["screenshot_store"] = store.update()
+            except Exception:
+                pass
+        # Antes da retenção: as capturas de etapa ainda estão em disco
+        history_db = _history_db(session.config)
+        if history_db is not None:
+            xmlpath = getattr(session.config.option, "xmlpath", None)
+            timeline_dir = session.config.getoption("--timeline-dir") or Path(project_root, "reports", "timeline")
+            try:
+                with RunHistory(history_db) as history:
+                    st = history.ingest(
+                        junit_files=[Path(xmlpath)] if xmlpath else [],
+                        logs_dir=Path(project_root, "logs"),
+                        timeline_dir=Path(timeline_dir),
+                        screenshots_dir=Path(project_root, "screenshots"),
+                        platform_override=current_platform(headless=not _is_headed(session.config)),
+                    )
+                    st["counts"] = history.counts()
+                session.config._run_stats = getattr(session.config, "_run_stats", None) or {}
+                session.config._run_stats["run_history"] = dict(st, db=str(history_db))
             except Exception:
-                pass
\ No newline at end of file
+                pass
+        # Depois do índice: a retenção lê as seções dos blobs em index.json
+        retention = _retention(session.config)
+        if retention is not None:
+            try:
+                session.config._run_stats = getattr(session.config, "_run_stats", None) or {}
+                session.config._run_stats["retention"] = retention.enforce()
+            except Exception:
+                pass
+
+
+def _html_dir(config) -> Path:
+    htmlpath = getattr(config.option, "htmlpath", None)
+    return Path(htmlpath).resolve().parent if htmlpath else Path(project_root, "reports")
+
+
+# pytest-html 3.x não passa `session` ao hook de resumo; guarda o config da execução
+_config = None
+
+
+def pytest_configure(config):
+    global _config
+    _config = config
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix):
+    # Comentário (PT-BR): pytest-html monta o relatório no fim da sessão (antes
+    # do `pytest_sessionfinish` deste conftest): lê as linhas deste processo e
+    # as recebidas dos workers do xdist.
+    if _config is None:
+        return
+    rows = [row for _, stats in getattr(_config, "_worker_run_stats", []) for row in stats.get("perf", [])]
+    rows += getattr(_config, "_perf_rows", None) or []
+    try:
+        rel = os.path.relpath(_perf_dir(_config), _html_dir(_config)).replace(os.sep, "/")
+    except ValueError:  # outro drive no Windows
+        rel = _perf_dir(_config).as_uri()
+    markup = summary_html(rows, perf_dir=rel)
+    if not markup:
+        return
+    try:
+        from py.xml import raw  # pytest-html 3.x monta o relatório com py.xml
+
+        prefix.append(raw(markup))
+    except ImportError:
+        prefix.append(markup)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    entries = _collected_stats(config, "driver_pool")
+    if entries:
+        terminalreporter.write_sep("-", "browser pool")
+        for name, st in entries:
+            wait = st["wait"]
+            startup = st["startup"]
+            terminalreporter.write_line(
+                f"{name}: size={st['size']} acquisitions={st['acquisitions']} "
+                f"wait total={st['wait_total']:.2f}s p50={wait['p50']:.3f}s p95={wait['p95']:.3f}s max={wait['max']:.3f}s "
+                f"startup p50={startup['p50']:.2f}s replaced={st['replaced']} failures={st['failures']}"
+            )
+    entries = _collected_stats(config, "dataset")
+    if entries:
+        hist = Histogram()
+        for _, st in entries:
+            hist.merge(Histogram.from_dict(st["histogram"]))
+        lat = hist.summary()
+        terminalreporter.write_sep("-", "dataset")
+        terminalreporter.write_line(
+            f"registros={hist.count} falhas={sum(st['failures'] for _, st in entries)} "
+            # Workers do xdist submetem em paralelo: a vazão total é a soma
+            f"vazão={sum(st['per_minute'] for _, st in entries):.1f} registros/min "
+            f"latência p50={lat['p50']:.3f}s p95={lat['p95']:.3f}s p99={lat['p99']:.3f}s max={lat['max']:.3f}s"
+        )
+    entries = _collected_stats(config, "browser_daemon")
+    if entries:
+        terminalreporter.write_sep("-", "browser daemon")
+        for name, st in entries:
+            terminalreporter.write_line(
+                f"{name}: reaproveitadas={st['attached']} novas sessões={st['new_sessions']} "
+                f"chromedriver iniciado={st['launches']} reinícios={st['restarts']} "
+                f"attach={st['acquire_s']:.2f}s reset={st['reset_s']:.2f}s"
+            )
+    entries = _collected_stats(config, "screenshot_writer")
+    if entries:
+        terminalreporter.write_sep("-", "screenshot writer")
+        for name, st in entries:
+            terminalreporter.write_line(
+                f"{name}: written={st['written']}/{st['submitted']} size={st['bytes'] / 1048576:.1f}MB "
+                f"write={st['write_s']:.2f}s backpressure={st['blocked_s']:.2f}s errors={st['errors']}"
+            )
+    entries = _collected_stats(config, "step_recording")
+    if entries:
+        terminalreporter.write_sep("-", "step recording")
+        for name, st in entries:
+            terminalreporter.write_line(
+                f"{name}: testes={st['tests']} quadros={st['frames']} size={st['bytes'] / 1048576:.1f}MB "
+                f"encode={st['encode_s']:.2f}s errors={st['errors']}"
+            )
+    st = (getattr(config, "_run_stats", None) or {}).get("screenshot_store")
+    if st:
+        terminalreporter.write_sep("-", "screenshot store")
+        terminalreporter.write_line(
+            f"index={st['total']} novos={st['indexed']} blobs={st['new_blobs']} "
+            f"dedupe exato={st['dedup_exact']} perceptual={st['dedup_perceptual']} "
+            f"economia={st['bytes_saved'] / 1048576:.1f}MB"
+        )
+    st = (getattr(config, "_run_stats", None) or {}).get("run_history")
+    if st:
+        terminalreporter.write_sep("-", "run history")
+        counts = st["counts"]
+        terminalreporter.write_line(
+            f"{st['db']}: novos junit={st['junit']} logs={st['gh_logs']} linhas do tempo={st['timelines']} "
+            f"gravações={st['recordings']} capturas={st['screenshot_runs']} errors={st['errors']} | "
+            f"execuções={counts['runs']} etapas={counts['steps']} falhas={counts['failures']}"
+        )
+    st = (getattr(config, "_run_stats", None) or {}).get("retention")
+    if st:
+        terminalreporter.write_sep("-", "screenshot retention")
+        terminalreporter.write_line(
+            f"arquivos {st['files_before']} -> {st['files_after']} "
+            f"size {st['bytes_before'] / 1048576:.1f}MB -> {st['bytes_after'] / 1048576:.1f}MB "
+            f"removidos={st['evicted']} "
+            f"({' '.join(f'{k}={v}' for k, v in st['by_outcome'].items())}) "
+            f"protegidos={st['protected']} zips removidos={st['archives_dropped']} errors={st['errors']}"
+        )
+        if st["archive"]:
+            terminalreporter.write_line(f"arquivo: {st['archive']} ({st['archive_bytes'] / 1048576:.1f}MB)")
+        if st["over_budget"]:
+            terminalreporter.write_line("aviso: capturas de falha/finais já excedem o orçamento")
+    entries = _collected_stats(config, "wait_engine")
+    if entries:
+        terminalreporter.write_sep("-", "wait engine")
+        for name, st in entries:
+            recoveries = " ".join(
+                f"{k[len('recover_'):]}={v}" for k, v in sorted(st.items()) if k.startswith("recover_")
+            )
+            terminalreporter.write_line(
+                f"{name}: waits={st.get('waits', 0)} probes={st.get('probes', 0)} "
+                f"retried={st.get('retried_waits', 0)} presence_fallback={st.get('presence_fallback', 0)} "
+                f"timeouts={st.get('timeouts', 0)} budget_exhausted={st.get('budget_exhausted', 0)} "
+                f"page_reset={st.get('page_reset', 0)}/{st.get('page_reset', 0) + st.get('page_reset_failed', 0)} "
+                f"locators hit={st.get('locator_hit', 0)} miss={st.get('locator_miss', 0)} "
+                f"stale={st.get('locator_stale', 0)} not_ready={st.get('locator_not_ready', 0)} "
+                f"settle={st.get('settles', 0)} ({st.get('settle_ms', 0) / 1000:.2f}s, "
+                f"timeouts={st.get('settle_timeout', 0)}) "
+                f"recoveries: {recoveries or '-'}"
+            )
+            failures = " ".join(
+                f"{k[len('failure_'):]}={v}" for k, v in sorted(st.items()) if k.startswith("failure_")
+            )
+            if failures or st.get("retries"):
+                terminalreporter.write_line(
+                    f"{name}: step retries={st.get('retries', 0)} ok={st.get('retry_ok', 0)} "
+                    f"applied={st.get('retry_applied', 0)} failed={st.get('retry_failed', 0)} "
+                    f"checkpoint_lost={st.get('retry_checkpoint_lost', 0)} "
+                    f"budget_exhausted={st.get('retry_budget_exhausted', 0)} "
+                    f"wait_budget={st.get('retry_wait_budget', 0)} failures: {failures or '-'}"
+                )
+    entries = _collected_stats(config, "perf")
+    if entries:
+        terminalreporter.write_sep("-", "browser perf")
+        for step, agg in sorted(aggregate(row for _, rows in entries for row in rows).items()):
+            parts = " ".join(
+                f"{label} p50={agg[key]['p50']:.0f} p95={agg[key]['p95']:.0f}"
+                for key, label in (("wall_ms", "total"), ("site_ms", "site"), ("harness_ms", "harness"),
+                                   ("fcp_ms", "fcp"), ("lcp_ms", "lcp"))
+                if key in agg
+            )
+            terminalreporter.write_line(f"{step}: n={agg['wall_ms']['count']} {parts} (ms)")
+        terminalreporter.write_line(f"JSON por teste em {_perf_dir(config)}")
+    entries = _collected_stats(config, "command_timeline")
+    if entries:
+        merged = merge_summaries(st for _, st in entries)
+        totals = merged["totals"]
+        terminalreporter.write_sep("-", "webdriver timeline")
+        terminalreporter.write_line(
+            f"tempo total={totals.get('wall', 0.0):.2f}s commands={totals.get('command', 0.0):.2f}s "
+            f"waits={totals.get('wait', 0.0):.2f}s sleep={totals.get('sleep', 0.0):.2f}s"
+        )
+        terminalreporter.write_line("etapas mais lentas:")
+        for test, step, dur in merged["slowest"]:
+            terminalreporter.write_line(f"  {dur:8.3f}s  {step}  ({test})")
+        terminalreporter.write_line("comandos por método:")
+        for step, agg in sorted(merged["by_step"].items(), key=lambda e: e[1]["command_s"], reverse=True):
+            terminalreporter.write_line(
+                f"  {step}: calls={int(agg['calls'])} commands={int(agg['commands'])} "
+                f"command_time={agg['command_s']:.3f}s total={agg['duration_s']:.3f}s"
+            )
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+from pages.practice_form_page import PracticeFormPage
+from utils.datasets import iter_chunk, submission_mismatches
+from utils.file_utils import create_temp_jpg
+
+
+@pytest.mark.e2e
+def test_practice_form_dataset(driver, dataset_chunk, dataset_stats):
+    # Lote (arquivo, início, tamanho) gerado em conftest a partir de --dataset
+    path, start, size = dataset_chunk
+    page = PracticeFormPage(driver, evidence=False)
+    page.open()
+    picture = create_temp_jpg()
+
+    # Comentário (PT-BR): A página é carregada uma vez por lote; `fill_all`
+    # sobrescreve todos os campos a cada registro. Quando um registro falha no
+    # meio do fluxo, `open()` restaura o formulário no lugar (ou navega de novo).
+    failures = []
+    for index, record in enumerate(iter_chunk(path, start, size), start):
+        t0 = time.perf_counter()
+        try:
+            page.fill_all(dict(record, picture=record.get("picture") or picture), capture=False)
+            page.submit()
+            table = page.get_submission_table()
+            page.close_modal()
+            problems = submission_mismatches(record, table)
+        except Exception as e:
+            problems = [f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"]
+            page.open()
+        dataset_stats.record(time.perf_counter() - t0, ok=not problems)
+        if problems:
+            failures.append(f"registro {index}: " + "; ".join(problems))
+
+    assert not failures, f"{len(failures)}/{size} registros divergentes:\n" + "\n".join(failures[:20])
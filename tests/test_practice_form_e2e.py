@@ -51,4 +51,45 @@ def test_practice_form_submission(driver):
     assert table.get("State and City") == f"{state} {city}"
 
     # Fecha modal
-    page.close_modal()
\ No newline at end of file
+    page.close_modal()
+
+@pytest.mark.e2e
+def test_practice_form_bulk_fill(driver):
+    page = PracticeFormPage(driver)
+    page.open()
+
+    # Mesmos dados do fluxo passo a passo, aplicados em lote (fill_all)
+    record = {
+        "first_name": "João",
+        "last_name": "da Silva",
+        "email": "joao@email.com",
+        "gender": "Male",
+        "mobile": "9999999999",
+        "birth_day": 10,
+        "birth_month": "October",
+        "birth_year": 1990,
+        "subjects": ["Maths"],
+        "hobbies": ["Sports"],
+        "picture": create_temp_jpg(),
+        "address": "Rua dos Testes, 123",
+        "state": "NCR",
+        "city": "Delhi",
+    }
+    state = page.fill_all(record)
+    assert state.get("state") == "NCR"
+    assert state.get("city") == "Delhi"
+    page.submit()
+
+    table = page.get_submission_table()
+
+    assert table.get("Student Name") == "João da Silva"
+    assert table.get("Student Email") == record["email"]
+    assert table.get("Gender") == record["gender"]
+    assert table.get("Mobile") == record["mobile"]
+    assert table.get("Date of Birth") == "10 October,1990"
+    assert "Maths" in table.get("Subjects", "")
+    assert "Sports" in table.get("Hobbies", "")
+    assert table.get("Address") == record["address"]
+    assert table.get("State and City") == "NCR Delhi"
+
+    page.close_modal()
@@ -0,0 +1,9 @@
+import pytest
+
+
+# Comentário (PT-BR): Testes de unidade não usam navegador. Esta fixture
+# substitui a autouse de `tests/conftest.py` (que depende de `driver`) para os
+# testes desta pasta.
+@pytest.fixture(autouse=True)
+def _auto_screenshot_fixture():
+    yield
@@ -0,0 +1,70 @@
+import pytest
+
+from scripts.check_links import LinkStreamParser, find_links, iter_links
+
+
+# Comentário (PT-BR): Documento com tudo o que o parser precisa ignorar ou
+# atravessar: comentários, <script>/<style> com "<a" dentro, atributos longos
+# com ">" entre aspas, entidades e texto multibyte (UTF-8 com 2, 3 e 4 bytes).
+HTML = (
+    "<!doctype html><html><head><title>Relatório</title>"
+    "<style>a[href='x'] > b { content: '<a href=\"/style\">'; }</style>"
+    "<script>var s = '<a href=\"/script\">'; if (a < b && b > c) {}</script>"
+    "</head><body>"
+    "<!-- <a href=\"/comentario\">não é link</a> -->"
+    "<img src=\"data:image/png;base64," + "QUJD" * 200 + "\" alt='a > b'>"
+    "<a href=\"/um\" target=\"_blank\" rel=\"noopener\">um</a>"
+    "<A HREF='/dois' aria-label=\"Dois > três\">dois</A>"
+    "<a\n  data-x=\"<a href='/falso'>\"\n  href=/tres>três</a>"
+    "<abbr title=\"não é âncora\">abbr</abbr>"
+    "<a name=\"sem-href\">âncora</a>"
+    "<a href=\"/ação?x=1&amp;y=2\">ação</a>"
+    "<p>日本語 😀 <a href=\"/日本\">日本</a></p>"
+    "<SCRIPT type=\"module\">document.write('<a href=\"/mod\">')</SCRIPT>"
+    "<a href=\"/fim\">fim</a>"
+    "</body></html>"
+)
+
+EXPECTED = ["/um", "/dois", "/tres", "/ação?x=1&y=2", "/日本", "/fim"]
+
+
+def _hrefs(links):
+    return [link["href"] for link in links]
+
+
+def test_full_document_links():
+    links = find_links(HTML)
+    assert _hrefs(links) == EXPECTED
+    assert links[0]["target"] == "_blank" and links[0]["rel"] == "noopener"
+    assert links[1]["aria"] == "Dois > três"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 8, 9, 13, 64])
+def test_text_chunks_split_anywhere(size):
+    parser = LinkStreamParser()
+    links = []
+    for i in range(0, len(HTML), size):
+        links += parser.feed(HTML[i:i + size])
+    links += parser.close()
+    assert _hrefs(links) == EXPECTED
+
+
+def test_every_two_way_split():
+    # Cada ponto de corte possível: dentro de tags, atributos, comentários e <script>
+    for cut in range(1, len(HTML)):
+        parser = LinkStreamParser()
+        links = parser.feed(HTML[:cut]) + parser.feed(HTML[cut:]) + parser.close()
+        assert _hrefs(links) == EXPECTED, f"corte em {cut}: {HTML[max(0, cut - 10):cut]!r}|{HTML[cut:cut + 10]!r}"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5])
+def test_byte_chunks_split_multibyte(size):
+    data = HTML.encode("utf-8")
+    chunks = [data[i:i + size] for i in range(0, len(data), size)]
+    assert _hrefs(iter_links(chunks)) == EXPECTED
+
+
+def test_unterminated_tail_does_not_leak_links():
+    parser = LinkStreamParser()
+    links = parser.feed("<a href=\"/ok\">ok</a><!-- <a href=\"/x\"> ") + parser.feed("<a href=\"/y\">") + parser.close()
+    assert _hrefs(links) == ["/ok"]
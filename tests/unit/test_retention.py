@@ -0,0 +1,133 @@
+import json
+import os
+import zipfile
+
+from PIL import Image
+
+from utils.retention import RetentionEngine
+from utils.screenshot_store import ScreenshotStore
+
+
+TEST = "tests_test_x.py_test_form"
+T0 = 1_767_000_000  # atime/mtime base das capturas (LRU)
+
+
+def _png(path, color, t=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (8, 8), color).save(path)
+    if t is not None:
+        os.utime(path, (T0 + t, T0 + t))
+    return path
+
+
+def _run(root, ts, outcome, t, color=(10, 20, 30), steps=2):
+    """Grava uma execução: `steps` capturas de etapa e o `_end_`/`_fail_` (outcome None = interrompida)."""
+    names = [f"{TEST}_step_{i:02d}_Campo_{ts}.png" for i in range(steps)]
+    for i, name in enumerate(names):
+        _png(root / name, (color[0], color[1], color[2] + i), t)
+    if outcome is not None:
+        _png(root / f"{TEST}_{'end' if outcome == 'passed' else 'fail'}_{ts}.png", (200, 0, 0), t)
+    return names
+
+
+def test_plan_orders_by_outcome_then_lru(tmp_path):
+    passed_old = _run(tmp_path, "20260101-100000", "passed", 1000)
+    passed_new = _run(tmp_path, "20260101-110000", "passed", 2000)
+    failed = _run(tmp_path, "20260101-120000", "failed", 100)
+    unknown = _run(tmp_path, "20260101-130000", None, 500)
+
+    # Orçamento = só os protegidos: todas as capturas de etapa saem
+    plan = RetentionEngine(tmp_path, max_files=3).plan()
+    evicted = [u["rel"] for u in plan["evict"]]
+    # Aprovadas (LRU primeiro), depois sem desfecho, por último as com falha
+    assert evicted == passed_old + passed_new + unknown + failed
+    assert [u["outcome"] for u in plan["evict"]] == ["passed"] * 4 + ["unknown"] * 2 + ["failed"] * 2
+    assert plan["files_after"] == 3 and not plan["over_budget"]
+
+
+def test_plan_stops_at_budget(tmp_path):
+    passed = _run(tmp_path, "20260101-100000", "passed", 1000)
+    _run(tmp_path, "20260101-110000", "failed", 2000)
+    plan = RetentionEngine(tmp_path, max_files=5).plan()
+    assert [u["rel"] for u in plan["evict"]] == passed[:1]
+
+
+def test_fail_and_end_captures_are_never_evicted(tmp_path):
+    _run(tmp_path, "20260101-100000", "passed", 1000)
+    _run(tmp_path, "20260101-110000", "failed", 1000)
+    engine = RetentionEngine(tmp_path, max_bytes=0, archive=False)
+    plan = engine.plan()
+    assert all(u["section"] == "step" for u in plan["evict"])
+    assert plan["over_budget"] and plan["protected"] == 2
+
+    engine.enforce()
+    left = sorted(p.name for p in tmp_path.glob("*.png"))
+    assert left == [f"{TEST}_end_20260101-100000.png", f"{TEST}_fail_20260101-110000.png"]
+
+
+def test_store_blob_takes_most_protective_outcome(tmp_path):
+    # Mesma captura de etapa (conteúdo idêntico) em uma execução aprovada e em uma com falha
+    _png(tmp_path / f"{TEST}_step_00_Campo_20260101-100000.png", (1, 2, 3))
+    _png(tmp_path / f"{TEST}_end_20260101-100000.png", (200, 0, 0))
+    _png(tmp_path / f"{TEST}_step_00_Campo_20260101-110000.png", (1, 2, 3))
+    _png(tmp_path / f"{TEST}_fail_20260101-110000.png", (0, 200, 0))
+    # Duas execuções aprovadas cujo `_end_` vira um único blob
+    _png(tmp_path / f"{TEST}_step_00_Campo_20260101-120000.png", (4, 5, 6))
+    _png(tmp_path / f"{TEST}_end_20260101-120000.png", (0, 0, 200))
+    _png(tmp_path / f"{TEST}_step_00_Campo_20260101-130000.png", (7, 8, 9))
+    _png(tmp_path / f"{TEST}_end_20260101-130000.png", (0, 0, 200))
+    ScreenshotStore(tmp_path, store=True).update()
+
+    units = {u["rel"]: u for u in RetentionEngine(tmp_path)._scan()}
+    index = json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
+    blob = {e["original"]: e["file"] for e in index}
+    shared = units[blob[f"{TEST}_step_00_Campo_20260101-100000.png"]]
+    assert shared["outcome"] == "failed"
+    # O `_end_` da última execução não está mais no disco, mas o índice ainda diz que ela passou
+    assert units[blob[f"{TEST}_step_00_Campo_20260101-130000.png"]]["outcome"] == "passed"
+    assert all(u["outcome"] != "unknown" for u in units.values())
+
+
+def test_enforce_archives_and_catalogs(tmp_path):
+    evicted = _run(tmp_path, "20260101-100000", "passed", 1000)
+    _run(tmp_path, "20260101-110000", "passed", 2000)
+    st = RetentionEngine(tmp_path, max_files=4).enforce()
+    assert st["evicted"] == 2 and st["files_after"] == 4
+
+    archive = tmp_path / "archive"
+    zips = list(archive.glob("retention_*.zip"))
+    assert len(zips) == 1 and st["archive"] == str(zips[0])
+    with zipfile.ZipFile(zips[0]) as zf:
+        assert sorted(zf.namelist()) == sorted(evicted + ["index.json"])
+        members = json.loads(zf.read("index.json"))
+    assert {m["outcome"] for m in members} == {"passed"}
+    catalog = json.loads((archive / "index.json").read_text(encoding="utf-8"))
+    assert [c["archive"] for c in catalog] == [zips[0].name]
+    assert sorted(catalog[0]["members"]) == sorted(evicted)
+    assert not any((tmp_path / name).exists() for name in evicted)
+
+
+def test_archive_budget_drops_oldest_zips_and_catalog_entries(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    catalog = []
+    for i, name in enumerate(("retention_20260101-000000.zip", "retention_20260102-000000.zip", "retention_20260103-000000.zip")):
+        path = archive / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (T0 + i, T0 + i))
+        catalog.append({"archive": name, "members": [f"{name}.png"]})
+    (archive / "index.json").write_text(json.dumps(catalog), encoding="utf-8")
+
+    st = RetentionEngine(tmp_path, max_files=100, archive_max_bytes=150).enforce()
+    assert st["archives_dropped"] == 2
+    assert [p.name for p in archive.glob("retention_*.zip")] == ["retention_20260103-000000.zip"]
+    kept = json.loads((archive / "index.json").read_text(encoding="utf-8"))
+    assert [c["archive"] for c in kept] == ["retention_20260103-000000.zip"]
+
+
+def test_dry_run_touches_nothing(tmp_path):
+    names = _run(tmp_path, "20260101-100000", "passed", 1000)
+    st = RetentionEngine(tmp_path, max_files=1).enforce(dry_run=True)
+    assert st["evicted"] == 2 and st["dry_run"]
+    assert all((tmp_path / n).exists() for n in names)
+    assert not (tmp_path / "archive").exists()
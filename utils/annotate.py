@@ -0,0 +1,104 @@
+import io
+from typing import Mapping, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Mesmas cores do overlay injetado no DOM (modo `dom`)
+_ACCENT = (88, 166, 255)
+_LABEL_BG = (14, 17, 22, 217)
+_FONT_CANDIDATES = ("segoeui.ttf", "arial.ttf", "DejaVuSans.ttf", "Arial.ttf", "Helvetica.ttc")
+_fonts = {}
+
+# Comentário (PT-BR): Uma única chamada JS por etapa no modo `image`: centraliza
+# e foca o elemento e devolve o retângulo em coordenadas do viewport, junto com
+# o tamanho do viewport (para mapear CSS px -> pixels da imagem) e a rolagem
+# (recorte da captura via CDP, ver `utils.capture`).
+RECT_JS = """
+var el = arguments[0];
+try { el.scrollIntoView({block: 'center'}); } catch (e) {}
+try { el.focus({preventScroll: true}); } catch (e) {}
+var r = el.getBoundingClientRect();
+return {x: r.left, y: r.top, width: r.width, height: r.height,
+        viewport_width: window.innerWidth, viewport_height: window.innerHeight,
+        scroll_x: window.scrollX, scroll_y: window.scrollY};
+"""
+
+
+def annotation_text(field_label: str, value: str, state: str) -> str:
+    return f"Campo: {field_label} • Valor: {value} • Estado: {state}"
+
+
+def _font(size: int):
+    font = _fonts.get(size)
+    if font is None:
+        for name in _FONT_CANDIDATES:
+            try:
+                font = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        else:
+            try:
+                font = ImageFont.load_default(size=size)
+            except TypeError:
+                font = ImageFont.load_default()
+        _fonts[size] = font
+    return font
+
+
+def draw_annotation(img: Image.Image, annotation: Mapping[str, object]) -> Image.Image:
+    """
+    Desenha o destaque do elemento e a caixa "Campo/Valor/Estado" sobre a imagem.
+
+    `annotation` traz o retângulo (`x`, `y`, `width`, `height`) e `viewport_width`
+    em CSS px, além do `text` do rótulo. A escala é inferida da largura da
+    imagem, cobrindo telas com devicePixelRatio > 1.
+    """
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    vw = float(annotation.get("viewport_width") or img.width) or img.width
+    scale = img.width / vw
+    x0 = float(annotation.get("x", 0)) * scale
+    y0 = float(annotation.get("y", 0)) * scale
+    x1 = x0 + float(annotation.get("width", 0)) * scale
+    y1 = y0 + float(annotation.get("height", 0)) * scale
+
+    layer = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    # Brilho externo + contorno de 2px (equivalente ao outline/box-shadow do modo DOM)
+    glow = max(1, round(6 * scale))
+    for i in range(glow, 0, -1):
+        alpha = int(110 * (1 - i / (glow + 1)))
+        draw.rectangle([x0 - i, y0 - i, x1 + i, y1 + i], outline=_ACCENT + (alpha,))
+    draw.rectangle([x0, y0, x1, y1], outline=_ACCENT + (255,), width=max(1, round(2 * scale)))
+
+    text = str(annotation.get("text") or "")
+    if text:
+        font = _font(max(10, round(12 * scale)))
+        pad_x, pad_y = round(10 * scale), round(6 * scale)
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        box_w = right - left + 2 * pad_x
+        box_h = bottom - top + 2 * pad_y
+        bx = min(max(0.0, x0), max(0.0, img.width - box_w))
+        by = y0 - round(28 * scale)
+        if by < 0:
+            by = y1 + round(4 * scale)
+        draw.rounded_rectangle(
+            [bx, by, bx + box_w, by + box_h],
+            radius=round(8 * scale),
+            fill=_LABEL_BG,
+            outline=_ACCENT + (255,),
+            width=max(1, round(scale)),
+        )
+        draw.text((bx + pad_x - left, by + pad_y - top), text, font=font, fill=(255, 255, 255, 255))
+    return Image.alpha_composite(img, layer)
+
+
+def annotate_png(data: bytes, annotation: Optional[Mapping[str, object]]) -> Image.Image:
+    """Abre os bytes PNG da captura e aplica a anotação (se houver)."""
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    if annotation:
+        img = draw_annotation(img, annotation)
+    return img
@@ -0,0 +1,285 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.remote.file_detector import UselessFileDetector
+
+from utils.driver_factory import build_chrome_options, configure_session, executor_timeout
+from utils.driver_resolver import resolve_chromedriver
+
+try:
+    from selenium.webdriver.remote.client_config import ClientConfig  # type: ignore
+except Exception:
+    ClientConfig = None  # type: ignore
+
+
+DEFAULT_STATE_DIR = Path(__file__).resolve().parents[1] / "reports" / ".browser_daemon"
+
+
+class _DaemonChrome(webdriver.Remote):
+    """
+    Sessão Chrome servida pelo chromedriver do daemon.
+
+    Com `attach`, reaproveita uma sessão existente (id + capabilities) em vez de
+    criar outra. `execute_cdp_cmd` usa o endpoint `goog/cdp/execute` do
+    chromedriver, mantendo captura via CDP e bloqueio de requisições.
+    """
+
+    def __init__(self, executor, options: Options, attach: Optional[Dict[str, object]] = None):
+        self._attach_to = attach
+        # chromedriver local: o caminho do arquivo de upload é usado diretamente
+        super().__init__(command_executor=executor, options=options, file_detector=UselessFileDetector())
+
+    def start_session(self, capabilities, *args, **kwargs):
+        if self._attach_to is None:
+            return super().start_session(capabilities, *args, **kwargs)
+        self.session_id = self._attach_to["session_id"]
+        self.caps = dict(self._attach_to.get("capabilities") or {"browserName": "chrome"})
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+
+class BrowserDaemon:
+    """
+    Chrome + chromedriver de longa duração, reaproveitados entre execuções do pytest.
+
+    Comentário (PT-BR): O chromedriver é iniciado como processo destacado (não
+    termina com o pytest) e a sessão criada nele é registrada em
+    `reports/.browser_daemon/<slot>.json`. As execuções seguintes apenas se
+    conectam a essa sessão: sem resolver o chromedriver, sem subir o
+    chromedriver e sem startup a frio do Chrome. Antes do uso a sessão passa
+    por health check; se o chromedriver caiu ele é reiniciado, se só a sessão
+    morreu uma nova é criada. Ao devolver, cookies/storage são limpos e o teste
+    seguinte recebe uma aba nova (estado CDP, histórico e sessionStorage zerados).
+    """
+
+    def __init__(self, slot: str = "main", headed: bool = False, state_dir: Optional[Path] = None):
+        self.slot = slot
+        self.headed = bool(headed)
+        self.state_dir = Path(state_dir) if state_dir else DEFAULT_STATE_DIR
+        self.state_path = self.state_dir / f"{slot}.json"
+        self.log_path = self.state_dir / f"{slot}.log"
+        self._stats: Dict[str, object] = {
+            "slot": slot,
+            "acquisitions": 0,
+            "attached": 0,
+            "new_sessions": 0,
+            "launches": 0,
+            "restarts": 0,
+            "acquire_s": 0.0,
+            "reset_s": 0.0,
+        }
+
+    # --- Estado persistido ---
+    def _load(self) -> Optional[Dict[str, object]]:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def _save(self, state: Dict[str, object]) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".part")
+        tmp.write_text(json.dumps(state, indent=1), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    # --- chromedriver ---
+    @staticmethod
+    def _http(url: str, method: str = "GET", timeout: float = 2.0):
+        req = urllib.request.Request(url, method=method)
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8") or "{}")
+
+    def _server_ok(self, state: Optional[Dict[str, object]]) -> bool:
+        if not state or not state.get("url"):
+            return False
+        try:
+            return "value" in self._http(f"{state['url']}/status")
+        except Exception:
+            return False
+
+    def _launch(self) -> Dict[str, object]:
+        """Inicia um chromedriver destacado em uma porta livre."""
+        path = resolve_chromedriver().path
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        kwargs = {}
+        if sys.platform.startswith("win"):
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+        else:
+            kwargs["start_new_session"] = True
+        with open(self.log_path, "ab") as log:
+            proc = subprocess.Popen(
+                [path, f"--port={port}"],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                **kwargs,
+            )
+        state = {"pid": proc.pid, "port": port, "url": f"http://127.0.0.1:{port}", "headed": self.headed}
+        deadline = time.monotonic() + 20.0
+        while not self._server_ok(state):
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"chromedriver do daemon não respondeu (ver {self.log_path})")
+            time.sleep(0.1)
+        self._stats["launches"] += 1
+        return state
+
+    def _connection(self, url: str):
+        timeout = executor_timeout()
+        if ClientConfig is not None:
+            try:
+                return ChromeRemoteConnection(url, keep_alive=True, client_config=ClientConfig(url, timeout=timeout))
+            except TypeError:
+                pass
+        conn = ChromeRemoteConnection(url, keep_alive=True)
+        try:
+            conn.set_timeout(timeout)
+        except Exception:
+            pass
+        return conn
+
+    # --- Sessão ---
+    def _new_session(self, state: Dict[str, object]):
+        if state.get("session_id"):
+            # Sessão antiga sem resposta: encerra para liberar o processo do Chrome
+            try:
+                self._http(f"{state['url']}/session/{state['session_id']}", method="DELETE", timeout=5.0)
+            except Exception:
+                pass
+        driver = _DaemonChrome(self._connection(str(state["url"])), build_chrome_options(self.headed))
+        state.update(
+            session_id=driver.session_id,
+            capabilities=driver.caps,
+            headed=self.headed,
+            created_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self._save(state)
+        self._stats["new_sessions"] += 1
+        return driver
+
+    def _attach(self, state: Dict[str, object]):
+        return _DaemonChrome(
+            self._connection(str(state["url"])),
+            Options(),
+            attach={"session_id": state["session_id"], "capabilities": state.get("capabilities")},
+        )
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        try:
+            handles = driver.window_handles
+            if not handles:
+                return False
+            driver.switch_to.window(handles[-1])
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def acquire(self):
+        """Conecta à sessão do daemon (iniciando ou reiniciando o que for preciso)."""
+        t0 = time.perf_counter()
+        state = self._load()
+        driver = None
+        if state and state.get("headed") == self.headed and self._server_ok(state):
+            if state.get("session_id"):
+                candidate = self._attach(state)
+                if self._healthy(candidate):
+                    driver = candidate
+                    self._stats["attached"] += 1
+                else:
+                    self._stats["restarts"] += 1
+            if driver is None:
+                driver = self._new_session(state)
+        else:
+            if state:
+                # chromedriver morto ou modo headed/headless diferente: reinicia
+                self._shutdown(state)
+                self._stats["restarts"] += 1
+            driver = self._new_session(self._launch())
+        configure_session(driver, self.headed)
+        self._stats["acquisitions"] += 1
+        self._stats["acquire_s"] += time.perf_counter() - t0
+        return driver
+
+    def release(self, driver) -> None:
+        """
+        Limpa o estado da sessão e a mantém aberta para a próxima execução.
+
+        Apaga cookies e o storage da origem atual via CDP, abre uma aba nova e
+        fecha as demais. Falhas aqui não quebram o teste: o health check da
+        próxima aquisição decide se a sessão ainda serve.
+        """
+        t0 = time.perf_counter()
+        try:
+            origin = driver.execute_script("return window.location.origin;")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            if origin and origin.startswith("http"):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            old = list(driver.window_handles)
+            driver.switch_to.new_window("tab")
+            fresh = driver.current_window_handle
+            for handle in old:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(fresh)
+        except Exception:
+            pass
+        self._stats["reset_s"] += time.perf_counter() - t0
+
+    # --- Ciclo de vida do daemon ---
+    def _shutdown(self, state: Dict[str, object]) -> None:
+        if state.get("session_id"):
+            try:
+                self._http(f"{state['url']}/session/{state['session_id']}", method="DELETE", timeout=10.0)
+            except Exception:
+                pass
+        try:
+            self._http(f"{state['url']}/shutdown", timeout=5.0)
+        except Exception:
+            pass
+        pid = state.get("pid")
+        if pid and self._server_ok(state):
+            try:
+                os.kill(int(pid), signal.SIGTERM)
+            except Exception:
+                pass
+
+    def start(self) -> Dict[str, object]:
+        """Garante o daemon no ar com uma sessão saudável; retorna o estado."""
+        driver = self.acquire()
+        self.release(driver)
+        return self.status()
+
+    def stop(self) -> bool:
+        """Encerra sessão e chromedriver; retorna False se não havia daemon registrado."""
+        state = self._load()
+        if not state:
+            return False
+        self._shutdown(state)
+        try:
+            self.state_path.unlink()
+        except OSError:
+            pass
+        return True
+
+    def status(self) -> Dict[str, object]:
+        state = self._load() or {}
+        return dict(state, slot=self.slot, running=self._server_ok(state))
+
+    def stats(self) -> Dict[str, object]:
+        return dict(self._stats)
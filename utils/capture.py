@@ -0,0 +1,139 @@
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+
+class CaptureProfile(NamedTuple):
+    """Formato, qualidade, escala e recorte das screenshots."""
+
+    format: str = "png"
+    quality: Optional[int] = None
+    scale: float = 1.0
+    clip: bool = False
+    margin: int = 48
+
+    @property
+    def is_default(self) -> bool:
+        # Captura completa em PNG: mantém o caminho original (`driver.save_screenshot`)
+        return self.format == "png" and self.scale == 1.0 and not self.clip
+
+
+CAPTURE_PROFILES: Dict[str, CaptureProfile] = {
+    "full": CaptureProfile(),
+    "webp": CaptureProfile("webp", 80),
+    "jpeg": CaptureProfile("jpeg", 80),
+    "half": CaptureProfile("webp", 80, 0.5),
+    "element": CaptureProfile("png", None, 1.0, True),
+    "element-webp": CaptureProfile("webp", 80, 1.0, True),
+    "compact": CaptureProfile("webp", 70, 0.5, True),
+}
+
+_VIEWPORT_JS = """
+return {viewport_width: window.innerWidth, viewport_height: window.innerHeight,
+        scroll_x: window.scrollX, scroll_y: window.scrollY};
+"""
+
+
+def parse_capture_profile(spec: Optional[str]) -> CaptureProfile:
+    """
+    Converte a especificação do perfil de captura em `CaptureProfile`.
+
+    Aceita um nome de `CAPTURE_PROFILES`, pares `chave=valor` separados por
+    vírgula (`format=webp,quality=70,scale=0.5,clip=1,margin=32`) ou ambos
+    (`element-webp,quality=60`). Vazio/None equivale a `full`.
+    """
+    if not spec:
+        return CAPTURE_PROFILES["full"]
+    profile = CAPTURE_PROFILES["full"]
+    for part in str(spec).split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if "=" not in part:
+            if part not in CAPTURE_PROFILES:
+                raise ValueError(f"Perfil de captura inválido: {part!r} (use {', '.join(CAPTURE_PROFILES)})")
+            profile = CAPTURE_PROFILES[part]
+            continue
+        key, _, value = part.partition("=")
+        try:
+            if key == "format":
+                value = "jpeg" if value == "jpg" else value
+                if value not in ("png", "jpeg", "webp"):
+                    raise ValueError(value)
+                profile = profile._replace(format=value)
+            elif key == "quality":
+                profile = profile._replace(quality=max(1, min(100, int(value))))
+            elif key == "scale":
+                profile = profile._replace(scale=max(0.05, min(1.0, float(value))))
+            elif key == "clip":
+                profile = profile._replace(clip=value in ("1", "true", "yes", "element"))
+            elif key == "margin":
+                profile = profile._replace(margin=max(0, int(value)))
+            else:
+                raise ValueError(key)
+        except ValueError:
+            raise ValueError(f"Parâmetro de captura inválido: {part!r}")
+    return profile
+
+
+def _clip_region(profile: CaptureProfile, region: Mapping[str, float], min_width: float = 0.0):
+    # Retângulo do elemento (coordenadas do viewport) + margem, limitado ao viewport
+    vw = float(region["viewport_width"])
+    vh = float(region["viewport_height"])
+    x, y = float(region["x"]), float(region["y"])
+    m = profile.margin
+    left = max(0.0, x - m)
+    top = max(0.0, y - m)
+    # `min_width`: largura estimada do rótulo desenhado a partir da borda esquerda do elemento
+    right = min(vw, max(x + float(region["width"]) + m, x + min_width))
+    bottom = min(vh, y + float(region["height"]) + m)
+    if right <= left or bottom <= top:
+        return None
+    return left, top, right, bottom
+
+
+def capture(
+    driver,
+    profile: CaptureProfile,
+    region: Optional[Mapping[str, float]] = None,
+    annotation: Optional[Mapping[str, object]] = None,
+) -> Tuple[str, str, Optional[Mapping[str, object]]]:
+    """
+    Captura via CDP `Page.captureScreenshot` conforme o perfil.
+
+    Comentário (PT-BR): Com `clip` e uma `region` (retângulo do elemento anotado,
+    ver `utils.annotate.RECT_JS`), o Chrome codifica apenas a área do elemento
+    mais a margem; `scale` < 1 reduz a imagem no próprio navegador. A anotação
+    (modo `image`) é transladada para o sistema de coordenadas do recorte.
+
+    Retorna (base64, formato, anotação ajustada).
+    """
+    params: Dict[str, object] = {"format": profile.format, "captureBeyondViewport": False}
+    if profile.format != "png" and profile.quality is not None:
+        params["quality"] = int(profile.quality)
+    box = None
+    if profile.clip and region:
+        min_width = len(str(annotation.get("text") or "")) * 7 + 24 if annotation else 0
+        box = _clip_region(profile, region, min_width)
+    view = region
+    if box is None and profile.scale != 1.0:
+        view = region or driver.execute_script(_VIEWPORT_JS)
+        box = (0.0, 0.0, float(view["viewport_width"]), float(view["viewport_height"]))
+    if box is not None:
+        left, top, right, bottom = box
+        params["clip"] = {
+            # Coordenadas do recorte são relativas ao documento (inclui a rolagem)
+            "x": float(view.get("scroll_x", 0)) + left,
+            "y": float(view.get("scroll_y", 0)) + top,
+            "width": right - left,
+            "height": bottom - top,
+            "scale": profile.scale,
+        }
+        if annotation:
+            annotation = dict(
+                annotation,
+                x=float(annotation.get("x", 0)) - left,
+                y=float(annotation.get("y", 0)) - top,
+                viewport_width=right - left,
+                viewport_height=bottom - top,
+            )
+    data = driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+    return data, profile.format, annotation
@@ -0,0 +1,245 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+def _payload_size(obj) -> int:
+    if obj is None:
+        return 0
+    if isinstance(obj, str):
+        return len(obj)
+    try:
+        return len(json.dumps(obj, default=str))
+    except Exception:
+        return 0
+
+
+class CommandTimeline:
+    """
+    Linha do tempo de comandos WebDriver por teste.
+
+    Comentário (PT-BR): Envolve `driver.command_executor.execute` para medir cada
+    comando (nome, duração, bytes de requisição/resposta) e atribuí-lo ao teste e
+    ao método do Page Object em execução (`step`). O tempo de cada teste é
+    separado em `sleep` (pausas fixas), `wait` (esperas/polling) e `command`
+    (comandos fora de esperas).
+    """
+
+    def __init__(self, max_slowest: int = 20):
+        self._lock = threading.Lock()
+        self._max_slowest = max_slowest
+        self._test: Optional[str] = None
+        self._t0 = 0.0
+        self._started_at = ""
+        self._commands: List[dict] = []
+        self._steps: List[dict] = []
+        self._step_stack: List[str] = []
+        self._phase_stack: List[str] = []
+        self._totals = {"command": 0.0, "wait": 0.0, "sleep": 0.0}
+        # Agregados da sessão (para o resumo do terminal)
+        self._by_step: Dict[str, Dict[str, float]] = {}
+        self._slowest: List[list] = []
+        self._session_totals = {"command": 0.0, "wait": 0.0, "sleep": 0.0, "wall": 0.0}
+
+    # --- Instalação ---
+    def install(self, driver) -> None:
+        executor = driver.command_executor
+        if getattr(executor, "_timeline_original_execute", None) is not None:
+            return
+        original = executor.execute
+        timeline = self
+
+        def execute(command, params):
+            t0 = time.perf_counter()
+            response = None
+            try:
+                response = original(command, params)
+                return response
+            finally:
+                value = response.get("value") if isinstance(response, dict) else response
+                timeline._record(command, t0, time.perf_counter(), _payload_size(params), _payload_size(value))
+
+        executor._timeline_original_execute = original
+        executor.execute = execute
+        setattr(driver, "_command_timeline", self)
+
+    # --- Contexto de teste/etapa ---
+    def begin_test(self, nodeid: str) -> None:
+        with self._lock:
+            self._test = nodeid
+            self._t0 = time.perf_counter()
+            self._started_at = datetime.now().isoformat(timespec="seconds")
+            self._commands = []
+            self._steps = []
+            self._step_stack = []
+            self._phase_stack = []
+            self._totals = {"command": 0.0, "wait": 0.0, "sleep": 0.0}
+
+    def end_test(self, out_dir: Optional[Path] = None, file_stem: Optional[str] = None) -> Optional[Path]:
+        """Finaliza o teste corrente e grava o JSON da linha do tempo (se `out_dir`)."""
+        with self._lock:
+            if self._test is None:
+                return None
+            wall = time.perf_counter() - self._t0
+            data = {
+                "test": self._test,
+                "started_at": self._started_at,
+                "duration_s": round(wall, 4),
+                "totals_s": {k: round(v, 4) for k, v in self._totals.items()},
+                "steps": self._steps,
+                "commands": self._commands,
+            }
+            for k, v in self._totals.items():
+                self._session_totals[k] += v
+            self._session_totals["wall"] += wall
+            self._test = None
+        if out_dir is None:
+            return None
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{file_stem or 'timeline'}.json"
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        return path
+
+    @contextmanager
+    def step(self, name: str):
+        with self._lock:
+            self._step_stack.append(name)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            t1 = time.perf_counter()
+            with self._lock:
+                if self._step_stack:
+                    self._step_stack.pop()
+                if self._test is not None:
+                    dur = t1 - t0
+                    self._steps.append({
+                        "name": name,
+                        "start_s": round(t0 - self._t0, 4),
+                        "duration_s": round(dur, 4),
+                        "parent": self._step_stack[-1] if self._step_stack else None,
+                    })
+                    agg = self._by_step.setdefault(name, {"calls": 0, "duration_s": 0.0, "commands": 0, "command_s": 0.0})
+                    agg["calls"] += 1
+                    agg["duration_s"] += dur
+                    self._slowest.append([self._test, name, dur])
+                    self._slowest.sort(key=lambda e: e[2], reverse=True)
+                    del self._slowest[self._max_slowest:]
+
+    @contextmanager
+    def phase(self, kind: str):
+        """Marca um intervalo como `wait` ou `sleep` para a divisão de tempo."""
+        with self._lock:
+            self._phase_stack.append(kind)
+            outermost = self._phase_stack.count(kind) == 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter() - t0
+            with self._lock:
+                if self._phase_stack:
+                    self._phase_stack.pop()
+                if outermost and self._test is not None:
+                    self._totals[kind] = self._totals.get(kind, 0.0) + dur
+
+    def sleep(self, seconds: float) -> None:
+        with self.phase("sleep"):
+            time.sleep(seconds)
+
+    def _record(self, command: str, t0: float, t1: float, req_bytes: int, resp_bytes: int) -> None:
+        with self._lock:
+            if self._test is None:
+                return
+            step = self._step_stack[-1] if self._step_stack else None
+            phase = self._phase_stack[-1] if self._phase_stack else "command"
+            dur = t1 - t0
+            self._commands.append({
+                "t_s": round(t0 - self._t0, 4),
+                "command": command,
+                "duration_ms": round(dur * 1000.0, 3),
+                "request_bytes": req_bytes,
+                "response_bytes": resp_bytes,
+                "step": step,
+                "phase": phase,
+            })
+            if not self._phase_stack:
+                self._totals["command"] += dur
+            if step is not None:
+                agg = self._by_step.setdefault(step, {"calls": 0, "duration_s": 0.0, "commands": 0, "command_s": 0.0})
+                agg["commands"] += 1
+                agg["command_s"] += dur
+
+    # --- Resumo ---
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "slowest": [list(e) for e in self._slowest],
+                "by_step": {k: dict(v) for k, v in self._by_step.items()},
+                "totals": dict(self._session_totals),
+            }
+
+
+@contextmanager
+def untimed(driver):
+    """
+    Executa comandos do `driver` sem registrá-los na linha do tempo.
+
+    Comentário (PT-BR): Usado por tarefas de infraestrutura (ex.: limpeza das
+    sessões do pool em background) que não pertencem ao teste corrente. Só é
+    seguro enquanto a thread chamadora é a única usando o driver.
+    """
+    executor = getattr(driver, "command_executor", None)
+    original = getattr(executor, "_timeline_original_execute", None)
+    if original is None:
+        yield
+        return
+    wrapped = executor.execute
+    executor.execute = original
+    try:
+        yield
+    finally:
+        executor.execute = wrapped
+
+
+def merge_summaries(summaries: Iterable[Dict[str, object]], max_slowest: int = 10) -> Dict[str, object]:
+    """Combina resumos de vários processos (workers do xdist) em um só."""
+    slowest: List[list] = []
+    by_step: Dict[str, Dict[str, float]] = {}
+    totals: Dict[str, float] = {}
+    for s in summaries:
+        slowest.extend(s.get("slowest", []))
+        for name, agg in s.get("by_step", {}).items():
+            dst = by_step.setdefault(name, {"calls": 0, "duration_s": 0.0, "commands": 0, "command_s": 0.0})
+            for k, v in agg.items():
+                dst[k] = dst.get(k, 0) + v
+        for k, v in s.get("totals", {}).items():
+            totals[k] = totals.get(k, 0.0) + v
+    slowest.sort(key=lambda e: e[2], reverse=True)
+    return {"slowest": slowest[:max_slowest], "by_step": by_step, "totals": totals}
+
+
+class TimedWait(WebDriverWait):
+    """`WebDriverWait` que contabiliza o tempo de espera na linha do tempo do driver."""
+
+    def until(self, method, message: str = ""):
+        timeline = getattr(self._driver, "_command_timeline", None)
+        if timeline is None:
+            return super().until(method, message)
+        with timeline.phase("wait"):
+            return super().until(method, message)
+
+    def until_not(self, method, message: str = ""):
+        timeline = getattr(self._driver, "_command_timeline", None)
+        if timeline is None:
+            return super().until_not(method, message)
+        with timeline.phase("wait"):
+            return super().until_not(method, message)
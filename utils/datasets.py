@@ -0,0 +1,126 @@
+import csv
+import itertools
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping
+
+from utils.stats import Histogram
+
+
+_INT_FIELDS = ("birth_day", "birth_year")
+
+
+def _normalize(raw: Mapping[str, object]) -> Dict[str, object]:
+    record = {str(k).strip(): (v.strip() if isinstance(v, str) else v) for k, v in raw.items() if k}
+    for key in _INT_FIELDS:
+        if record.get(key) not in (None, ""):
+            record[key] = int(record[key])
+    # Subjects/hobbies vazios limpam o campo ao reaproveitar a página entre registros
+    for key in ("subjects", "hobbies"):
+        record.setdefault(key, "")
+    return record
+
+
+def iter_records(path) -> Iterator[Dict[str, object]]:
+    """
+    Lê um dataset CSV (com cabeçalho) ou JSONL de forma preguiçosa, um registro por vez.
+
+    Comentário (PT-BR): O arquivo é percorrido em streaming; apenas o registro
+    corrente fica em memória. Colunas seguem as chaves de `fill_all`
+    (first_name, last_name, email, gender, mobile, birth_day, birth_month,
+    birth_year, subjects, hobbies, picture, address, state, city). Em JSONL,
+    linhas vazias ou iniciadas por `#` são ignoradas.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield _normalize(json.loads(line))
+        else:
+            for row in csv.DictReader(f):
+                yield _normalize(row)
+
+
+def count_records(path) -> int:
+    """Conta os registros sem carregá-los (usado para dividir o dataset em lotes)."""
+    return sum(1 for _ in iter_records(path))
+
+
+def iter_chunk(path, start: int, size: int) -> Iterator[Dict[str, object]]:
+    """Registros `[start, start + size)` do dataset, em streaming."""
+    return itertools.islice(iter_records(path), start, start + size)
+
+
+def _split(value) -> List[str]:
+    # Mesmo formato aceito por `fill_all`: lista ou texto separado por `;`/`,`
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return [v.strip() for v in re.split(r"[;,]", str(value or "")) if v.strip()]
+
+
+def expected_submission(record: Mapping[str, object]) -> Dict[str, str]:
+    """Valores esperados no modal de confirmação para um registro."""
+    expected = {
+        "Student Name": f"{record.get('first_name', '')} {record.get('last_name', '')}",
+        "Gender": str(record.get("gender", "")),
+        "Mobile": str(record.get("mobile", "")),
+    }
+    if record.get("email"):
+        expected["Student Email"] = str(record["email"])
+    if record.get("birth_day"):
+        expected["Date of Birth"] = f"{int(record['birth_day']):02d} {record['birth_month']},{record['birth_year']}"
+    if record.get("address"):
+        expected["Address"] = str(record["address"])
+    if record.get("state"):
+        expected["State and City"] = f"{record['state']} {record.get('city') or ''}".strip()
+    return expected
+
+
+def submission_mismatches(record: Mapping[str, object], table: Mapping[str, str]) -> List[str]:
+    """Divergências entre o registro e a tabela do modal (lista vazia = ok)."""
+    problems = [
+        f"{key}: esperado {value!r}, obtido {table.get(key)!r}"
+        for key, value in expected_submission(record).items()
+        if table.get(key) != value
+    ]
+    for key, column in (("subjects", "Subjects"), ("hobbies", "Hobbies")):
+        missing = [v for v in _split(record.get(key)) if v not in (table.get(column) or "")]
+        if missing:
+            problems.append(f"{column}: faltando {missing} em {table.get(column)!r}")
+    return problems
+
+
+class ThroughputMeter:
+    """
+    Latência por registro e vazão (registros/minuto) de uma execução de volume.
+
+    Comentário (PT-BR): As latências vão para um `Histogram` de buckets fixos,
+    não para uma lista: a memória e o tamanho do resumo enviado pelos workers
+    do xdist não crescem com o tamanho do dataset.
+    """
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.records = 0
+        self.failures = 0
+        self.busy_s = 0.0
+
+    def record(self, latency_s: float, ok: bool = True) -> None:
+        self.histogram.add(latency_s)
+        self.records += 1
+        self.busy_s += float(latency_s)
+        if not ok:
+            self.failures += 1
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "records": self.records,
+            "failures": self.failures,
+            "busy_s": self.busy_s,
+            "per_minute": (self.records / self.busy_s * 60.0) if self.busy_s else 0.0,
+            "latency": self.histogram.summary(),
+            "histogram": self.histogram.to_dict(),
+        }
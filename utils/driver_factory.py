@@ -0,0 +1,182 @@
+import os
+import platform
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+# ClientConfig foi introduzido em versões mais novas do Selenium; manter compatibilidade.
+try:
+    from selenium.webdriver.common.client_config import ClientConfig  # type: ignore
+    _HAS_CLIENT_CONFIG = True
+except Exception:
+    ClientConfig = None  # type: ignore
+    _HAS_CLIENT_CONFIG = False
+
+from utils.driver_resolver import resolve_chromedriver
+
+
+def is_ci() -> bool:
+    return os.getenv("CI", "").lower() in ("1", "true", "yes") or os.getenv("GITHUB_ACTIONS", "").lower() in ("1", "true", "yes")
+
+
+def build_chrome_options(headed: bool) -> Options:
+    """Monta as opções do Chrome usadas pela suíte (headless por padrão)."""
+    options = Options()
+    system = platform.system().lower()
+    is_macos = system == "darwin"
+    if not headed:
+        # Comentário (PT-BR): Usar headless new (estável no Chrome 109+) em todos os ambientes.
+        options.add_argument("--headless=new")
+    else:
+        # Garantir janela visível/maximizada em modo apresentação
+        try:
+            options.add_argument("--start-maximized")
+        except Exception:
+            pass
+    options.add_argument("--window-size=2560,1440")
+    options.add_argument("--force-device-scale-factor=1")
+    options.add_argument("--high-dpi-support=1")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-infobars")
+    # Comentário (PT-BR): Flags adicionais para estabilidade em headless CI
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    options.add_argument("--disable-renderer-backgrounding")
+    # Comentário (PT-BR): Evitar porta fixa de remote debugging em todos os SOs
+    # para reduzir conflitos com alocação do ChromeDriver em CI.
+    # Estratégia de carregamento: em CI usar 'normal' para estabilidade; local 'eager'.
+    try:
+        # Em macOS, usar sempre 'eager' para evitar esperas por recursos pesados
+        # que podem causar travamentos/timeout no runner do Actions.
+        pls = "eager" if is_macos else ("normal" if is_ci() else "eager")
+        options.page_load_strategy = pls
+    except Exception:
+        pass
+
+    chrome_path = os.environ.get("CHROME_PATH")
+    if chrome_path:
+        options.binary_location = chrome_path
+    else:
+        # Fallback específico para macOS: tentar localizar binário do Chrome
+        # em caminhos padrão caso CHROME_PATH não esteja definido.
+        if is_macos:
+            mac_candidates = [
+                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+                "/Applications/Google Chrome Beta.app/Contents/MacOS/Google Chrome Beta",
+                "/Applications/Chromium.app/Contents/MacOS/Chromium",
+            ]
+            for p in mac_candidates:
+                try:
+                    if os.path.exists(p):
+                        options.binary_location = p
+                        break
+                except Exception:
+                    pass
+    return options
+
+
+def executor_timeout() -> int:
+    """Timeout HTTP (segundos) dos comandos WebDriver, conforme a plataforma."""
+    # Afinamento por plataforma: no macOS runner do GitHub, comandos podem
+    # demorar mais; aumentar o timeout para reduzir ReadTimeout em operações
+    # legítimas (ex.: renderização, rolagem, screenshots).
+    exec_timeout = 45
+    if is_ci():
+        # Base mais generosa para CI em geral
+        exec_timeout = 60
+        # macOS: aumentar ainda mais para evitar ReadTimeoutError (urllib3)
+        if platform.system().lower() == "darwin":
+            exec_timeout = 120
+    return exec_timeout
+
+
+def build_chrome_driver(headed: bool = False):
+    """Cria uma sessão Chrome configurada (timeouts, janela 2560x1440)."""
+    options = build_chrome_options(headed)
+
+    # Resolução com cache local fixado (sem rede quando já resolvido; ver utils/driver_resolver.py)
+    service = Service(resolve_chromedriver().path)
+    # Timeout HTTP do executor via ClientConfig (evita deprecation warnings)
+    exec_timeout = executor_timeout()
+    if _HAS_CLIENT_CONFIG and ClientConfig is not None:
+        # Ajuste correto: usar request_timeout/read_timeout em ClientConfig
+        driver = webdriver.Chrome(
+            service=service,
+            options=options,
+            client_config=ClientConfig(request_timeout=exec_timeout, read_timeout=exec_timeout),
+        )
+    else:
+        driver = webdriver.Chrome(service=service, options=options)
+        try:
+            # Compatibilidade com Selenium antigo:
+            driver.command_executor.set_timeout(exec_timeout)
+        except Exception:
+            pass
+    configure_session(driver, headed)
+    return driver
+
+
+def configure_session(driver, headed: bool = False) -> None:
+    """Aplica timeouts e tamanho de janela a uma sessão (nova ou reaproveitada)."""
+    ci = is_ci()
+    is_macos = platform.system().lower() == "darwin"
+    # Timeout específico de carregamento de página
+    try:
+        driver.set_page_load_timeout(90 if (ci and is_macos) else 60)
+    except Exception:
+        pass
+    driver.implicitly_wait(0)
+
+    if headed:
+        try:
+            driver.maximize_window()
+        except Exception:
+            pass
+
+    # Garantir resolução mínima de 1920x1080 mesmo em headless
+    try:
+        driver.set_window_size(2560, 1440)
+    except Exception:
+        pass
+
+
+def apply_delay_settings(driver, step_delay_opt=None, shot_delay_opt=None) -> None:
+    """Resolve os delays de etapa/screenshot (CLI > env) e os expõe no driver."""
+    # Configuração de delay entre etapas (segundos)
+    # Prioridade: --step-delay > STEP_DELAY_MS env > STEP_DELAY_S env > padrão 0
+    env_ms = os.getenv("STEP_DELAY_MS")
+    env_s = os.getenv("STEP_DELAY_S")
+    delay_seconds = 0.0
+    try:
+        if step_delay_opt is not None:
+            delay_seconds = float(step_delay_opt)
+        elif env_ms:
+            delay_seconds = float(env_ms) / 1000.0
+        elif env_s:
+            delay_seconds = float(env_s)
+    except Exception:
+        delay_seconds = 0.0
+
+    # Armazena no driver para que Page Objects possam utilizar
+    setattr(driver, "_step_delay_seconds", delay_seconds)
+
+    # Configuração de delay específico para screenshots (milissegundos)
+    # Comentário (PT-BR): Prioridade: --shot-delay-ms > SCREENSHOT_DELAY_MS/env > SHOT_DELAY_MS/env > delay_time/env.
+    # O valor é convertido para segundos e disponibilizado no driver.
+    env_shot_ms = os.getenv("SCREENSHOT_DELAY_MS") or os.getenv("SHOT_DELAY_MS") or os.getenv("delay_time")
+    shot_delay_seconds = 0.0
+    try:
+        if shot_delay_opt is not None:
+            shot_delay_seconds = float(shot_delay_opt) / 1000.0
+        elif env_shot_ms:
+            shot_delay_seconds = float(env_shot_ms) / 1000.0
+    except Exception:
+        shot_delay_seconds = 0.0
+    try:
+        setattr(driver, "_shot_delay_seconds", shot_delay_seconds)
+    except Exception:
+        pass
@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from utils.command_timing import untimed
+from utils.stats import summarize
+
+
+class DriverPool:
+    """
+    Pool de sessões Chrome pré-aquecidas, um por processo (worker do xdist).
+
+    Comentário (PT-BR): As sessões são abertas em threads assim que o pool é
+    criado, de modo que o custo de startup do Chrome ocorre em paralelo e fora
+    do caminho crítico dos testes. Ao devolver uma sessão, o estado (cookies,
+    storage) é limpo em background; sessões que falham na limpeza são
+    descartadas e substituídas por uma nova. A limpeza não passa pela linha do
+    tempo de comandos (compartilhada pelo processo), para não ser atribuída à
+    etapa do teste que estiver rodando, e `close()` aguarda as limpezas em
+    andamento antes de encerrar as sessões. Com `keep_page=True` a aba não é
+    levada para `about:blank`: o próximo teste encontra o formulário carregado
+    e `PracticeFormPage.open()` o restaura no lugar (`reset()`).
+    """
+
+    def __init__(self, factory: Callable[[], object], size: int = 1, keep_page: bool = False):
+        self._factory = factory
+        self._size = max(1, int(size))
+        self._keep_page = keep_page
+        self._idle: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._drivers: List[object] = []
+        self._failures: List[str] = []
+        self._closed = False
+        self._wait_times: List[float] = []
+        self._startup_times: List[float] = []
+        self._replaced = 0
+        self._recyclers: List[threading.Thread] = []
+        for _ in range(self._size):
+            self._spawn()
+
+    # --- Ciclo de vida das sessões ---
+    def _spawn(self) -> None:
+        t = threading.Thread(target=self._start_one, name="driver-pool-warmup", daemon=True)
+        t.start()
+
+    def _start_one(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            driver = self._factory()
+        except Exception as e:
+            with self._lock:
+                self._failures.append(f"{type(e).__name__}: {e}")
+            return
+        with self._lock:
+            self._startup_times.append(time.perf_counter() - t0)
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._drivers.append(driver)
+        if closed:
+            self._quit(driver)
+            return
+        self._idle.put(driver)
+
+    def _reset(self, driver) -> bool:
+        try:
+            with untimed(driver):
+                driver.delete_all_cookies()
+                try:
+                    driver.execute_script("try{localStorage.clear();sessionStorage.clear();}catch(e){}")
+                except Exception:
+                    pass
+                if not self._keep_page:
+                    driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def _recycle(self, driver) -> None:
+        if self._reset(driver):
+            self._idle.put(driver)
+            return
+        # Comentário (PT-BR): Sessão quebrada; descarta e abre outra no lugar.
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._replaced += 1
+        self._quit(driver)
+        if not self._closed:
+            self._start_one()
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    # --- API pública ---
+    def acquire(self, timeout: Optional[float] = None):
+        """Obtém uma sessão livre, bloqueando até haver uma disponível."""
+        t0 = time.perf_counter()
+        while True:
+            try:
+                driver = self._idle.get(timeout=0.5)
+                break
+            except queue.Empty:
+                with self._lock:
+                    all_failed = len(self._failures) >= self._size and not self._drivers
+                    errors = list(self._failures)
+                if all_failed:
+                    raise RuntimeError(f"Nenhuma sessão do pool pôde ser iniciada: {errors[-1]}")
+                if timeout is not None and (time.perf_counter() - t0) > timeout:
+                    raise TimeoutError(f"Sem sessão livre no pool após {timeout:.1f}s")
+        with self._lock:
+            self._wait_times.append(time.perf_counter() - t0)
+        return driver
+
+    def release(self, driver) -> None:
+        """Devolve a sessão ao pool; a limpeza de estado roda em background."""
+        if self._closed:
+            self._quit(driver)
+            return
+        t = threading.Thread(target=self._recycle, args=(driver,), name="driver-pool-reset", daemon=True)
+        with self._lock:
+            self._recyclers = [r for r in self._recyclers if r.is_alive()]
+            self._recyclers.append(t)
+        t.start()
+
+    def close(self, timeout: float = 30.0) -> None:
+        with self._lock:
+            self._closed = True
+            recyclers = list(self._recyclers)
+            self._recyclers.clear()
+        # Comentário (PT-BR): Uma sessão em limpeza ainda está em uso pela thread
+        # de reciclagem; encerrá-la antes disso quebraria os comandos em curso.
+        deadline = time.perf_counter() + timeout
+        for t in recyclers:
+            t.join(max(0.0, deadline - time.perf_counter()))
+        with self._lock:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        for d in drivers:
+            self._quit(d)
+
+    def stats(self) -> Dict[str, object]:
+        """Métricas do pool: espera por sessão livre e tempo de startup (segundos)."""
+        with self._lock:
+            return {
+                "size": self._size,
+                "acquisitions": len(self._wait_times),
+                "wait": summarize(self._wait_times),
+                "wait_total": sum(self._wait_times),
+                "startup": summarize(self._startup_times),
+                "replaced": self._replaced,
+                "failures": len(self._failures),
+            }
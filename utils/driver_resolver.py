@@ -0,0 +1,330 @@
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional
+
+
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+_EXE = "chromedriver.exe" if platform.system().lower() == "windows" else "chromedriver"
+_memo: Dict[str, "Resolution"] = {}
+_memo_lock = threading.Lock()
+
+
+class Resolution(NamedTuple):
+    """Resultado da resolução do chromedriver."""
+
+    path: str
+    version: Optional[str]
+    chrome_version: Optional[str]
+    source: str  # env | cache | local | download
+    elapsed_s: float
+
+
+def default_cache_dir() -> Path:
+    env = os.getenv("DRIVER_CACHE_DIR")
+    if env:
+        return Path(env)
+    if platform.system().lower() == "windows":
+        base = Path(os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    else:
+        base = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "test_frontend" / "chromedriver"
+
+
+def _parse_version(text: str) -> Optional[str]:
+    m = _VERSION_RE.search(text or "")
+    return m.group(0) if m else None
+
+
+def _run_version(binary: str) -> Optional[str]:
+    try:
+        out = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10)
+    except Exception:
+        return None
+    return _parse_version(out.stdout + out.stderr)
+
+
+def _chrome_candidates() -> Iterable[str]:
+    chrome_path = os.getenv("CHROME_PATH")
+    if chrome_path:
+        yield chrome_path
+    system = platform.system().lower()
+    if system == "darwin":
+        yield "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+        yield "/Applications/Google Chrome Beta.app/Contents/MacOS/Google Chrome Beta"
+        yield "/Applications/Chromium.app/Contents/MacOS/Chromium"
+    elif system == "windows":
+        for env in ("PROGRAMFILES", "PROGRAMFILES(X86)", "LOCALAPPDATA"):
+            base = os.getenv(env)
+            if base:
+                yield str(Path(base) / "Google" / "Chrome" / "Application" / "chrome.exe")
+    else:
+        for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"):
+            found = shutil.which(name)
+            if found:
+                yield found
+
+
+def detect_chrome_version() -> Optional[str]:
+    """
+    Versão do Chrome instalado, obtida localmente (sem rede).
+
+    Comentário (PT-BR): No Windows lê o registro (BLBeacon) ou a pasta de versão
+    ao lado do chrome.exe, pois `chrome.exe --version` abre o navegador; no macOS
+    lê o Info.plist do app; no Linux executa `<binário> --version`.
+    """
+    system = platform.system().lower()
+    if system == "windows":
+        try:
+            import winreg  # type: ignore
+
+            for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                        version = _parse_version(winreg.QueryValueEx(key, "version")[0])
+                        if version:
+                            return version
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+    for candidate in _chrome_candidates():
+        path = Path(candidate)
+        if not path.exists():
+            continue
+        if system == "darwin":
+            plist = path.parents[1] / "Info.plist"
+            try:
+                import plistlib
+
+                with open(plist, "rb") as f:
+                    version = _parse_version(plistlib.load(f).get("CFBundleShortVersionString", ""))
+                if version:
+                    return version
+            except Exception:
+                pass
+        if system == "windows":
+            versions = sorted(
+                (_parse_version(p.name) for p in path.parent.iterdir() if _parse_version(p.name)),
+                key=lambda v: tuple(int(x) for x in v.split(".")),
+            )
+            if versions:
+                return versions[-1]
+            continue
+        version = _run_version(str(path))
+        if version:
+            return version
+    return None
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileLock:
+    """Trava exclusiva entre processos (workers do xdist) baseada em arquivo."""
+
+    def __init__(self, path: Path, timeout: float = 300.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fh = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if os.name == "nt":
+                    import msvcrt
+
+                    self._fh.seek(0)
+                    msvcrt.locking(self._fh.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    import fcntl
+
+                    fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except OSError:
+                if time.monotonic() > deadline:
+                    self._fh.close()
+                    raise TimeoutError(f"Trava {self.path} ocupada por mais de {self.timeout:.0f}s")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._fh.close()
+
+
+class DriverResolver:
+    """
+    Resolve o chromedriver compatível com o Chrome instalado, com cache local.
+
+    Comentário (PT-BR): O cache (`default_cache_dir()`, ou `DRIVER_CACHE_DIR`)
+    guarda um binário por versão major do Chrome e um `manifest.json` com
+    versão e sha256; cada uso confere o checksum antes de devolver o caminho.
+    Em caso de falta, a resolução ocorre sob uma trava de arquivo: o primeiro
+    worker resolve e os demais reaproveitam. Sem rede, procura um chromedriver
+    compatível já baixado pelo webdriver-manager (`~/.wdm`) ou pelo Selenium
+    Manager (`~/.cache/selenium`) antes de tentar o download.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.manifest_path = self.cache_dir / "manifest.json"
+        self.lock_path = self.cache_dir / ".lock"
+
+    # --- Manifesto ---
+    def _manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, Dict[str, str]]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".part")
+        tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def _cached(self, major: str) -> Optional[Dict[str, str]]:
+        entry = self._manifest().get(major)
+        if not entry:
+            return None
+        path = Path(entry.get("path", ""))
+        try:
+            if path.is_file() and sha256_file(path) == entry.get("sha256"):
+                return entry
+        except OSError:
+            pass
+        return None
+
+    def _pin(self, major: str, binary: Path, version: Optional[str], origin: str) -> Dict[str, str]:
+        # Copia para o cache próprio: o binário fixado não muda se outra ferramenta limpar o dela
+        dest = self.cache_dir / (version or major) / _EXE
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".part")
+        shutil.copy2(binary, tmp)
+        os.chmod(tmp, 0o755)
+        os.replace(tmp, dest)
+        entry = {
+            "version": version or "",
+            "path": str(dest),
+            "sha256": sha256_file(dest),
+            "origin": origin,
+            "resolved_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        manifest = self._manifest()
+        manifest[major] = entry
+        self._save_manifest(manifest)
+        return entry
+
+    # --- Fontes locais e download ---
+    @staticmethod
+    def _local_candidates() -> Iterable[Path]:
+        home = Path.home()
+        for root in (home / ".wdm" / "drivers" / "chromedriver", home / ".cache" / "selenium" / "chromedriver"):
+            if root.is_dir():
+                yield from root.rglob(_EXE)
+        found = shutil.which("chromedriver")
+        if found:
+            yield Path(found)
+
+    def _find_local(self, major: Optional[str]):
+        best = None
+        for path in self._local_candidates():
+            version = _run_version(str(path))
+            if not version or (major and version.split(".")[0] != major):
+                continue
+            key = tuple(int(x) for x in version.split("."))
+            if best is None or key > best[0]:
+                best = (key, path, version)
+        return (best[1], best[2]) if best else (None, None)
+
+    @staticmethod
+    def _download() -> Path:
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        return Path(ChromeDriverManager().install())
+
+    def resolve(self) -> Resolution:
+        t0 = time.perf_counter()
+        pinned = os.getenv("CHROMEDRIVER_PATH")
+        if pinned:
+            return Resolution(pinned, _run_version(pinned), None, "env", time.perf_counter() - t0)
+        chrome_version = detect_chrome_version()
+        if chrome_version is None:
+            # Comentário (PT-BR): Sem a versão do Chrome não há como saber se um
+            # binário fixado continua compatível (o Chrome pode ter sido
+            # atualizado); resolve a cada processo e não grava no manifesto.
+            # Baixar também exigiria a versão (e rede): falha com orientação.
+            path, version = self._find_local(None)
+            if path is None:
+                raise RuntimeError(
+                    "Versão do Chrome não detectada e nenhum chromedriver local encontrado; "
+                    "defina CHROME_PATH (binário do Chrome) ou CHROMEDRIVER_PATH (binário do chromedriver)"
+                )
+            return Resolution(str(path), version, None, "local", time.perf_counter() - t0)
+        major = chrome_version.split(".")[0]
+        entry = self._cached(major)
+        source = "cache"
+        if entry is None:
+            with FileLock(self.lock_path):
+                # Outro processo pode ter resolvido enquanto esperávamos a trava
+                entry = self._cached(major)
+                if entry is None:
+                    path, version = self._find_local(major)
+                    source = "local"
+                    if path is None:
+                        path = self._download()
+                        version = _run_version(str(path))
+                        source = "download"
+                    entry = self._pin(major, path, version, source)
+        return Resolution(entry["path"], entry.get("version") or None, chrome_version, source, time.perf_counter() - t0)
+
+    def peek(self) -> Optional[Resolution]:
+        """Entrada já fixada para o Chrome instalado, sem resolver, travar ou baixar (None se não houver)."""
+        t0 = time.perf_counter()
+        pinned = os.getenv("CHROMEDRIVER_PATH")
+        if pinned:
+            return Resolution(pinned, None, None, "env", time.perf_counter() - t0)
+        chrome_version = detect_chrome_version()
+        if chrome_version is None:
+            return None
+        entry = self._cached(chrome_version.split(".")[0])
+        if entry is None:
+            return None
+        return Resolution(entry["path"], entry.get("version") or None, chrome_version, "cache", time.perf_counter() - t0)
+
+
+def resolve_chromedriver(cache_dir: Optional[Path] = None) -> Resolution:
+    """Resolve o chromedriver uma vez por processo (pool/daemon reaproveitam o resultado)."""
+    key = str(cache_dir or "")
+    with _memo_lock:
+        res = _memo.get(key)
+        if res is None:
+            res = DriverResolver(cache_dir).resolve()
+            _memo[key] = res
+        return res
@@ -3,10 +3,19 @@ import tempfile
 from PIL import Image
 
 
+def worker_id() -> str:
+    """Identificador do worker do pytest-xdist (ex.: 'gw0'); vazio em execução serial."""
+    return os.getenv("PYTEST_XDIST_WORKER", "")
+
+
 def create_temp_jpg(prefix: str = "upload_img") -> str:
     """Cria uma imagem .jpg temporária (1x1) e retorna o caminho absoluto."""
     tmp_dir = tempfile.gettempdir()
-    file_path = os.path.join(tmp_dir, f"{prefix}.jpg")
+    # Comentário (PT-BR): Em execução paralela cada worker usa seu próprio arquivo,
+    # evitando que um processo sobrescreva a imagem enquanto outro faz o upload.
+    wid = worker_id()
+    name = f"{prefix}_{wid}.jpg" if wid else f"{prefix}.jpg"
+    file_path = os.path.join(tmp_dir, name)
     img = Image.new("RGB", (1, 1), (255, 255, 255))
     img.save(file_path, format="JPEG")
-    return file_path
\ No newline at end of file
+    return file_path
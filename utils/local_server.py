@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+SITE_DIR = Path(__file__).resolve().parent / "local_site"
+FORM_PATH = "/automation-practice-form"
+
+# Perfis de latência por requisição: (base em ms, jitter em ms)
+LATENCY_PROFILES = {
+    "none": (0.0, 0.0),
+    "lan": (2.0, 1.0),
+    "broadband": (40.0, 10.0),
+    "slow": (150.0, 50.0),
+    "3g": (300.0, 100.0),
+    "jittery": (50.0, 200.0),
+}
+
+
+def parse_latency_profile(spec: Optional[str]) -> Tuple[float, float]:
+    """
+    Converte o perfil de latência em (base_ms, jitter_ms).
+
+    Aceita um nome de `LATENCY_PROFILES` ou o formato `<base_ms>:<jitter_ms>`
+    (ex.: `120:30`). Vazio/None equivale a `none`.
+    """
+    if not spec:
+        return LATENCY_PROFILES["none"]
+    key = str(spec).strip().lower()
+    if key in LATENCY_PROFILES:
+        return LATENCY_PROFILES[key]
+    try:
+        base, _, jitter = key.partition(":")
+        return max(0.0, float(base)), max(0.0, float(jitter or 0.0))
+    except ValueError:
+        raise ValueError(
+            f"Perfil de latência inválido: {spec!r} (use {', '.join(LATENCY_PROFILES)} ou <base_ms>:<jitter_ms>)"
+        )
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    server_version = "LocalPracticeForm/1.0"
+
+    def __init__(self, *args, site_server=None, **kwargs):
+        self._site_server = site_server
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self._site_server.delay()
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path in ("", FORM_PATH):
+            self.path = FORM_PATH + ".html"
+        super().do_GET()
+
+    def do_HEAD(self):
+        self._site_server.delay()
+        super().do_HEAD()
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        # Silencioso: o servidor roda junto da suíte e não deve poluir a saída
+        pass
+
+
+class LocalPracticeFormServer:
+    """
+    Servidor HTTP local que serve a réplica do formulário do DemoQA.
+
+    Comentário (PT-BR): Cada requisição sofre um atraso `base ± jitter` (ms) de
+    acordo com o perfil configurado. O jitter usa um gerador com semente fixa,
+    tornando a sequência de atrasos reprodutível entre execuções.
+    """
+
+    def __init__(self, latency_profile: Optional[str] = None, host: str = "127.0.0.1", port: int = 0, seed: int = 1234):
+        self.base_ms, self.jitter_ms = parse_latency_profile(latency_profile)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        handler = partial(_Handler, site_server=self, directory=str(SITE_DIR))
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def form_url(self) -> str:
+        return self.base_url.rstrip("/") + FORM_PATH
+
+    def delay(self) -> None:
+        with self._rng_lock:
+            self.requests += 1
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        ms = max(0.0, self.base_ms + jitter)
+        if ms > 0:
+            time.sleep(ms / 1000.0)
+
+    def start(self) -> "LocalPracticeFormServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-practice-form", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Serve a réplica local do formulário do DemoQA")
+    ap.add_argument("--port", type=int, default=8001)
+    ap.add_argument("--latency", default="none", help=f"Perfil: {', '.join(LATENCY_PROFILES)} ou <base_ms>:<jitter_ms>")
+    ns = ap.parse_args()
+    srv = LocalPracticeFormServer(ns.latency, port=ns.port).start()
+    print(f"[local] Servindo {srv.form_url} (latência {srv.base_ms:.0f}±{srv.jitter_ms:.0f}ms). Ctrl+C para encerrar.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        srv.stop()
@@ -0,0 +1,65 @@
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidElementStateException,
+    StaleElementReferenceException,
+)
+
+
+class LocatorCache:
+    """
+    Handles de elementos estáticos do formulário, resolvidos em lote.
+
+    Comentário (PT-BR): `warm()` resolve todos os localizadores em uma única
+    sonda do `WaitEngine` (um round trip). `run()` executa a ação direto no
+    handle em cache, sem nova espera; a detecção de staleness é a própria ação:
+    se o WebDriver responde `StaleElementReferenceException` (documento
+    recarregado, nó re-renderizado) ou o elemento ainda não aceita interação,
+    o handle é descartado e o elemento é resolvido de novo pela espera normal.
+    Contadores (`locator_hit`, `locator_miss`, `locator_stale`,
+    `locator_not_ready`, `locator_warm`) vão para as métricas do motor de espera.
+    """
+
+    def __init__(self, waits, locators: Mapping[str, Tuple[str, str]]):
+        self._waits = waits
+        self.locators: Dict[str, Tuple[str, str]] = dict(locators)
+        self._handles: Dict[str, object] = {}
+
+    def warm(self) -> int:
+        """Resolve todos os localizadores de uma vez; retorna quantos foram encontrados."""
+        names = list(self.locators)
+        elements, _ = self._waits.probe([self.locators[n] for n in names], "present")
+        self._handles = {n: e for n, e in zip(names, elements) if e is not None}
+        self._waits.record("locator_warm")
+        return len(self._handles)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._handles.clear()
+        else:
+            self._handles.pop(name, None)
+
+    def run(self, name: str, action: Callable[[object], object], condition: str = "clickable", timeout: float = 20.0):
+        """Executa `action(elemento)` usando o handle em cache ou, na falta dele, a espera `condition`."""
+        el = self._handles.get(name)
+        if el is not None:
+            try:
+                result = action(el)
+                self._waits.record("locator_hit")
+                return result
+            except StaleElementReferenceException:
+                self._waits.record("locator_stale")
+            except (InvalidElementStateException, ElementClickInterceptedException):
+                # Inclui ElementNotInteractableException (ex.: coberto, desabilitado)
+                self._waits.record("locator_not_ready")
+            self._handles.pop(name, None)
+        self._waits.record("locator_miss")
+        el = self._waits.wait_all([self.locators[name]], condition, timeout)[0]
+        result = action(el)
+        self._handles[name] = el
+        return result
+
+    def element(self, name: str, condition: str = "present", timeout: float = 20.0):
+        """Handle em cache (sem round trip) ou resolvido pela espera `condition`."""
+        return self.run(name, lambda el: el, condition, timeout)
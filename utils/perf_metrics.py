@@ -0,0 +1,261 @@
+import html
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.stats import summarize
+
+
+# Comentário (PT-BR): Observadores instalados antes de qualquer script da página
+# (Page.addScriptToEvaluateOnNewDocument). LCP e long tasks só são entregues a
+# quem observa; o buffer de Resource Timing é ampliado (padrão do Chrome: 250).
+_OBSERVER_JS = r"""
+(function () {
+  if (window.__perfObs) return;
+  var s = window.__perfObs = {lcp: null, longtasks: []};
+  try { performance.setResourceTimingBufferSize(2000); } catch (e) {}
+  function observe(type, cb) {
+    try {
+      new PerformanceObserver(function (list) { list.getEntries().forEach(cb); })
+        .observe({type: type, buffered: true});
+    } catch (e) {}
+  }
+  observe('largest-contentful-paint', function (e) {
+    var el = e.element;
+    s.lcp = {
+      t: e.startTime, size: e.size, url: e.url || null,
+      element: el ? el.tagName.toLowerCase() + (el.id ? '#' + el.id : '') : null
+    };
+  });
+  observe('longtask', function (e) {
+    if (s.longtasks.length < 500) s.longtasks.push({start: e.startTime, duration: e.duration});
+  });
+})();
+"""
+
+# Lê tudo em uma chamada. Se o documento mudou (timeOrigin diferente), a etapa
+# navegou: inclui Navigation Timing, paint e LCP e considera recursos desde 0.
+_COLLECT_JS = r"""
+var origin = arguments[0], since = arguments[1] || 0, done = arguments[arguments.length - 1];
+var late = !window.__perfObs;
+if (late) { (function () { %s })(); }
+setTimeout(function () {
+  function r(x) { return Math.round((x || 0) * 10) / 10; }
+  var navigated = origin === null || Math.abs(performance.timeOrigin - origin) > 1;
+  if (navigated) since = 0;
+  var out = {url: location.href, navigated: navigated, since: r(since), now: r(performance.now()), late_observer: late};
+  if (navigated) {
+    var n = performance.getEntriesByType('navigation')[0];
+    if (n) {
+      out.navigation = {
+        type: n.type, dns: r(n.domainLookupEnd - n.domainLookupStart), connect: r(n.connectEnd - n.connectStart),
+        ttfb: r(n.responseStart), response: r(n.responseEnd - n.responseStart),
+        dom_interactive: r(n.domInteractive), dom_content_loaded: r(n.domContentLoadedEventEnd),
+        load: r(n.loadEventEnd), transfer_size: n.transferSize || 0
+      };
+    }
+    var paint = {};
+    performance.getEntriesByType('paint').forEach(function (p) {
+      paint[p.name === 'first-contentful-paint' ? 'fcp' : 'fp'] = r(p.startTime);
+    });
+    out.paint = paint;
+    var lcp = window.__perfObs && window.__perfObs.lcp;
+    out.lcp = lcp ? {t: r(lcp.t), size: lcp.size, element: lcp.element, url: lcp.url} : null;
+  }
+  out.long_tasks = ((window.__perfObs && window.__perfObs.longtasks) || [])
+    .filter(function (t) { return t.start >= since; })
+    .map(function (t) { return [r(t.start), r(t.duration)]; });
+  out.requests = performance.getEntriesByType('resource')
+    .filter(function (e) { return e.startTime >= since; })
+    .map(function (e) {
+      return {
+        name: e.name.length > 200 ? e.name.slice(0, 200) : e.name, type: e.initiatorType,
+        start: r(e.startTime), duration: r(e.duration),
+        dns: r(e.domainLookupEnd - e.domainLookupStart), connect: r(e.connectEnd - e.connectStart),
+        ttfb: e.responseStart ? r(e.responseStart - e.startTime) : null,
+        download: e.responseStart ? r(e.responseEnd - e.responseStart) : null,
+        size: e.transferSize || 0
+      };
+    });
+  done(out);
+}, late ? 50 : 0);
+""" % _OBSERVER_JS
+
+_MARK_JS = "return [performance.timeOrigin, performance.now()];"
+
+
+def _site_ms(entry: Dict[str, object]) -> float:
+    """Tempo atribuído ao site: `load` da navegação ou fim do último recurso da janela."""
+    nav = entry.get("navigation") or {}
+    if nav.get("load"):
+        return float(nav["load"])
+    since = float(entry.get("since") or 0.0)
+    ends = [float(r["start"]) + float(r["duration"]) for r in entry.get("requests") or []]
+    return max(ends) - since if ends else 0.0
+
+
+class PerfRecorder:
+    """
+    Métricas de desempenho do navegador por teste (`open()`/`submit()`).
+
+    Comentário (PT-BR): Usa as APIs de Performance Timeline da própria página
+    (Navigation/Resource/Paint Timing, LCP e long tasks) em vez do log de
+    performance do ChromeDriver, que exige a opção na criação da sessão e não
+    funcionaria com o pool nem com o navegador persistente. Os observadores são
+    registrados via CDP antes do primeiro script da página; sem CDP (ex.: Grid),
+    são instalados na coleta e LCP/long tasks ficam limitados ao que o buffer do
+    Chrome entrega. Cada etapa medida faz duas chamadas extras: uma marca antes
+    e uma coleta assíncrona depois.
+    """
+
+    STEPS = ("open", "submit")
+
+    def __init__(self, driver, steps=STEPS, max_entries: int = 50):
+        self.driver = driver
+        self.steps = tuple(steps)
+        self.max_entries = max_entries
+        self.cdp = False
+        self._test: Optional[str] = None
+        self._started_at = ""
+        self._entries: List[dict] = []
+        self._dropped = 0
+
+    def install(self) -> "PerfRecorder":
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _OBSERVER_JS})
+            self.cdp = True
+        except Exception:
+            self.cdp = False
+        setattr(self.driver, "_perf_recorder", self)
+        return self
+
+    def begin_test(self, nodeid: str) -> None:
+        self._test = nodeid
+        self._started_at = datetime.now().isoformat(timespec="seconds")
+        self._entries = []
+        self._dropped = 0
+
+    @contextmanager
+    def step(self, name: str):
+        if name not in self.steps or self._test is None:
+            yield
+            return
+        try:
+            origin, since = self.driver.execute_script(_MARK_JS)
+        except Exception:
+            origin, since = None, 0.0
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - t0) * 1000.0
+            if len(self._entries) >= self.max_entries:
+                self._dropped += 1
+            else:
+                self._collect(name, wall_ms, origin, since)
+
+    def _collect(self, name: str, wall_ms: float, origin, since) -> None:
+        try:
+            data = dict(self.driver.execute_async_script(_COLLECT_JS, origin, since) or {})
+        except Exception as e:
+            data = {"error": f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"}
+        site = _site_ms(data)
+        data.update(
+            step=name,
+            wall_ms=round(wall_ms, 1),
+            site_ms=round(site, 1),
+            # Tempo fora do site (comandos, esperas, pausas de evidência)
+            harness_ms=round(max(0.0, wall_ms - site), 1),
+        )
+        self._entries.append(data)
+
+    def end_test(self, out_dir: Path, name: str) -> Optional[Dict[str, object]]:
+        """Grava `<out_dir>/<name>.json` (compacto) e retorna o resumo do teste."""
+        if self._test is None:
+            return None
+        entries, self._test = self._entries, None
+        if not entries:
+            return None
+        doc = {
+            "test": name,
+            "started_at": self._started_at,
+            "cdp_observers": self.cdp,
+            "dropped": self._dropped,
+            "steps": entries,
+        }
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / f"{name}.json").write_text(json.dumps(doc, separators=(",", ":")), encoding="utf-8")
+        return {"test": name, "file": f"{name}.json", "steps": [step_summary(e) for e in entries]}
+
+
+def step_summary(entry: Dict[str, object]) -> Dict[str, object]:
+    """Resumo compacto de uma etapa (linha do relatório)."""
+    nav = entry.get("navigation") or {}
+    paint = entry.get("paint") or {}
+    lcp = entry.get("lcp") or {}
+    tasks = entry.get("long_tasks") or []
+    requests = entry.get("requests") or []
+    return {
+        "step": entry.get("step"),
+        "navigated": bool(entry.get("navigated")),
+        "wall_ms": entry.get("wall_ms", 0.0),
+        "site_ms": entry.get("site_ms", 0.0),
+        "harness_ms": entry.get("harness_ms", 0.0),
+        "ttfb_ms": nav.get("ttfb"),
+        "fcp_ms": paint.get("fcp"),
+        "lcp_ms": lcp.get("t"),
+        "long_tasks": len(tasks),
+        "long_task_ms": round(sum(t[1] for t in tasks), 1),
+        "requests": len(requests),
+        "bytes": sum(int(r.get("size") or 0) for r in requests),
+        "error": entry.get("error"),
+    }
+
+
+def aggregate(rows) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Percentis por etapa (wall/site/harness/fcp/lcp) a partir dos resumos por teste."""
+    series: Dict[str, Dict[str, List[float]]] = {}
+    for row in rows:
+        for st in row.get("steps") or []:
+            agg = series.setdefault(st["step"], {})
+            for key in ("wall_ms", "site_ms", "harness_ms", "fcp_ms", "lcp_ms", "long_task_ms"):
+                if st.get(key) is not None:
+                    agg.setdefault(key, []).append(float(st[key]))
+    return {step: {k: summarize(v) for k, v in agg.items()} for step, agg in series.items()}
+
+
+def summary_html(rows, perf_dir: str = "perf") -> str:
+    """Tabela HTML (pytest-html) com os percentis por etapa e o JSON de cada teste."""
+    agg = aggregate(rows)
+    if not agg:
+        return ""
+
+    def cell(step, key):
+        st = agg[step].get(key)
+        return f"{st['p50']:.0f} / {st['p95']:.0f}" if st and st["count"] else "-"
+
+    head = "".join(f"<th>{h}</th>" for h in ("etapa", "n", "total", "site", "harness", "FCP", "LCP", "long tasks"))
+    body = "".join(
+        "<tr><td>{}</td><td>{}</td>{}</tr>".format(
+            step,
+            agg[step]["wall_ms"]["count"],
+            "".join(
+                f"<td>{cell(step, k)}</td>"
+                for k in ("wall_ms", "site_ms", "harness_ms", "fcp_ms", "lcp_ms", "long_task_ms")
+            ),
+        )
+        for step in sorted(agg)
+    )
+    links = ", ".join(
+        f'<a href="{html.escape(perf_dir + "/" + r["file"])}">{html.escape(r["test"])}</a>' for r in rows[:50]
+    )
+    return (
+        "<h2>Desempenho do navegador</h2>"
+        "<p>p50 / p95 em ms. <em>site</em> = evento load da navegação (ou fim do último recurso); "
+        "<em>harness</em> = tempo da etapa fora do site.</p>"
+        f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+        f"<p>Waterfall por teste: {links}</p>"
+    )
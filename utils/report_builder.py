@@ -0,0 +1,490 @@
+import hashlib
+import html
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from utils.screenshot_store import INDEX_NAME, ScreenshotStore
+
+
+STATE_NAME = ".report_state.json"
+THUMBS_DIRNAME = "thumbs"
+# <nodeid sanitizado>_recording_<ts>.apng (gravação de etapas, --record-steps)
+_RECORDING_RE = re.compile(r"^(?P<test>.+?)_recording_(?P<ts>\d{8}-\d{6})$")
+_SECTION_RANK = {"step": 0, "recording": 0, "fail": 1, "end": 2}
+
+_CSS = """
+:root { --bg: #0f172a; --panel: #111827; --muted: #94a3b8; --text: #e5e7eb; --ok: #10b981; --fail: #ef4444;
+        --skip: #f59e0b; --info: #60a5fa; --card: #0b1220; --border: #1f2937; }
+html, body { background: var(--bg); color: var(--text); font-family: Segoe UI, Arial, sans-serif; margin: 0; }
+a { color: var(--info); }
+.container { max-width: 1200px; margin: 0 auto; padding: 24px; }
+.title { display: flex; align-items: center; gap: 12px; }
+.title h1 { margin: 0; font-size: 28px; font-weight: 700; }
+.badge { padding: 6px 10px; border-radius: 6px; font-weight: 600; font-size: 12px; border: 1px solid var(--border); }
+.badge.ok { background: #052e25; color: var(--ok); }
+.badge.fail { background: #3a0a0a; color: var(--fail); }
+.badge.skip { background: #3a2a05; color: var(--skip); }
+.panel { background: var(--panel); border: 1px solid var(--border); border-radius: 12px; padding: 16px; margin-top: 24px; }
+.panel h2 { margin-top: 0; font-size: 18px; }
+.kpis { display: grid; grid-template-columns: repeat(4, 1fr); gap: 12px; margin-top: 12px; }
+.card { background: var(--card); border: 1px solid var(--border); border-radius: 12px; padding: 12px; }
+.card h3 { margin: 0; font-size: 14px; color: var(--muted); font-weight: 600; }
+.card .value { margin-top: 4px; font-size: 22px; font-weight: 700; }
+.actions { display: flex; gap: 8px; flex-wrap: wrap; margin-top: 12px; }
+.btn { display: inline-block; padding: 8px 12px; border-radius: 8px; border: 1px solid var(--border); background: #0a1220;
+       color: var(--text); text-decoration: none; font-weight: 600; }
+table { width: 100%; border-collapse: collapse; }
+th, td { text-align: left; padding: 8px; border-bottom: 1px solid var(--border); }
+thead th { font-size: 12px; color: var(--muted); }
+.status.passed { color: var(--ok); font-weight: 700; }
+.status.failed, .status.error { color: var(--fail); font-weight: 700; }
+.status.skipped { color: var(--skip); font-weight: 700; }
+.gallery { display: grid; grid-template-columns: repeat(4, 1fr); gap: 12px; }
+.shot { background: var(--card); border: 1px solid var(--border); border-radius: 10px; padding: 8px; }
+.shot img { width: 100%; height: 140px; object-fit: cover; border-radius: 6px; border: 1px solid var(--border); }
+.shot .cap { margin-top: 6px; font-size: 12px; color: var(--muted); }
+footer { margin-top: 24px; color: var(--muted); font-size: 12px; }
+"""
+
+
+def make_thumbnail(job: Tuple[str, str, int]) -> Tuple[str, Optional[List[int]], Optional[str]]:
+    """Gera a miniatura JPEG de `src` em `dst` (executado no pool de processos)."""
+    src, dst, width = job
+    try:
+        with Image.open(src) as img:
+            size = list(img.size)
+            # APNG/WebP animados: primeiro quadro
+            img.seek(0)
+            frame = img.convert("RGB")
+        frame.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+        dst_path = Path(dst)
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst_path.with_name(dst_path.name + ".part")
+        frame.save(tmp, format="JPEG", quality=80)
+        os.replace(tmp, dst_path)
+        return src, size, None
+    except Exception as e:
+        return src, None, f"{type(e).__name__}: {e}"
+
+
+def _case_status(case: ET.Element) -> Tuple[str, str]:
+    for tag, status in (("failure", "failed"), ("error", "error"), ("skipped", "skipped")):
+        node = case.find(tag)
+        if node is not None:
+            message = node.get("message") or (node.text or "")
+            return status, (message.strip().splitlines() or [""])[0][:300]
+    return "passed", ""
+
+
+def parse_junit(path: Path) -> List[dict]:
+    """Uma execução por `<testsuite>` do arquivo JUnit XML."""
+    root = ET.parse(path).getroot()
+    suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+    runs = []
+    for suite in suites:
+        cases = []
+        for case in suite.iter("testcase"):
+            status, message = _case_status(case)
+            cases.append({
+                "classname": case.get("classname", ""),
+                "name": case.get("name", ""),
+                "time": float(case.get("time") or 0.0),
+                "status": status,
+                "message": message,
+            })
+        stamp = suite.get("timestamp") or datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        runs.append({
+            "id": re.sub(r"[^0-9A-Za-z]+", "", stamp)[:20] + "_" + re.sub(r"\W+", "_", suite.get("hostname") or "local"),
+            "timestamp": stamp,
+            "source": path.name,
+            "suite": suite.get("name", ""),
+            "hostname": suite.get("hostname", ""),
+            "tests": int(suite.get("tests") or len(cases)),
+            "failures": int(suite.get("failures") or 0) + int(suite.get("errors") or 0),
+            "skipped": int(suite.get("skipped") or 0),
+            "time": float(suite.get("time") or 0.0),
+            "cases": cases,
+        })
+    return runs
+
+
+def _local_naive(stamp: str) -> Optional[datetime]:
+    # Timestamps do JUnit têm fuso; os das screenshots são hora local sem fuso
+    try:
+        return datetime.fromisoformat(stamp).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _ts(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value or "", "%Y%m%d-%H%M%S")
+    except ValueError:
+        return None
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", text)[:120]
+
+
+def _evidence_page(key: Tuple[str, str]) -> str:
+    # O id da execução fica inteiro no nome mesmo com nodeids longos
+    return f"evidence/{_slug(key[0])[:80]}_{_slug(key[1])}.html"
+
+
+class ReportBuilder:
+    """
+    Relatório estático (`reports/summary.html`) montado de forma incremental.
+
+    Comentário (PT-BR): Combina os JUnit XML, as screenshots/gravações de etapa
+    (via `screenshots/index.json`, também incremental) e as linhas do tempo de
+    `--instrument`. O estado (`reports/.report_state.json`) guarda o que já foi
+    processado: só arquivos novos ou alterados são relidos, só imagens novas
+    ganham miniatura (geradas em um pool de processos) e só execuções novas
+    ganham página própria. O `summary.html` mostra apenas as execuções mais
+    recentes, com miniaturas carregadas sob demanda (`loading="lazy"`) e links
+    para as imagens originais, então continua leve após milhares de execuções.
+    """
+
+    def __init__(
+        self,
+        reports_dir,
+        screenshots_dir,
+        timeline_dir=None,
+        junit_files: Optional[Iterable[Path]] = None,
+        workers: Optional[int] = None,
+        thumb_width: int = 320,
+        recent_runs: int = 30,
+        recent_evidence: int = 50,
+    ):
+        self.reports = Path(reports_dir)
+        self.screens = Path(screenshots_dir)
+        self.timeline_dir = Path(timeline_dir) if timeline_dir else self.reports / "timeline"
+        self.junit_files = list(junit_files) if junit_files is not None else sorted(self.reports.glob("junit*.xml"))
+        self.workers = workers
+        self.thumb_width = int(thumb_width)
+        self.recent_runs = int(recent_runs)
+        self.recent_evidence = int(recent_evidence)
+        self.state_path = self.reports / STATE_NAME
+        self.thumbs_dir = self.reports / THUMBS_DIRNAME
+
+    # --- Estado ---
+    def _load_state(self) -> dict:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            state = {}
+        for key in ("sources", "timeline", "thumbs", "pages"):
+            state.setdefault(key, {})
+        state.setdefault("runs", [])
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        self.reports.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".part")
+        tmp.write_text(json.dumps(state, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    @staticmethod
+    def _signature(path: Path) -> List[int]:
+        st = path.stat()
+        return [st.st_size, int(st.st_mtime)]
+
+    def _rel(self, path: Path) -> str:
+        return os.path.relpath(path, self.reports).replace(os.sep, "/")
+
+    # --- Fontes ---
+    def _ingest_junit(self, state: dict, stats: Dict[str, int]) -> None:
+        known = {r["id"] for r in state["runs"]}
+        for path in self.junit_files:
+            path = Path(path)
+            if not path.is_file():
+                continue
+            sig = self._signature(path)
+            if state["sources"].get(str(path)) == sig:
+                continue
+            try:
+                runs = parse_junit(path)
+            except (ET.ParseError, OSError):
+                continue
+            for run in runs:
+                if run["id"] not in known:
+                    state["runs"].append(run)
+                    known.add(run["id"])
+                    stats["runs_new"] += 1
+            state["sources"][str(path)] = sig
+        state["runs"].sort(key=lambda r: r["timestamp"])
+
+    def _ingest_timeline(self, state: dict, stats: Dict[str, int]) -> None:
+        if not self.timeline_dir.is_dir():
+            return
+        for path in self.timeline_dir.glob("*.json"):
+            sig = self._signature(path)
+            known = state["timeline"].get(path.stem)
+            if known and known.get("sig") == sig:
+                continue
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            steps = [(s["name"], s["duration_s"]) for s in data.get("steps") or [] if not s.get("parent")]
+            state["timeline"][path.stem] = {
+                "sig": sig,
+                "test": data.get("test"),
+                "started_at": data.get("started_at"),
+                "duration_s": data.get("duration_s"),
+                "totals_s": data.get("totals_s") or {},
+                "slowest": sorted(steps, key=lambda s: s[1], reverse=True)[:3],
+            }
+            stats["timeline_new"] += 1
+
+    def _evidence(self) -> List[dict]:
+        """Entradas de screenshots (índice incremental) e gravações de etapa."""
+        entries = []
+        if self.screens.is_dir():
+            ScreenshotStore(self.screens).update()
+            try:
+                entries = json.loads((self.screens / INDEX_NAME).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                entries = []
+            for path in self.screens.rglob("*_recording_*.apng"):
+                m = _RECORDING_RE.match(path.stem)
+                if m:
+                    entries.append({
+                        "file": path.relative_to(self.screens).as_posix(),
+                        "section": "recording", "test": m.group("test"), "step": None,
+                        "label": "gravação", "ts": m.group("ts"), "run": m.group("ts"),
+                    })
+        return [e for e in entries if e.get("valid", True) and e.get("test")]
+
+    def _thumbnails(self, entries: List[dict], state: dict, stats: Dict[str, int]) -> None:
+        jobs = []
+        live = set()
+        for e in entries:
+            src = self.screens / e["file"]
+            live.add(e["file"])
+            try:
+                sig = self._signature(src)
+            except OSError:
+                continue
+            known = state["thumbs"].get(e["file"])
+            if known and known.get("sig") == sig and (self.reports / known["thumb"]).is_file():
+                stats["thumbs_reused"] += 1
+                continue
+            digest = hashlib.sha1(e["file"].encode("utf-8")).hexdigest()
+            dst = self.thumbs_dir / digest[:2] / f"{digest}.jpg"
+            state["thumbs"][e["file"]] = {"sig": sig, "thumb": self._rel(dst), "size": None}
+            jobs.append((str(src), str(dst), self.thumb_width))
+        if jobs:
+            by_src = {str(self.screens / f): f for f in live}
+            # Poucas imagens: sem custo de subir processos
+            if len(jobs) < 8 or self.workers == 1:
+                results = map(make_thumbnail, jobs)
+                self._collect_thumbs(results, by_src, state, stats)
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    self._collect_thumbs(pool.map(make_thumbnail, jobs, chunksize=8), by_src, state, stats)
+        for f in [f for f in state["thumbs"] if f not in live]:
+            thumb = self.reports / state["thumbs"].pop(f)["thumb"]
+            try:
+                thumb.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _collect_thumbs(results, by_src, state, stats) -> None:
+        for src, size, error in results:
+            f = by_src.get(src)
+            if f is None:
+                continue
+            if error:
+                state["thumbs"].pop(f, None)
+                stats["thumb_errors"] += 1
+            else:
+                state["thumbs"][f]["size"] = size
+                stats["thumbs_new"] += 1
+
+    # --- HTML ---
+    def _shot(self, e: dict, state: dict, prefix: str = "") -> str:
+        thumb = state["thumbs"].get(e["file"])
+        full = html.escape(prefix + self._rel(self.screens / e["file"]))
+        if e["section"] == "step":
+            cap = f"Step {e['step']:02d} • {e.get('label') or ''}" if e.get("step") is not None else e.get("label") or ""
+        else:
+            cap = {"end": "Final", "fail": "Falha", "recording": "Gravação das etapas"}.get(e["section"], e["section"])
+        src = html.escape(prefix + thumb["thumb"]) if thumb else full
+        return (
+            f'<div class="shot"><a href="{full}" target="_blank"><img src="{src}" loading="lazy" decoding="async" '
+            f'alt="{html.escape(cap)}"/></a><div class="cap">{html.escape(cap)}</div></div>'
+        )
+
+    def _gallery(self, items: List[dict], state: dict, prefix: str = "") -> str:
+        """Miniaturas (lazy) com link para a imagem original; `prefix` ajusta caminhos de subpáginas."""
+        items = sorted(items, key=lambda e: (_SECTION_RANK.get(e["section"], 3), e.get("step") or 0, e.get("ts") or ""))
+        return '<div class="gallery">' + "".join(self._shot(e, state, prefix) for e in items) + "</div>"
+
+    @staticmethod
+    def _page(title: str, body: str, subpage: bool = False) -> str:
+        back = '<p><a href="../summary.html">&larr; Resumo</a></p>' if subpage else ""
+        return (
+            '<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8" />\n'
+            '<meta name="viewport" content="width=device-width, initial-scale=1" />\n'
+            f"<title>{html.escape(title)}</title>\n<style>{_CSS}</style>\n</head>\n<body>\n"
+            f'<div class="container">{back}{body}'
+            f'<footer>Gerado por scripts/build_report.py em {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}.</footer>'
+            "</div>\n</body>\n</html>\n"
+        )
+
+    def _cases_table(self, run: dict, state: dict) -> str:
+        timeline = {t.get("test"): t for t in state["timeline"].values()}
+        rows = []
+        for c in run["cases"]:
+            nodeid = c["classname"].replace(".", "/") + ".py::" + c["name"]
+            t = timeline.get(nodeid)
+            split = "-"
+            if t:
+                tot = t.get("totals_s") or {}
+                slow = ", ".join(f"{n} {d:.2f}s" for n, d in t.get("slowest") or [])
+                split = (
+                    f"commands {tot.get('command', 0):.1f}s • waits {tot.get('wait', 0):.1f}s • "
+                    f"sleep {tot.get('sleep', 0):.1f}s<br/><small>{html.escape(slow)}</small>"
+                )
+            message = f"<br/><small>{html.escape(c['message'])}</small>" if c["message"] else ""
+            rows.append(
+                f"<tr><td>{html.escape(c['classname'])}</td><td>{html.escape(c['name'])}{message}</td>"
+                f'<td class="status {c["status"]}">{c["status"]}</td><td>{c["time"]:.1f}s</td><td>{split}</td></tr>'
+            )
+        return (
+            "<table><thead><tr><th>Classe</th><th>Teste</th><th>Status</th><th>Duração</th>"
+            "<th>Tempo (linha do tempo)</th></tr></thead><tbody>" + "".join(rows) + "</tbody></table>"
+        )
+
+    @staticmethod
+    def _runs_for(run: dict, groups: Dict[Tuple[str, str], List[dict]]) -> List[Tuple[str, str]]:
+        # Evidências cuja primeira imagem cai dentro da janela da execução JUnit
+        start = _local_naive(run["timestamp"])
+        if start is None:
+            return []
+        end = start + timedelta(seconds=run["time"] + 60)
+        start -= timedelta(seconds=5)
+        return [key for key in groups if (_ts(key[1]) or datetime.min) >= start and (_ts(key[1]) or datetime.min) <= end]
+
+    def _write(self, path: Path, content: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def build(self) -> Dict[str, object]:
+        t0 = time.perf_counter()
+        stats = {k: 0 for k in ("runs_new", "timeline_new", "thumbs_new", "thumbs_reused", "thumb_errors", "pages_written")}
+        state = self._load_state()
+        self._ingest_junit(state, stats)
+        self._ingest_timeline(state, stats)
+        entries = self._evidence()
+        self._thumbnails(entries, state, stats)
+
+        groups: Dict[Tuple[str, str], List[dict]] = {}
+        for e in entries:
+            groups.setdefault((e["test"], e.get("run") or e.get("ts") or ""), []).append(e)
+
+        # Páginas por execução de evidências: reescritas só se o conteúdo mudou
+        for key, items in groups.items():
+            name = _evidence_page(key)
+            sig = [len(items), max(str(e.get("ts") or "") for e in items)]
+            if state["pages"].get(name) == sig and (self.reports / name).is_file():
+                continue
+            body = f"<h1>{html.escape(key[0])}</h1><p>Execução {html.escape(key[1])}</p>" + self._gallery(items, state, "../")
+            self._write(self.reports / name, self._page(key[0], body, subpage=True))
+            state["pages"][name] = sig
+            stats["pages_written"] += 1
+
+        # Páginas por execução JUnit: escritas uma vez
+        for run in state["runs"]:
+            name = f"runs/{_slug(run['id'])}.html"
+            if name in state["pages"] and (self.reports / name).is_file():
+                continue
+            galleries = "".join(
+                f"<h3>{html.escape(k[0])} • {html.escape(k[1])}</h3>" + self._gallery(groups[k], state, "../")
+                for k in self._runs_for(run, groups)
+            )
+            body = (
+                f"<h1>Execução {html.escape(run['timestamp'])}</h1>"
+                f"<p>{html.escape(run['hostname'])} • {run['tests']} testes • {run['failures']} falhas • {run['time']:.1f}s</p>"
+                f'<section class="panel">{self._cases_table(run, state)}</section>'
+                + (f'<section class="panel"><h2>Evidências</h2>{galleries}</section>' if galleries else "")
+            )
+            self._write(self.reports / name, self._page(f"Execução {run['timestamp']}", body, subpage=True))
+            state["pages"][name] = [len(run["cases"])]
+            stats["pages_written"] += 1
+
+        self._write(self.reports / "summary.html", self._summary(state, groups))
+        self._save_state(state)
+        stats["runs"] = len(state["runs"])
+        stats["images"] = len(entries)
+        stats["elapsed_s"] = time.perf_counter() - t0
+        return stats
+
+    def _summary(self, state: dict, groups: Dict[Tuple[str, str], List[dict]]) -> str:
+        runs = state["runs"]
+        latest = runs[-1] if runs else None
+        if latest:
+            passed = sum(1 for c in latest["cases"] if c["status"] == "passed")
+            rate = round(100 * passed / len(latest["cases"])) if latest["cases"] else 0
+            badge = ("fail", "FALHAS") if latest["failures"] else (("ok", "OK") if passed else ("skip", "SEM TESTES"))
+            kpis = [("Pass Rate", f"{rate}%"), ("Testes", latest["tests"]), ("Falhas", latest["failures"]), ("Duração", f"{latest['time']:.1f}s")]
+        else:
+            badge, kpis = ("skip", "SEM EXECUÇÕES"), [("Pass Rate", "—"), ("Testes", "—"), ("Falhas", "—"), ("Duração", "—")]
+        body = [
+            f'<div class="title"><h1>Resumo dos Testes E2E</h1><span class="badge {badge[0]}">{badge[1]}</span></div>',
+            '<section class="panel"><h2>Sumário Executivo</h2><div class="kpis">',
+            "".join(f'<div class="card"><h3>{k}</h3><div class="value">{html.escape(str(v))}</div></div>' for k, v in kpis),
+            '</div><div class="actions">'
+            '<a class="btn" href="./pytest.html" target="_blank" aria-label="Abrir relatório detalhado (pytest.html)">Abrir relatório detalhado (pytest.html)</a>'
+            '<a class="btn" href="./junit.xml" target="_blank">Baixar JUnit XML</a>'
+            '<a class="btn" href="./coverage.xml" target="_blank">Cobertura (se disponível)</a></div></section>',
+        ]
+        if latest:
+            keys = self._runs_for(latest, groups)
+            if not keys:
+                # Sem correspondência pelo horário: última execução de cada teste
+                last: Dict[str, Tuple[str, str]] = {}
+                for key in sorted(groups, key=lambda k: k[1]):
+                    last[key[0]] = key
+                keys = list(last.values())
+            galleries = "".join(
+                f"<h3>{html.escape(k[0])} • {html.escape(k[1])}</h3>" + self._gallery(groups[k], state) for k in keys
+            )
+            body.append(f'<section class="panel"><h2>Resumo dos Casos</h2>{self._cases_table(latest, state)}</section>')
+            if galleries:
+                body.append(f'<section class="panel"><h2>Screenshots (última execução)</h2>{galleries}</section>')
+        history = "".join(
+            f'<tr><td><a href="runs/{_slug(r["id"])}.html">{html.escape(r["timestamp"])}</a></td>'
+            f"<td>{html.escape(r['hostname'])}</td><td>{r['tests']}</td>"
+            f'<td class="status {"failed" if r["failures"] else "passed"}">{r["failures"]}</td><td>{r["time"]:.1f}s</td></tr>'
+            for r in reversed(runs[-self.recent_runs:])
+        )
+        if history:
+            body.append(
+                f'<section class="panel"><h2>Histórico (últimas {min(len(runs), self.recent_runs)} de {len(runs)})</h2>'
+                "<table><thead><tr><th>Execução</th><th>Host</th><th>Testes</th><th>Falhas</th><th>Duração</th></tr></thead>"
+                f"<tbody>{history}</tbody></table></section>"
+            )
+        recent = sorted(groups, key=lambda k: k[1], reverse=True)[: self.recent_evidence]
+        if recent:
+            links = "".join(
+                f'<li><a href="{_evidence_page(k)}">{html.escape(k[1])} • {html.escape(k[0])}</a> '
+                f"({len(groups[k])} imagens)</li>"
+                for k in recent
+            )
+            body.append(f'<section class="panel"><h2>Evidências recentes</h2><ul>{links}</ul></section>')
+        return self._page("Resumo dos Testes E2E", "".join(body))
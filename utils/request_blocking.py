@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Comentário (PT-BR): Padrões no formato do CDP `Network.setBlockedURLs`
+# (`*` casa qualquer sequência). As categorias de recurso (fontes/imagens) são
+# aproximadas por extensão/host, pois o comando bloqueia por URL.
+BLOCK_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "ads": (
+        "*googlesyndication.com*",
+        "*doubleclick.net*",
+        "*googletagservices.com*",
+        "*adservice.google.*",
+        "*google_ads*",
+        "*adplus*",
+        "*ad.plus*",
+        "*amazon-adsystem.com*",
+        "*adnxs.com*",
+        "*pubmatic.com*",
+        "*rubiconproject.com*",
+        "*criteo.com*",
+        "*criteo.net*",
+        "*taboola.com*",
+        "*outbrain.com*",
+        "*moatads.com*",
+        "*casalemedia.com*",
+        "*openx.net*",
+        "*3lift.com*",
+        "*smartadserver.com*",
+    ),
+    "analytics": (
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*analytics.google.com*",
+        "*hotjar.com*",
+        "*clarity.ms*",
+        "*connect.facebook.net*",
+        "*scorecardresearch.com*",
+        "*quantserve.com*",
+        "*segment.io*",
+        "*newrelic.com*",
+        "*nr-data.net*",
+    ),
+    "fonts": (
+        "*fonts.googleapis.com*",
+        "*fonts.gstatic.com*",
+        "*use.typekit.net*",
+        "*.woff",
+        "*.woff2",
+        "*.ttf",
+        "*.otf",
+        "*.eot",
+    ),
+    "images": (
+        "*.png",
+        "*.jpg",
+        "*.jpeg",
+        "*.gif",
+        "*.webp",
+        "*.avif",
+        "*.svg",
+        "*.ico",
+    ),
+}
+
+
+def parse_blocklist(spec: Optional[str]) -> List[str]:
+    """
+    Converte a especificação de bloqueio em uma lista de padrões de URL.
+
+    Aceita, separados por vírgula: nomes de `BLOCK_CATEGORIES` (`ads`,
+    `analytics`, `fonts`, `images`, ou `all`), padrões de URL (`*example.com*`)
+    e `@arquivo` com um padrão por linha (linhas vazias e `#` ignorados).
+    Vazio/None desativa o bloqueio.
+    """
+    patterns: List[str] = []
+    for part in str(spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        key = part.lower()
+        if key == "all":
+            for items in BLOCK_CATEGORIES.values():
+                patterns.extend(items)
+        elif key in BLOCK_CATEGORIES:
+            patterns.extend(BLOCK_CATEGORIES[key])
+        elif part.startswith("@"):
+            path = Path(part[1:])
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except OSError as e:
+                raise ValueError(f"Lista de bloqueio ilegível: {path} ({e})")
+            patterns.extend(ln.strip() for ln in lines if ln.strip() and not ln.strip().startswith("#"))
+        elif any(c in part for c in "*./:"):
+            patterns.append(part)
+        else:
+            raise ValueError(
+                f"Categoria de bloqueio inválida: {part!r} (use {', '.join(BLOCK_CATEGORIES)}, all ou um padrão de URL)"
+            )
+    # Mantém a ordem e remove duplicados
+    return list(dict.fromkeys(patterns))
+
+
+def apply_request_blocking(driver, patterns: List[str]) -> bool:
+    """
+    Ativa o bloqueio de requisições na sessão via CDP (`Network.enable` +
+    `Network.setBlockedURLs`). Deve ser chamado antes da primeira navegação;
+    o bloqueio vale para todas as navegações seguintes da aba.
+
+    Retorna False se o driver não suporta CDP (o teste segue sem bloqueio).
+    """
+    if not patterns:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except Exception:
+        return False
+    driver._blocked_url_patterns = list(patterns)
+    return True
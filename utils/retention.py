@@ -0,0 +1,326 @@
+import json
+import os
+import re
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.screenshot_store import (
+    IMAGE_SUFFIXES,
+    INDEX_NAME,
+    STORE_DIRNAME,
+    ScreenshotStore,
+    _assign_runs,
+    parse_name,
+)
+
+
+ARCHIVE_DIRNAME = "archive"
+RECORDING_SUFFIX = ".apng"
+PROTECTED_SECTIONS = ("fail", "end")
+
+# <nodeid sanitizado>_recording_<ts> (ver `utils.step_recorder.StepRecorder`)
+_RECORDING_RE = re.compile(r"^(?P<test>.+?)_recording_(?P<ts>\d{8}-\d{6})$")
+
+# Ordem de remoção: etapas de execuções aprovadas, depois de execuções sem
+# desfecho conhecido (interrompidas, nomes fora do padrão) e por último as de
+# execuções com falha.
+_TIER = {"passed": 0, "unknown": 1, "failed": 2}
+
+
+def _last_used(st: os.stat_result) -> float:
+    # atime pode estar desativado (noatime/relatime); mtime serve de piso
+    return max(st.st_atime, st.st_mtime)
+
+
+class RetentionEngine:
+    """
+    Mantém `screenshots/` dentro de um orçamento de bytes e de arquivos.
+
+    Comentário (PT-BR): Capturas de falha (`_fail_`) e finais (`_end_`) nunca
+    são removidas. Quando o orçamento é excedido, saem primeiro as capturas de
+    etapa (`_step_`) e as gravações APNG das execuções aprovadas, da execução
+    usada há mais tempo para a mais recente (LRU por execução: maior atime/mtime
+    entre os arquivos dela). Os arquivos removidos são compactados em
+    `screenshots/archive/retention_<ts>.zip`, com um `index.json` dentro do zip
+    e um catálogo `archive/index.json` que aponta em qual zip está cada imagem.
+    O diretório `archive/` tem orçamento próprio: os zips mais antigos saem
+    primeiro. Blobs de `store/` são classificados pelas entradas de `index.json`.
+    """
+
+    def __init__(
+        self,
+        screenshots_dir,
+        max_bytes: Optional[int] = None,
+        max_files: Optional[int] = None,
+        archive: bool = True,
+        archive_max_bytes: Optional[int] = None,
+    ):
+        self.root = Path(screenshots_dir)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.archive = archive
+        self.archive_max_bytes = archive_max_bytes if archive_max_bytes is not None else max_bytes
+        self.archive_dir = self.root / ARCHIVE_DIRNAME
+        self.index_path = self.root / INDEX_NAME
+
+    # ------------------------------------------------------------------ coleta
+
+    def _index_entries(self) -> List[dict]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        return [e for e in data if isinstance(e, dict)] if isinstance(data, list) else []
+
+    def _scan(self) -> List[dict]:
+        """Uma unidade por arquivo (ou APNG + sidecar) com teste, seção, execução e uso."""
+        entries = self._index_entries()
+        by_file: Dict[str, List[dict]] = {}
+        for e in entries:
+            if e.get("file"):
+                by_file.setdefault(e["file"], []).append(e)
+        units: List[dict] = []
+        for p in self.root.rglob("*"):
+            suffix = p.suffix.lower()
+            if suffix not in IMAGE_SUFFIXES + (RECORDING_SUFFIX,) or not p.is_file():
+                continue
+            if self.archive_dir in p.parents:
+                continue
+            rel = p.relative_to(self.root).as_posix()
+            st = p.stat()
+            files = [p]
+            if suffix == RECORDING_SUFFIX:
+                m = _RECORDING_RE.match(p.stem)
+                info = {"test": m.group("test") if m else None, "section": "recording", "step": None, "ts": m.group("ts") if m else None}
+                sidecar = p.with_suffix(".json")
+                if sidecar.is_file():
+                    files.append(sidecar)
+            elif self.root / STORE_DIRNAME in p.parents:
+                refs = by_file.get(rel) or []
+                # Blob deduplicado: protegido se qualquer referência for falha/final;
+                # o desfecho considera todas as execuções que o referenciam
+                sections = {e.get("section") for e in refs}
+                ref = next((e for e in refs if e.get("section") in PROTECTED_SECTIONS), refs[0] if refs else {})
+                info = {
+                    "test": ref.get("test"),
+                    "section": next((s for s in PROTECTED_SECTIONS if s in sections), ref.get("section") or "unknown"),
+                    "step": ref.get("step"),
+                    "ts": ref.get("ts"),
+                    "run": ref.get("run"),
+                    "refs": [(e.get("test"), e.get("run")) for e in refs if e.get("test")],
+                }
+            else:
+                info = parse_name(p.stem)
+            stats = [f.stat() for f in files[1:]]
+            units.append(
+                dict(
+                    info,
+                    rel=rel,
+                    files=files,
+                    bytes=st.st_size + sum(s.st_size for s in stats),
+                    used=max([_last_used(st)] + [_last_used(s) for s in stats]),
+                )
+            )
+        self._assign(units, entries)
+        return units
+
+    @staticmethod
+    def _assign(units: List[dict], entries: Optional[List[dict]] = None) -> None:
+        # Comentário (PT-BR): Mesma regra de execução do índice (`_assign_runs`).
+        # O desfecho de cada execução vem das entradas do `index.json` (que
+        # continuam lá mesmo quando o `_end_` foi deduplicado para o blob de
+        # outra execução) e das capturas soltas no disco. A gravação começa
+        # antes do `step_00`; pertence à primeira execução do mesmo teste
+        # iniciada no mesmo instante ou depois.
+        shots = [u for u in units if u["section"] != "recording" and u.get("run") is None]
+        _assign_runs(shots)
+        outcome: Dict[tuple, str] = {}
+        for u in list(entries or []) + units:
+            if u.get("test") and u.get("run") and u.get("section") in PROTECTED_SECTIONS:
+                key = (u["test"], u["run"])
+                if u["section"] == "fail" or outcome.get(key) != "failed":
+                    outcome[key] = "failed" if u["section"] == "fail" else "passed"
+        runs_by_test: Dict[str, List[str]] = {}
+        for test, run in outcome:
+            runs_by_test.setdefault(test, []).append(run)
+        for u in units:
+            if u["section"] == "recording" and u.get("test") and u.get("ts"):
+                later = sorted(r for r in runs_by_test.get(u["test"], []) if r >= u["ts"])
+                u["run"] = later[0] if later else None
+            # Blob compartilhado: fica no nível mais protegido entre as execuções
+            keys = u.get("refs") or [(u.get("test"), u.get("run"))]
+            u["outcome"] = max((outcome.get(k, "unknown") for k in keys), key=_TIER.__getitem__)
+
+    # --------------------------------------------------------------- políticas
+
+    def plan(self, units: Optional[List[dict]] = None) -> Dict[str, object]:
+        """Escolhe as unidades a remover sem tocar no disco."""
+        units = self._scan() if units is None else units
+        total_bytes = sum(u["bytes"] for u in units)
+        total_files = sum(len(u["files"]) for u in units)
+        candidates = [u for u in units if u["section"] not in PROTECTED_SECTIONS]
+        run_used: Dict[tuple, float] = {}
+        for u in candidates:
+            key = (u.get("test"), u.get("run"))
+            run_used[key] = max(run_used.get(key, 0.0), u["used"])
+        candidates.sort(
+            key=lambda u: (
+                _TIER[u["outcome"]],
+                run_used[(u.get("test"), u.get("run"))],
+                u.get("run") or "",
+                u.get("step") if u.get("step") is not None else -1,
+                u["rel"],
+            )
+        )
+        evict: List[dict] = []
+        bytes_left, files_left = total_bytes, total_files
+        for u in candidates:
+            over_bytes = self.max_bytes is not None and bytes_left > self.max_bytes
+            over_files = self.max_files is not None and files_left > self.max_files
+            if not (over_bytes or over_files):
+                break
+            evict.append(u)
+            bytes_left -= u["bytes"]
+            files_left -= len(u["files"])
+        return {
+            "evict": evict,
+            "files_before": total_files,
+            "bytes_before": total_bytes,
+            "files_after": files_left,
+            "bytes_after": bytes_left,
+            "protected": sum(1 for u in units if u["section"] in PROTECTED_SECTIONS),
+            # Sobra apenas o que é protegido e ainda assim excede o orçamento
+            "over_budget": (self.max_bytes is not None and bytes_left > self.max_bytes)
+            or (self.max_files is not None and files_left > self.max_files),
+        }
+
+    # ---------------------------------------------------------------- execução
+
+    def enforce(self, dry_run: bool = False) -> Dict[str, object]:
+        """Aplica o orçamento; retorna contadores para o resumo do terminal/CLI."""
+        t0 = time.perf_counter()
+        plan = self.plan()
+        evict = plan["evict"]
+        stats = {
+            k: plan[k] for k in ("files_before", "bytes_before", "files_after", "bytes_after", "protected", "over_budget")
+        }
+        stats.update(
+            evicted=len(evict),
+            evicted_bytes=sum(u["bytes"] for u in evict),
+            by_outcome={o: sum(1 for u in evict if u["outcome"] == o) for o in _TIER},
+            archive=None,
+            archive_bytes=0,
+            archives_dropped=0,
+            errors=0,
+            dry_run=dry_run,
+        )
+        if evict and not dry_run:
+            if self.archive:
+                stats["archive"], stats["archive_bytes"] = self._archive(evict)
+            for u in evict:
+                for f in u["files"]:
+                    try:
+                        f.unlink()
+                    except FileNotFoundError:
+                        pass
+                    except OSError:
+                        stats["errors"] += 1
+            self._prune_empty_dirs(evict)
+            if self.index_path.is_file():
+                # Remove do índice as entradas cujos arquivos saíram
+                ScreenshotStore(self.root).update()
+        if self.archive and not dry_run:
+            stats["archives_dropped"] = self._trim_archives()
+        stats["elapsed_s"] = time.perf_counter() - t0
+        return stats
+
+    def _archive(self, evict: List[dict]):
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        name = f"retention_{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip"
+        path = self.archive_dir / name
+        n = 1
+        while path.exists():
+            path = self.archive_dir / f"{Path(name).stem}_{n}.zip"
+            n += 1
+        members = []
+        tmp = path.with_name(path.name + ".part")
+        # strict_timestamps=False: mtime anterior a 1980 (relógio/cópia) não aborta o arquivamento
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6, strict_timestamps=False) as zf:
+            for u in evict:
+                for f in u["files"]:
+                    arc = f.relative_to(self.root).as_posix()
+                    zf.write(f, arc)
+                    members.append(
+                        {
+                            "file": arc,
+                            "test": u.get("test"),
+                            "section": u["section"],
+                            "step": u.get("step"),
+                            "run": u.get("run"),
+                            "outcome": u["outcome"],
+                            "bytes": f.stat().st_size,
+                        }
+                    )
+            zf.writestr(INDEX_NAME, json.dumps(members, ensure_ascii=False, indent=1))
+        os.replace(tmp, path)
+        self._update_catalog(path.name, members)
+        return str(path), path.stat().st_size
+
+    def _load_catalog(self) -> List[dict]:
+        try:
+            data = json.loads((self.archive_dir / INDEX_NAME).read_text(encoding="utf-8"))
+            return data if isinstance(data, list) else []
+        except (OSError, ValueError):
+            return []
+
+    def _save_catalog(self, catalog: List[dict]) -> None:
+        path = self.archive_dir / INDEX_NAME
+        tmp = path.with_name(path.name + ".part")
+        tmp.write_text(json.dumps(catalog, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _update_catalog(self, archive_name: str, members: List[dict]) -> None:
+        catalog = self._load_catalog()
+        catalog.append(
+            {
+                "archive": archive_name,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "files": len(members),
+                "tests": sorted({m["test"] for m in members if m["test"]}),
+                "members": [m["file"] for m in members],
+            }
+        )
+        self._save_catalog(catalog)
+
+    def _trim_archives(self) -> int:
+        if self.archive_max_bytes is None or not self.archive_dir.is_dir():
+            return 0
+        zips = sorted(self.archive_dir.glob("retention_*.zip"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in zips)
+        dropped = []
+        # Mantém sempre o zip mais recente, mesmo acima do orçamento
+        for p in zips[:-1]:
+            if total <= self.archive_max_bytes:
+                break
+            total -= p.stat().st_size
+            try:
+                p.unlink()
+                dropped.append(p.name)
+            except OSError:
+                pass
+        if dropped:
+            self._save_catalog([c for c in self._load_catalog() if c.get("archive") not in dropped])
+        return len(dropped)
+
+    def _prune_empty_dirs(self, evict: List[dict]) -> None:
+        # Subpastas de worker (gw0, ...) e prefixos de store/ que ficaram vazios
+        for d in sorted({f.parent for u in evict for f in u["files"]}, key=lambda p: len(p.parts), reverse=True):
+            while d != self.root and self.root in d.parents:
+                try:
+                    d.rmdir()
+                except OSError:
+                    break
+                d = d.parent
@@ -0,0 +1,629 @@
+import hashlib
+import json
+import os
+import platform
+import re
+import sqlite3
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils.screenshot_store import IMAGE_SUFFIXES, INDEX_NAME, STORE_DIRNAME, _assign_runs, parse_name
+from utils.stats import percentile, summarize
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY, kind TEXT, size INTEGER, mtime REAL, sha256 TEXT, ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS platforms (
+    id INTEGER PRIMARY KEY, os TEXT NOT NULL, ci INTEGER, headless INTEGER, python TEXT,
+    UNIQUE (os, ci, headless, python)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, source TEXT NOT NULL,
+    started_at TEXT, ended_at TEXT, duration_ms REAL, outcome TEXT, hostname TEXT,
+    platform_id INTEGER REFERENCES platforms(id), tests INTEGER, failures INTEGER, detail TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY, run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL, outcome TEXT, duration_ms REAL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY, run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT, name TEXT NOT NULL, seq INTEGER, parent TEXT, start_ms REAL, duration_ms REAL, source TEXT
+);
+CREATE TABLE IF NOT EXISTS failures (
+    id INTEGER PRIMARY KEY, run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT, kind TEXT, category TEXT, message TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+CREATE INDEX IF NOT EXISTS steps_name ON steps (name, run_id);
+CREATE INDEX IF NOT EXISTS tests_nodeid ON tests (nodeid, run_id);
+"""
+
+# Origem das durações de etapa, da mais precisa para a menos precisa. Uma
+# consulta usa, por (execução, teste), apenas a melhor origem disponível.
+STEP_SOURCES = ("timeline", "recording", "screenshot")
+
+# Rótulos de captura que carregam o valor escolhido (`select_state_NCR`)
+_VALUE_LABELS = re.compile(r"^(select_state|select_city)_.+$")
+
+# Capturas antigas (sem `@<método>` no nome / `step` no sidecar): rótulo -> etapa `@_step`
+_LABEL_STEPS = {
+    "Nome_Completo_(Primeiro_Nome)": "fill_name",
+    "Nome_Completo_(Sobrenome)": "fill_name",
+    "E-mail": "fill_email",
+    "Gênero": "select_gender",
+    "Telefone": "fill_mobile",
+    "Data_de_Nascimento": "set_birth_date",
+    "Matéria": "add_subject",
+    "Hobby": "check_hobby",
+    "Upload_de_Arquivo": "upload_picture",
+    "Endereço": "fill_address",
+    "Estado": "select_state",
+    "Cidade": "select_city",
+    "submission_table": "get_submission_table",
+}
+
+# Quadro da gravação: "<NN>_<rótulo>"
+_FRAME_LABEL_RE = re.compile(r"^\d+_")
+
+# Artefatos do CI: reports_all/junit-<OS>-py<versão>/junit.xml
+_ARTIFACT_RE = re.compile(r"^junit-(?P<os>Linux|Windows|macOS)-py(?P<python>[\d.]+)$")
+
+# [dd/mm/aaaa HH:MM:SS,cc] "mensagem" (`call :log` de scripts/gh_actions_run.bat)
+_GH_LINE_RE = re.compile(r"^\[(?P<d>\d{2})/(?P<m>\d{2})/(?P<y>\d{4}) +(?P<t>\d{1,2}:\d{2}:\d{2})[,.]\d+\] *(?P<msg>.*)$")
+_GH_OUTCOMES = (
+    ("Workflow completed successfully", "success"),
+    ("Workflow completed with failure", "failure"),
+    ("Timeout waiting for completion", "timeout"),
+    ("could not create workflow dispatch", "dispatch_failed"),
+    ("Failed to trigger workflow run", "dispatch_failed"),
+    ("Not authenticated", "auth_failed"),
+)
+_GH_ERROR_RE = re.compile(r"(?i)\b(error|failed|could not|unable|not found|timeout|missing|HTTP \d{3})\b")
+
+# Janela para associar linhas do tempo/capturas a uma execução do JUnit
+_MATCH_SLACK = timedelta(seconds=30)
+
+
+def classify_failure(text: str) -> str:
+    """Categoria da falha pelo tipo/mensagem: timeout, stale, intercepted, assertion, webdriver ou other."""
+    t = text or ""
+    if "TimeoutException" in t or "timed out" in t.lower():
+        return "timeout"
+    if "StaleElementReference" in t:
+        return "stale"
+    if "ElementClickIntercepted" in t or "not clickable" in t:
+        return "intercepted"
+    if "AssertionError" in t or t.lstrip().startswith("assert "):
+        return "assertion"
+    if "WebDriverException" in t or "selenium" in t:
+        return "webdriver"
+    return "other"
+
+
+def current_platform(headless: Optional[bool] = None) -> Dict[str, object]:
+    """Plataforma do processo atual (usada nas propriedades do JUnit e na ingestão ao final do pytest)."""
+    name = {"Darwin": "macOS"}.get(platform.system(), platform.system() or "unknown")
+    ci = os.getenv("CI", "").lower() in ("1", "true", "yes") or bool(os.getenv("GITHUB_ACTIONS"))
+    return {
+        "os": name,
+        "ci": int(ci),
+        "headless": None if headless is None else int(bool(headless)),
+        "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+    }
+
+
+def _iso(dt: Optional[datetime]) -> Optional[str]:
+    return dt.isoformat(timespec="seconds") if dt else None
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    # Horário local: JUnit traz o offset, linhas do tempo e capturas não
+    return dt.replace(tzinfo=None)
+
+
+def _parse_ts(ts: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(ts, "%Y%m%d-%H%M%S") if ts else None
+    except ValueError:
+        return None
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class RunHistory:
+    """
+    Histórico de execuções em SQLite (`reports/history.sqlite`).
+
+    Comentário (PT-BR): A ingestão é incremental: cada arquivo de origem
+    (JUnit XML, log `logs/gh_actions_*.log`, JSON de linha do tempo, sidecar
+    de gravação) é registrado em `sources` com tamanho/mtime/sha256 e só é
+    relido quando muda; conteúdo idêntico em outro caminho (ex.: artefato
+    baixado do CI) não é ingerido de novo. As capturas de etapa entram por
+    execução (nome dos arquivos + `index.json`), apenas execuções novas.
+    Durações de etapa vêm da linha do tempo (`--instrument`, em ms), do sidecar
+    da gravação APNG ou, na falta delas, da diferença entre os horários das
+    capturas (resolução de 1 s). Linhas do tempo e capturas são associadas à
+    execução do JUnit cujo intervalo as contém; sem JUnit, viram uma execução
+    própria, reassociada quando o JUnit correspondente for ingerido.
+    """
+
+    def __init__(self, db_path):
+        self.path = Path(db_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ----------------------------------------------------------------- fontes
+
+    def _changed(self, path: Path, kind: str) -> Optional[dict]:
+        """Metadados do arquivo se ele for novo/alterado; None se já ingerido."""
+        st = path.stat()
+        row = self.db.execute("SELECT size, mtime, sha256 FROM sources WHERE path = ?", (str(path.resolve()),)).fetchone()
+        if row is not None and row["size"] == st.st_size and row["mtime"] == st.st_mtime:
+            return None
+        sha = _sha256(path)
+        seen = self.db.execute("SELECT 1 FROM sources WHERE kind = ? AND sha256 = ?", (kind, sha)).fetchone()
+        meta = {"path": str(path.resolve()), "kind": kind, "size": st.st_size, "mtime": st.st_mtime, "sha256": sha}
+        if seen is not None:
+            self._mark(meta)
+            return None
+        return meta
+
+    def _mark(self, meta: dict) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO sources (path, kind, size, mtime, sha256, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (meta["path"], meta["kind"], meta["size"], meta["mtime"], meta["sha256"], _iso(datetime.now())),
+        )
+
+    def _platform_id(self, plat: Optional[dict]) -> Optional[int]:
+        if not plat or not plat.get("os"):
+            return None
+        key = (plat["os"], plat.get("ci"), plat.get("headless"), plat.get("python"))
+        row = self.db.execute(
+            "SELECT id FROM platforms WHERE os = ? AND ci IS ? AND headless IS ? AND python IS ?", key
+        ).fetchone()
+        if row is not None:
+            return row["id"]
+        return self.db.execute("INSERT INTO platforms (os, ci, headless, python) VALUES (?, ?, ?, ?)", key).lastrowid
+
+    def _insert_run(self, key: str, source: str, started: Optional[datetime], ended: Optional[datetime], **fields) -> int:
+        # Reingestão de uma fonte alterada (ex.: gh_actions_latest.log) substitui a execução
+        self.db.execute("DELETE FROM runs WHERE key = ?", (key,))
+        duration = fields.get("duration_ms")
+        if duration is None and started and ended:
+            duration = (ended - started).total_seconds() * 1000.0
+        return self.db.execute(
+            "INSERT INTO runs (key, source, started_at, ended_at, duration_ms, outcome, hostname, platform_id, tests, failures, detail)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key, source, _iso(started), _iso(ended), duration, fields.get("outcome"), fields.get("hostname"),
+                self._platform_id(fields.get("platform")), fields.get("tests"), fields.get("failures"), fields.get("detail"),
+            ),
+        ).lastrowid
+
+    def _junit_run_at(self, moment: Optional[datetime]) -> Optional[int]:
+        if moment is None:
+            return None
+        row = self.db.execute(
+            "SELECT id FROM runs WHERE source = 'junit' AND started_at <= ? AND ended_at >= ? ORDER BY started_at DESC LIMIT 1",
+            (_iso(moment + _MATCH_SLACK), _iso(moment - _MATCH_SLACK)),
+        ).fetchone()
+        return row["id"] if row else None
+
+    def _steps_run(
+        self, key: str, source: str, started: Optional[datetime], ended: Optional[datetime], plat, test: Optional[str] = None
+    ) -> int:
+        run_id = self._junit_run_at(started)
+        if run_id is not None:
+            return run_id
+        # Comentário (PT-BR): Sem JUnit, a mesma execução do teste vista por outra
+        # origem (linha do tempo, gravação, capturas) compartilha a execução, para
+        # que a consulta escolha a melhor origem por etapa. Reingestão de uma fonte
+        # alterada reaproveita a sua execução (as etapas das outras origens ficam).
+        row = self.db.execute("SELECT id FROM runs WHERE key = ?", (key,)).fetchone()
+        if row is None and started is not None and test is not None:
+            row = self.db.execute(
+                "SELECT r.id FROM runs r JOIN steps s ON s.run_id = r.id"
+                " WHERE r.source IN (%s) AND s.test = ? AND r.started_at BETWEEN ? AND ? LIMIT 1"
+                % ",".join("?" * len(STEP_SOURCES)),
+                STEP_SOURCES + (test, _iso(started - _MATCH_SLACK), _iso(started + _MATCH_SLACK)),
+            ).fetchone()
+        if row is not None:
+            return row["id"]
+        return self._insert_run(key, source, started, ended, platform=plat)
+
+    def _adopt_orphans(self, run_id: int, started: datetime, ended: datetime) -> None:
+        # Etapas ingeridas antes do JUnit passam para a execução do JUnit
+        lo, hi = _iso(started - _MATCH_SLACK), _iso(ended + _MATCH_SLACK)
+        orphans = [
+            r["id"]
+            for r in self.db.execute(
+                "SELECT id FROM runs WHERE source IN (%s) AND started_at BETWEEN ? AND ?" % ",".join("?" * len(STEP_SOURCES)),
+                STEP_SOURCES + (lo, hi),
+            )
+        ]
+        for oid in orphans:
+            self.db.execute("UPDATE steps SET run_id = ? WHERE run_id = ?", (run_id, oid))
+            self.db.execute("DELETE FROM runs WHERE id = ?", (oid,))
+
+    # --------------------------------------------------------------- ingestão
+
+    def ingest(
+        self,
+        junit_files: Iterable[Path] = (),
+        logs_dir: Optional[Path] = None,
+        timeline_dir: Optional[Path] = None,
+        screenshots_dir: Optional[Path] = None,
+        platform_override: Optional[dict] = None,
+    ) -> Dict[str, int]:
+        """Ingere as fontes novas/alteradas; retorna contadores por tipo."""
+        stats = {"junit": 0, "gh_logs": 0, "timelines": 0, "recordings": 0, "screenshot_runs": 0, "skipped": 0, "errors": 0}
+        with self.db:
+            for path in junit_files:
+                self._ingest_file(Path(path), "junit", self._ingest_junit, stats, platform_override)
+            if logs_dir is not None and Path(logs_dir).is_dir():
+                for path in sorted(Path(logs_dir).glob("gh_actions_*.log")):
+                    self._ingest_file(path, "gh_logs", self._ingest_gh_log, stats, None)
+            if timeline_dir is not None and Path(timeline_dir).is_dir():
+                for path in sorted(Path(timeline_dir).glob("*.json")):
+                    self._ingest_file(path, "timelines", self._ingest_timeline, stats, platform_override)
+            if screenshots_dir is not None and Path(screenshots_dir).is_dir():
+                for path in sorted(Path(screenshots_dir).rglob("*_recording_*.json")):
+                    self._ingest_file(path, "recordings", self._ingest_recording, stats, platform_override)
+                stats["screenshot_runs"] = self._ingest_screenshots(Path(screenshots_dir), platform_override)
+        return stats
+
+    def _ingest_file(self, path: Path, kind: str, parse, stats: Dict[str, int], plat) -> None:
+        if not path.is_file():
+            return
+        # Savepoint por arquivo: um arquivo corrompido não deixa linhas pela metade
+        self.db.execute("SAVEPOINT source")
+        try:
+            meta = self._changed(path, kind)
+            if meta is None:
+                stats["skipped"] += 1
+            else:
+                parse(path, meta, plat)
+                self._mark(meta)
+                stats[kind] += 1
+        except Exception:
+            self.db.execute("ROLLBACK TO source")
+            stats["errors"] += 1
+        self.db.execute("RELEASE source")
+
+    def _ingest_junit(self, path: Path, meta: dict, plat) -> None:
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for i, suite in enumerate(suites):
+            props = {p.get("name"): p.get("value") for p in suite.iter("property")}
+            suite_plat = self._junit_platform(path, props) or plat
+            started = _parse_iso(suite.get("timestamp"))
+            duration = float(suite.get("time") or 0.0)
+            ended = started + timedelta(seconds=duration) if started else None
+            cases = suite.findall("testcase")
+            failed = 0
+            rows = []
+            for case in cases:
+                nodeid = f"{case.get('classname')}::{case.get('name')}"
+                outcome, problems = "passed", []
+                for kind in ("failure", "error"):
+                    for el in case.findall(kind):
+                        outcome = "failed" if kind == "failure" else "error"
+                        text = " ".join(x for x in (el.get("type"), el.get("message"), el.text) if x)
+                        message = el.get("message") or ((el.text or "").strip().splitlines() or [""])[-1]
+                        problems.append((kind, classify_failure(text), message[:500]))
+                if case.find("skipped") is not None:
+                    outcome = "skipped"
+                failed += outcome in ("failed", "error")
+                rows.append((nodeid, outcome, float(case.get("time") or 0.0) * 1000.0, problems))
+            run_id = self._insert_run(
+                f"junit:{meta['sha256'][:16]}:{i}",
+                "junit",
+                started,
+                ended,
+                duration_ms=duration * 1000.0,
+                outcome="failed" if failed else "passed",
+                hostname=suite.get("hostname"),
+                platform=suite_plat,
+                tests=len(cases),
+                failures=failed,
+                detail=str(path),
+            )
+            for nodeid, outcome, ms, problems in rows:
+                self.db.execute(
+                    "INSERT INTO tests (run_id, nodeid, outcome, duration_ms) VALUES (?, ?, ?, ?)", (run_id, nodeid, outcome, ms)
+                )
+                for kind, category, message in problems:
+                    self.db.execute(
+                        "INSERT INTO failures (run_id, test, kind, category, message) VALUES (?, ?, ?, ?, ?)",
+                        (run_id, nodeid, kind, category, message),
+                    )
+            if started and ended:
+                self._adopt_orphans(run_id, started, ended)
+
+    @staticmethod
+    def _junit_platform(path: Path, props: Dict[str, str]) -> Optional[dict]:
+        # Propriedades gravadas pelo conftest (da suíte ou, com xdist, de cada caso de teste)
+        if props.get("os"):
+            return {
+                "os": props["os"],
+                "ci": int(props["ci"]) if props.get("ci") not in (None, "") else None,
+                "headless": int(props["headless"]) if props.get("headless") not in (None, "") else None,
+                "python": props.get("python") or None,
+            }
+        # Artefato baixado do CI: o nome da pasta traz SO e versão do Python
+        for part in path.resolve().parts[::-1]:
+            m = _ARTIFACT_RE.match(part)
+            if m:
+                return {"os": m.group("os"), "ci": 1, "headless": 1, "python": m.group("python")}
+        return None
+
+    def _ingest_gh_log(self, path: Path, meta: dict, _plat) -> None:
+        times, outcome, detail, problems = [], None, None, []
+        for raw in path.read_text(encoding="utf-8", errors="replace").splitlines():
+            m = _GH_LINE_RE.match(raw.strip())
+            msg = (m.group("msg") if m else raw).strip().strip('"').strip()
+            if m:
+                try:
+                    times.append(datetime.strptime(f"{m.group('d')}/{m.group('m')}/{m.group('y')} {m.group('t')}", "%d/%m/%Y %H:%M:%S"))
+                except ValueError:
+                    pass
+            if not msg:
+                continue
+            for needle, value in _GH_OUTCOMES:
+                if needle in msg:
+                    outcome = value
+            if msg.startswith("Run created:"):
+                detail = msg[len("Run created:"):].strip()
+            if _GH_ERROR_RE.search(msg) and not msg.startswith("Status="):
+                problems.append(msg[:500])
+        started, ended = (min(times), max(times)) if times else (None, None)
+        if outcome is None:
+            outcome = "error" if problems else "unknown"
+        # Logs do disparo local via scripts/gh_actions_run.bat (Windows, fora do CI)
+        run_id = self._insert_run(
+            f"gh:{path.name}",
+            "gh_actions",
+            started,
+            ended,
+            outcome=outcome,
+            platform={"os": "Windows", "ci": 0, "headless": None, "python": None},
+            failures=len(problems),
+            detail=detail or path.name,
+        )
+        for message in problems:
+            self.db.execute(
+                "INSERT INTO failures (run_id, test, kind, category, message) VALUES (?, NULL, 'ci', ?, ?)",
+                (run_id, outcome, message),
+            )
+
+    def _ingest_timeline(self, path: Path, meta: dict, plat) -> None:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        started = _parse_iso(doc.get("started_at"))
+        ended = started + timedelta(seconds=float(doc.get("duration_s") or 0.0)) if started else None
+        test = doc.get("test")
+        run_id = self._steps_run(f"timeline:{test}:{doc.get('started_at')}", "timeline", started, ended, plat, test)
+        self.db.execute("DELETE FROM steps WHERE run_id = ? AND test IS ? AND source = 'timeline'", (run_id, test))
+        for seq, st in enumerate(doc.get("steps") or []):
+            self.db.execute(
+                "INSERT INTO steps (run_id, test, name, seq, parent, start_ms, duration_ms, source) VALUES (?, ?, ?, ?, ?, ?, ?, 'timeline')",
+                (run_id, test, st.get("name"), seq, st.get("parent"), float(st.get("start_s") or 0.0) * 1000.0, float(st.get("duration_s") or 0.0) * 1000.0),
+            )
+
+    def _insert_steps(self, run_id: int, test: str, source: str, marks: List[tuple], start: Optional[float]) -> None:
+        """
+        Grava as etapas a partir das marcas (etapa, ms) feitas ao FIM de cada etapa.
+
+        Comentário (PT-BR): Marcas seguidas da mesma etapa (ex.: `fill_name` captura
+        nome e sobrenome) formam uma etapa só. Cada etapa dura do fim da anterior
+        até a sua última marca; a primeira começa em `start` (início da gravação)
+        e é descartada quando o início não é conhecido (capturas avulsas).
+        """
+        groups: List[list] = []
+        for name, ms in marks:
+            if groups and groups[-1][0] == name:
+                groups[-1][1] = ms
+            else:
+                groups.append([name, ms])
+        prev = start
+        for seq, (name, end) in enumerate(groups):
+            if prev is not None:
+                self.db.execute(
+                    "INSERT INTO steps (run_id, test, name, seq, start_ms, duration_ms, source) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, test, name, seq, prev, end - prev, source),
+                )
+            prev = end
+
+    def _ingest_recording(self, path: Path, meta: dict, plat) -> None:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        m = re.match(r"^(?P<test>.+?)_recording_(?P<ts>\d{8}-\d{6})$", path.stem)
+        frames = doc.get("frames") or []
+        if not m or not frames:
+            return
+        started = _parse_ts(m.group("ts"))
+        elapsed = [float(f.get("elapsed_ms") or 0.0) for f in frames]
+        ended = started + timedelta(milliseconds=elapsed[-1]) if started else None
+        test = m.group("test")
+        run_id = self._steps_run(f"recording:{path.name}", "recording", started, ended, plat, test)
+        self.db.execute("DELETE FROM steps WHERE run_id = ? AND test IS ? AND source = 'recording'", (run_id, test))
+        # `elapsed_ms` conta desde o início da gravação (início do teste)
+        marks = [
+            (_step_name(_FRAME_LABEL_RE.sub("", f.get("label") or ""), f.get("step")), ms) for f, ms in zip(frames, elapsed)
+        ]
+        self._insert_steps(run_id, test, "recording", marks, 0.0)
+
+    def _ingest_screenshots(self, root: Path, plat) -> int:
+        entries: Dict[str, dict] = {}
+        try:
+            for e in json.loads((root / INDEX_NAME).read_text(encoding="utf-8")):
+                if e.get("original"):
+                    entries[e["original"]] = dict(parse_name(Path(e["original"]).stem))
+        except (OSError, ValueError, TypeError):
+            pass
+        for p in root.rglob("*"):
+            if p.suffix.lower() in IMAGE_SUFFIXES and root / STORE_DIRNAME not in p.parents:
+                entries.setdefault(p.relative_to(root).as_posix(), parse_name(p.stem))
+        shots = [e for e in entries.values() if e.get("test")]
+        _assign_runs(shots)
+        runs: Dict[tuple, List[dict]] = {}
+        for e in shots:
+            runs.setdefault((e["test"], e["run"]), []).append(e)
+        added = 0
+        for (test, run), items in sorted(runs.items()):
+            # Só execuções concluídas (com `_end_`) e ainda não ingeridas
+            end = [e for e in items if e["section"] == "end"]
+            steps = sorted((e for e in items if e["section"] == "step"), key=lambda e: e["step"])
+            key = f"screenshot:{test}:{run}"
+            if not end or not steps or self.db.execute("SELECT 1 FROM sources WHERE path = ?", (key,)).fetchone():
+                continue
+            times = [_parse_ts(e["ts"]) for e in steps]
+            ended = _parse_ts(end[0]["ts"])
+            if None in times or ended is None:
+                continue
+            run_id = self._steps_run(key, "screenshot", times[0], ended, plat, test)
+            marks = [
+                (_step_name(e["label"] or "", e.get("method")), (t - times[0]).total_seconds() * 1000.0)
+                for e, t in zip(steps, times)
+            ]
+            # A captura da primeira etapa marca o seu fim; o início do teste não fica registrado
+            self._insert_steps(run_id, test, "screenshot", marks, None)
+            self._mark({"path": key, "kind": "screenshot_run", "size": len(steps), "mtime": 0.0, "sha256": None})
+            added += 1
+        return added
+
+    # -------------------------------------------------------------- consultas
+
+    def _run_filter(self, os_name: Optional[str], last: Optional[int], source: Optional[str] = None):
+        clauses, args = [], []
+        if os_name:
+            clauses.append("p.os = ? COLLATE NOCASE")
+            args.append(os_name)
+        if source:
+            clauses.append("r.source = ?")
+            args.append(source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT r.id FROM runs r LEFT JOIN platforms p ON p.id = r.platform_id {where} ORDER BY r.started_at DESC"
+        if last:
+            sql += " LIMIT ?"
+            args.append(int(last))
+        return [r["id"] for r in self.db.execute(sql, args)]
+
+    def step_samples(self, step: Optional[str] = None, os_name: Optional[str] = None, last: Optional[int] = None) -> Dict[str, List[dict]]:
+        """Amostras por etapa (melhor origem por execução/teste) nas últimas `last` execuções com etapas."""
+        sql = (
+            "SELECT s.run_id, MAX(r.started_at) AS started FROM steps s JOIN runs r ON r.id = s.run_id"
+            " LEFT JOIN platforms p ON p.id = r.platform_id"
+        )
+        args: List[object] = []
+        if os_name:
+            sql += " WHERE p.os = ? COLLATE NOCASE"
+            args.append(os_name)
+        sql += " GROUP BY s.run_id ORDER BY started DESC"
+        if last:
+            sql += " LIMIT ?"
+            args.append(int(last))
+        runs = [r["run_id"] for r in self.db.execute(sql, args)]
+        if not runs:
+            return {}
+        sql = (
+            "SELECT s.run_id, s.test, s.name, s.duration_ms, s.source, r.started_at FROM steps s JOIN runs r ON r.id = s.run_id"
+            f" WHERE s.run_id IN ({','.join('?' * len(runs))})"
+        )
+        args = list(runs)
+        if step:
+            sql += " AND s.name = ?"
+            args.append(step)
+        rows = [dict(r) for r in self.db.execute(sql, args)]
+        best: Dict[tuple, int] = {}
+        for r in rows:
+            k = (r["run_id"], r["test"], r["name"])
+            best[k] = min(best.get(k, len(STEP_SOURCES)), STEP_SOURCES.index(r["source"]))
+        out: Dict[str, List[dict]] = {}
+        for r in rows:
+            if STEP_SOURCES.index(r["source"]) == best[(r["run_id"], r["test"], r["name"])]:
+                out.setdefault(r["name"], []).append(r)
+        return out
+
+    def step_stats(
+        self, step: Optional[str] = None, os_name: Optional[str] = None, last: Optional[int] = None, pct: float = 95.0
+    ) -> Dict[str, dict]:
+        """Resumo (count/mean/p50/p95/p99/max e o percentil `pct`, em ms) por etapa."""
+        out = {}
+        for name, rows in self.step_samples(step, os_name, last).items():
+            values = [r["duration_ms"] for r in rows]
+            out[name] = dict(summarize(values), pct=percentile(values, pct), runs=len({r["run_id"] for r in rows}))
+        return out
+
+    def step_trend(self, step: str, os_name: Optional[str] = None, last: Optional[int] = None) -> List[dict]:
+        """Série por execução (mais antiga primeiro) de uma etapa: p50/max e origem."""
+        by_run: Dict[int, List[dict]] = {}
+        for r in self.step_samples(step, os_name, last).get(step, []):
+            by_run.setdefault(r["run_id"], []).append(r)
+        series = []
+        for run_id, rows in by_run.items():
+            st = summarize(r["duration_ms"] for r in rows)
+            series.append({"run_id": run_id, "started_at": rows[0]["started_at"], "source": rows[0]["source"], **st})
+        return sorted(series, key=lambda e: e["started_at"] or "")
+
+    def flaky_tests(self, os_name: Optional[str] = None, last: Optional[int] = None) -> List[dict]:
+        """Testes com resultados mistos nas últimas execuções do JUnit, com as categorias de falha."""
+        runs = self._run_filter(os_name, last, source="junit")
+        if not runs:
+            return []
+        marks = ",".join("?" * len(runs))
+        out = []
+        for r in self.db.execute(
+            f"SELECT nodeid, COUNT(*) AS runs, SUM(outcome = 'passed') AS passed FROM tests WHERE run_id IN ({marks}) GROUP BY nodeid",
+            runs,
+        ):
+            failed = r["runs"] - (r["passed"] or 0)
+            if not failed:
+                continue
+            cats = {
+                c["category"]: c["n"]
+                for c in self.db.execute(
+                    f"SELECT category, COUNT(*) AS n FROM failures WHERE test = ? AND run_id IN ({marks}) GROUP BY category",
+                    [r["nodeid"]] + runs,
+                )
+            }
+            out.append({"test": r["nodeid"], "runs": r["runs"], "failed": failed, "flaky": bool(r["passed"]), "categories": cats})
+        return sorted(out, key=lambda e: (not e["flaky"], -e["failed"]))
+
+    def counts(self) -> Dict[str, int]:
+        return {t: self.db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("runs", "tests", "steps", "failures", "platforms")}
+
+
+def _step_name(label: str, method: Optional[str] = None) -> str:
+    """Nome da etapa `@_step` (o mesmo da linha do tempo) para uma captura/quadro."""
+    if method:
+        return method
+    return _LABEL_STEPS.get(label) or _VALUE_LABELS.sub(r"\1", label)
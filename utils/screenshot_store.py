@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+STORE_DIRNAME = "store"
+INDEX_NAME = "index.json"
+
+# Só capturas de etapa entram no dedupe perceptual: finais/falhas são a
+# evidência do teste e precisam ser guardadas byte a byte (o dHash de 64 bits
+# não distingue telas com o mesmo layout e conteúdo diferente).
+PERCEPTUAL_SECTIONS = ("step",)
+
+# <nodeid sanitizado>_step_<NN>_<rótulo>[@<método>]_<ts> | <nodeid>_end_<ts> | <nodeid>_fail_<ts>
+# (`@<método>`: etapa `@_step` do Page Object que fez a captura; ausente nos nomes antigos)
+_NAME_RE = re.compile(
+    r"^(?P<test>.+?)_(?:step_(?P<idx>\d+)_(?P<label>.+?)(?:@(?P<method>[A-Za-z_]\w*))?|(?P<section>end|fail))"
+    r"_(?P<ts>\d{8}-\d{6})$"
+)
+
+
+def parse_name(stem: str) -> Dict[str, object]:
+    """Extrai teste, seção (step/end/fail), índice/rótulo/método da etapa e timestamp do nome do arquivo."""
+    m = _NAME_RE.match(stem)
+    if not m:
+        return {"test": None, "section": "unknown", "step": None, "label": None, "method": None, "ts": None}
+    section = m.group("section") or "step"
+    return {
+        "test": m.group("test"),
+        "section": section,
+        "step": int(m.group("idx")) if m.group("idx") is not None else None,
+        "label": m.group("label"),
+        "method": m.group("method"),
+        "ts": m.group("ts"),
+    }
+
+
+def dhash(img: Image.Image, size: int = 8) -> int:
+    """Hash perceptual por diferença (dHash) de `size*size` bits."""
+    small = img.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    px = list(small.getdata())
+    bits = 0
+    for row in range(size):
+        base = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (1 if px[base + col] > px[base + col + 1] else 0)
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _assign_runs(entries: List[dict]) -> None:
+    # Comentário (PT-BR): Uma execução de um teste começa no `step_00` (ou em
+    # qualquer etapa com índice menor/igual ao anterior) e termina no `_end_`.
+    # O id da execução é o timestamp da primeira imagem dela.
+    state: Dict[str, dict] = {}
+    rank = {"step": 0, "fail": 1, "end": 2}
+    ordered = sorted(
+        entries,
+        key=lambda e: (e.get("test") or "", e.get("ts") or "", rank.get(e.get("section"), 3), e.get("step") or 0),
+    )
+    for e in ordered:
+        test = e.get("test")
+        if not test:
+            e["run"] = None
+            continue
+        st = state.get(test)
+        section = e.get("section")
+        new_run = st is None or st["closed"]
+        if section == "step" and st is not None and e.get("step") is not None and e["step"] <= st["last_step"]:
+            new_run = True
+        if new_run:
+            st = state[test] = {"run": e.get("ts"), "last_step": -1, "closed": False}
+        if section == "step" and e.get("step") is not None:
+            st["last_step"] = e["step"]
+        elif section == "end":
+            st["closed"] = True
+        e["run"] = st["run"]
+
+
+class ScreenshotStore:
+    """
+    Índice (e armazenamento opcional por conteúdo) das screenshots.
+
+    Comentário (PT-BR): Gera `index.json` de forma incremental: arquivos já
+    indexados (mesmo tamanho/mtime) não são relidos. Com `store=True`, cada
+    imagem é movida para `store/<aa>/<sha256>.<ext>`; conteúdos idênticos viram
+    um único blob. Com `dedupe_distance`, capturas de etapa (`_step_`) da mesma
+    etapa do mesmo teste cujo dHash difere em até N bits reaproveitam o blob já
+    existente (a imagem nova é descartada); capturas `_end_`/`_fail_` só são
+    deduplicadas por conteúdo idêntico. O índice mapeia teste/etapa/execução -> blob.
+    """
+
+    def __init__(self, screenshots_dir, store: bool = False, dedupe_distance: Optional[int] = None, index_path=None):
+        self.root = Path(screenshots_dir)
+        self.store = store
+        self.dedupe_distance = dedupe_distance
+        self.index_path = Path(index_path) if index_path else self.root / INDEX_NAME
+        self.blobs_dir = self.root / STORE_DIRNAME
+
+    def _load(self) -> List[dict]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            return data if isinstance(data, list) else []
+        except (OSError, ValueError):
+            return []
+
+    def _save(self, entries: List[dict]) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(self.index_path.name + ".part")
+        tmp.write_text(json.dumps(entries, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def _loose_images(self) -> List[Path]:
+        files = []
+        for p in self.root.rglob("*"):
+            if p.suffix.lower() not in IMAGE_SUFFIXES or not p.is_file():
+                continue
+            if self.blobs_dir in p.parents:
+                continue
+            files.append(p)
+        return sorted(files)
+
+    def update(self) -> Dict[str, int]:
+        """Atualiza o índice (e o armazenamento, se habilitado); retorna contadores."""
+        stats = {"indexed": 0, "reused": 0, "new_blobs": 0, "dedup_exact": 0, "dedup_perceptual": 0, "bytes_saved": 0, "dropped": 0}
+        entries = []
+        # Remove entradas cujo arquivo não existe mais (ex.: limpeza de screenshots)
+        for e in self._load():
+            if (self.root / e.get("file", "")).is_file():
+                entries.append(e)
+            else:
+                stats["dropped"] += 1
+        by_original = {e.get("original"): e for e in entries}
+        by_sha = {e["sha256"]: e["file"] for e in entries if e.get("sha256")}
+        by_step: Dict[Tuple, List[Tuple[int, str, str]]] = {}
+        for e in entries:
+            if e.get("dhash") is not None and e.get("section") in PERCEPTUAL_SECTIONS:
+                by_step.setdefault(self._step_key(e), []).append((int(e["dhash"], 16), e["sha256"], e["file"]))
+
+        for path in self._loose_images():
+            rel = path.relative_to(self.root).as_posix()
+            st = path.stat()
+            known = by_original.get(rel)
+            unchanged = known is not None and known.get("bytes") == st.st_size and known.get("mtime") == int(st.st_mtime)
+            if unchanged and not self.store:
+                stats["reused"] += 1
+                continue
+            entry = self._describe(path, rel, st)
+            if self.store:
+                self._ingest(path, entry, by_sha, by_step, stats)
+            if known is not None:
+                entries.remove(known)
+            entries.append(entry)
+            by_original[rel] = entry
+            stats["indexed"] += 1
+
+        _assign_runs(entries)
+        entries.sort(key=lambda e: e.get("original") or e.get("file") or "")
+        self._save(entries)
+        stats["total"] = len(entries)
+        return stats
+
+    @staticmethod
+    def _step_key(entry: dict) -> Tuple:
+        return entry.get("test"), entry.get("section"), entry.get("step"), entry.get("label")
+
+    def _describe(self, path: Path, rel: str, st: os.stat_result) -> dict:
+        info = parse_name(path.stem)
+        entry = {
+            "file": rel,
+            "original": rel,
+            "section": info["section"],
+            "timestamp": datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+            "width": None,
+            "height": None,
+            "valid": True,
+            "test": info["test"],
+            "step": info["step"],
+            "label": info["label"],
+            "ts": info["ts"],
+            "run": None,
+            "bytes": st.st_size,
+            "mtime": int(st.st_mtime),
+            "sha256": None,
+            "dhash": None,
+            "dedupe": None,
+        }
+        try:
+            with Image.open(path) as img:
+                entry["width"], entry["height"] = img.size
+                if self.store and self.dedupe_distance is not None and info["section"] in PERCEPTUAL_SECTIONS:
+                    entry["dhash"] = f"{dhash(img):016x}"
+        except Exception:
+            entry["valid"] = False
+        return entry
+
+    def _ingest(self, path: Path, entry: dict, by_sha: dict, by_step: dict, stats: Dict[str, int]) -> None:
+        sha = _sha256(path)
+        entry["sha256"] = sha
+        if sha in by_sha:
+            entry["file"] = by_sha[sha]
+            entry["dedupe"] = "exact"
+            stats["dedup_exact"] += 1
+            stats["bytes_saved"] += entry["bytes"]
+            path.unlink()
+            return
+        if entry["dhash"] is not None and entry["section"] in PERCEPTUAL_SECTIONS:
+            h = int(entry["dhash"], 16)
+            for other, other_sha, other_file in by_step.get(self._step_key(entry), []):
+                if hamming(h, other) <= self.dedupe_distance:
+                    entry["file"] = other_file
+                    entry["sha256"] = other_sha
+                    entry["dedupe"] = "perceptual"
+                    stats["dedup_perceptual"] += 1
+                    stats["bytes_saved"] += entry["bytes"]
+                    path.unlink()
+                    return
+        blob = self.blobs_dir / sha[:2] / f"{sha}{path.suffix.lower()}"
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(path, blob)
+        except OSError:
+            shutil.move(str(path), str(blob))
+        entry["file"] = blob.relative_to(self.root).as_posix()
+        by_sha[sha] = entry["file"]
+        if entry["dhash"] is not None:
+            by_step.setdefault(self._step_key(entry), []).append((int(entry["dhash"], 16), sha, entry["file"]))
+        stats["new_blobs"] += 1
@@ -0,0 +1,212 @@
+import base64
+import io
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Set
+
+from PIL import Image
+
+from utils.annotate import annotate_png
+from utils.capture import capture
+
+
+_FORMAT_SUFFIX = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+
+class ScreenshotWriter:
+    """
+    Grava screenshots em background (decodificação base64, re-encode e escrita em disco).
+
+    Comentário (PT-BR): A thread do teste apenas obtém os bytes da screenshot e
+    enfileira o trabalho. A fila é limitada (`max_pending`): quando cheia, o
+    `submit` bloqueia até liberar espaço (backpressure), evitando acumular
+    dezenas de imagens 2560x1440 em memória.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, reencode: Optional[str] = None, quality: int = 85):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="shot-writer")
+        self._slots = threading.BoundedSemaphore(max(1, int(max_pending)))
+        self._lock = threading.Lock()
+        self._pending: Set[Future] = set()
+        self._reencode = (reencode or "").lower() or None
+        if self._reencode == "jpg":
+            self._reencode = "jpeg"
+        if self._reencode and self._reencode not in _FORMAT_SUFFIX:
+            raise ValueError(f"Formato de re-encode não suportado: {reencode}")
+        self._quality = int(quality)
+        self._closed = False
+        self._submitted = 0
+        self._written = 0
+        self._bytes = 0
+        self._blocked_s = 0.0
+        self._write_s = 0.0
+        self._errors = 0
+
+    def submit_base64(
+        self,
+        png_b64: str,
+        path,
+        annotation: Optional[Mapping[str, object]] = None,
+        fmt: str = "png",
+        quality: Optional[int] = None,
+    ) -> Future:
+        """
+        Enfileira a gravação de uma screenshot em base64 no caminho indicado.
+
+        `fmt` é o formato dos bytes capturados (png/jpeg/webp; perfis de captura
+        via CDP). Com `annotation`, o destaque do elemento e o rótulo são
+        desenhados na imagem pela thread de gravação (ver `utils.annotate`).
+        """
+        if self._closed:
+            raise RuntimeError("ScreenshotWriter já foi encerrado")
+        t0 = time.perf_counter()
+        self._slots.acquire()
+        blocked = time.perf_counter() - t0
+        try:
+            fut = self._executor.submit(self._write, png_b64, Path(path), annotation, fmt, quality)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._submitted += 1
+            self._blocked_s += blocked
+            self._pending.add(fut)
+        fut.add_done_callback(self._done)
+        return fut
+
+    def _done(self, fut: Future) -> None:
+        with self._lock:
+            self._pending.discard(fut)
+            if fut.exception() is not None:
+                self._errors += 1
+        self._slots.release()
+
+    def _write(
+        self,
+        png_b64: str,
+        path: Path,
+        annotation: Optional[Mapping[str, object]] = None,
+        fmt: str = "png",
+        quality: Optional[int] = None,
+    ) -> Path:
+        t0 = time.perf_counter()
+        target = self._reencode if self._reencode and self._reencode != "png" else fmt
+        data, path = render_capture(base64.b64decode(png_b64), path, annotation, fmt, target, quality or self._quality)
+        _atomic_write(path, data)
+        with self._lock:
+            self._written += 1
+            self._bytes += len(data)
+            self._write_s += time.perf_counter() - t0
+        return path
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Aguarda a conclusão de todas as gravações pendentes."""
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.flush(timeout=timeout)
+        self._closed = True
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "submitted": self._submitted,
+                "written": self._written,
+                "bytes": self._bytes,
+                "blocked_s": self._blocked_s,
+                "write_s": self._write_s,
+                "errors": self._errors,
+            }
+
+
+def encode_image(img: Image.Image, path: Path, fmt: str = "png", quality: int = 85):
+    """Codifica a imagem no formato pedido; retorna (bytes, caminho com a extensão ajustada)."""
+    if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, format=fmt.upper(), quality=quality)
+    return buf.getvalue(), Path(path).with_suffix(_FORMAT_SUFFIX[fmt])
+
+
+def render_capture(
+    data: bytes,
+    path,
+    annotation: Optional[Mapping[str, object]],
+    fmt: str = "png",
+    target: str = "png",
+    quality: int = 85,
+):
+    """
+    Prepara os bytes finais de uma captura: aplica a anotação e/ou converte para
+    `target` quando necessário; caso contrário grava os bytes como vieram.
+    Retorna (bytes, caminho com a extensão do formato final).
+    """
+    if annotation or target != fmt:
+        return encode_image(annotate_png(data, annotation), path, target, quality)
+    return data, Path(path).with_suffix(_FORMAT_SUFFIX[fmt])
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Escrita atômica: evita arquivos parciais caso o processo seja interrompido
+    tmp = path.with_name(path.name + ".part")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def grab_screenshot(
+    driver,
+    annotation: Optional[Mapping[str, object]] = None,
+    region: Optional[Mapping[str, float]] = None,
+):
+    """
+    Captura a screenshot conforme o perfil do driver, sem gravar.
+
+    Retorna (base64, formato, anotação ainda não aplicada, qualidade do perfil).
+    """
+    profile = getattr(driver, "_capture_profile", None)
+    if profile is not None and not profile.is_default:
+        try:
+            b64, fmt, annotation = capture(driver, profile, region, annotation)
+            return b64, fmt, annotation, profile.quality
+        except Exception:
+            # CDP indisponível (ex.: driver remoto sem suporte): captura padrão
+            pass
+    return driver.get_screenshot_as_base64(), "png", annotation, None
+
+
+def save_screenshot(
+    driver,
+    path,
+    annotation: Optional[Mapping[str, object]] = None,
+    region: Optional[Mapping[str, float]] = None,
+) -> None:
+    """
+    Captura uma screenshot do driver e grava em `path`.
+
+    Se houver um `ScreenshotWriter` associado ao driver (`driver._screenshot_writer`),
+    apenas a captura ocorre na thread atual; decodificação e escrita vão para background.
+    Com `annotation` (modo de anotação `image`), o destaque é desenhado na imagem
+    em vez de injetado no DOM. Com um perfil de captura (`driver._capture_profile`)
+    diferente do padrão, a imagem vem do CDP já recortada em `region`, reduzida e
+    no formato do perfil; a extensão de `path` é ajustada ao formato.
+    """
+    writer = getattr(driver, "_screenshot_writer", None)
+    profile = getattr(driver, "_capture_profile", None)
+    if writer is None and not annotation and (profile is None or profile.is_default):
+        driver.save_screenshot(str(path))
+        return
+    b64, fmt, annotation, quality = grab_screenshot(driver, annotation, region)
+    if writer is not None:
+        writer.submit_base64(b64, path, annotation, fmt, quality)
+        return
+    data, path = render_capture(base64.b64decode(b64), path, annotation, fmt, fmt, quality or 85)
+    _atomic_write(path, data)
@@ -0,0 +1,192 @@
+import base64
+import io
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from utils.annotate import annotate_png
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_IEND = struct.pack(">I", 0) + b"IEND" + struct.pack(">I", zlib.crc32(b"IEND"))
+# Assinatura (8) + IHDR (25): o acTL começa logo depois e é reescrito a cada quadro
+_ACTL_OFFSET = 8 + 25
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _png_chunks(data: bytes):
+    pos = len(_PNG_SIGNATURE)
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        kind = data[pos + 4:pos + 8]
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+class ApngWriter:
+    """
+    Escreve um APNG quadro a quadro, sem manter os quadros anteriores em memória.
+
+    Comentário (PT-BR): Cada quadro é codificado como PNG pelo Pillow e seus
+    blocos IDAT são anexados ao arquivo (`IDAT` no primeiro quadro, `fdAT` nos
+    demais). Após cada quadro o arquivo recebe `IEND` e o contador do `acTL` é
+    atualizado no lugar, então o APNG em disco é válido mesmo se o processo for
+    interrompido no meio do teste.
+    """
+
+    def __init__(self, path, frame_ms: int = 1000, compress_level: int = 6):
+        self.path = Path(path)
+        self.frame_ms = int(frame_ms)
+        self.compress_level = int(compress_level)
+        self.size: Optional[Tuple[int, int]] = None
+        self.frames = 0
+        self._seq = 0
+        self._fh = None
+
+    def _fctl(self) -> bytes:
+        w, h = self.size
+        data = struct.pack(">IIIIIHHBB", self._seq, w, h, 0, 0, self.frame_ms, 1000, 0, 0)
+        self._seq += 1
+        return _chunk(b"fcTL", data)
+
+    def append(self, img: Image.Image) -> None:
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        if self.size is None:
+            self.size = img.size
+        elif img.size != self.size:
+            img = ImageOps.pad(img, self.size, color=(255, 255, 255))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG", compress_level=self.compress_level)
+        chunks = list(_png_chunks(buf.getvalue()))
+        idat = [data for kind, data in chunks if kind == b"IDAT"]
+        out = io.BytesIO()
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "w+b")
+            ihdr = next(data for kind, data in chunks if kind == b"IHDR")
+            out.write(_PNG_SIGNATURE + _chunk(b"IHDR", ihdr) + _chunk(b"acTL", struct.pack(">II", 0, 0)))
+            out.write(self._fctl())
+            for data in idat:
+                out.write(_chunk(b"IDAT", data))
+        else:
+            # Sobrescreve o IEND anterior
+            self._fh.seek(-len(_IEND), os.SEEK_END)
+            out.write(self._fctl())
+            for data in idat:
+                out.write(_chunk(b"fdAT", struct.pack(">I", self._seq) + data))
+                self._seq += 1
+        out.write(_IEND)
+        self._fh.write(out.getvalue())
+        self.frames += 1
+        self._fh.seek(_ACTL_OFFSET)
+        self._fh.write(_chunk(b"acTL", struct.pack(">II", self.frames, 0)))
+        self._fh.seek(0, os.SEEK_END)
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class StepRecorder:
+    """
+    Grava as etapas de um teste em um único APNG reduzido, com sidecar JSON.
+
+    Comentário (PT-BR): Substitui os PNGs de etapa (`..._step_NN_<rótulo>_<ts>.png`)
+    por `<teste>_recording_<ts>.apng` + `.json` (índice do quadro -> rótulo e etapa).
+    A redução (`width`) e a codificação ocorrem em uma thread própria; a fila é
+    limitada (`max_pending`), então a memória fica em poucos quadros qualquer que
+    seja a duração do teste. As capturas de falha e de fim continuam em arquivos
+    separados (ver `conftest.py`).
+    """
+
+    def __init__(self, path, width: int = 960, frame_ms: int = 1000, max_pending: int = 2):
+        self.path = Path(path)
+        self.sidecar = self.path.with_suffix(".json")
+        self.width = int(width)
+        self._apng = ApngWriter(self.path, frame_ms=frame_ms)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="step-recorder")
+        self._slots = threading.BoundedSemaphore(max(1, int(max_pending)))
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._frames: List[Dict[str, object]] = []
+        self._encode_s = 0.0
+        self._errors = 0
+        self._closed = False
+
+    def add_frame(
+        self,
+        png_b64: str,
+        label: str,
+        annotation: Optional[Mapping[str, object]] = None,
+        step: Optional[str] = None,
+    ) -> None:
+        """Enfileira um quadro (screenshot em base64, PNG/JPEG/WebP) com o rótulo e a etapa (`@_step`)."""
+        if self._closed:
+            return
+        meta = {
+            "label": label,
+            "step": step,
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "elapsed_ms": round((time.perf_counter() - self._t0) * 1000.0, 1),
+        }
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._encode, png_b64, annotation, meta)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _encode(self, png_b64: str, annotation, meta: Dict[str, object]) -> None:
+        t0 = time.perf_counter()
+        try:
+            img = annotate_png(base64.b64decode(png_b64), annotation)
+            if img.width > self.width:
+                img = img.resize((self.width, max(1, round(img.height * self.width / img.width))), Image.Resampling.LANCZOS)
+            self._apng.append(img)
+            with self._lock:
+                self._frames.append(dict(meta, index=len(self._frames)))
+        except Exception:
+            with self._lock:
+                self._errors += 1
+        finally:
+            with self._lock:
+                self._encode_s += time.perf_counter() - t0
+            self._slots.release()
+
+    def close(self) -> Dict[str, object]:
+        """Finaliza o APNG e grava o sidecar; retorna as estatísticas do teste."""
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+            self._apng.close()
+            if self._frames:
+                doc = {
+                    "file": self.path.name,
+                    "size": list(self._apng.size or ()),
+                    "frame_ms": self._apng.frame_ms,
+                    "frames": self._frames,
+                }
+                tmp = self.sidecar.with_name(self.sidecar.name + ".part")
+                tmp.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+                os.replace(tmp, self.sidecar)
+        return self.stats()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            size = self.path.stat().st_size if self._frames and self.path.exists() else 0
+            return {"frames": len(self._frames), "bytes": size, "encode_s": self._encode_s, "errors": self._errors}
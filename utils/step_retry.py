@@ -0,0 +1,91 @@
+import threading
+from pathlib import Path
+from typing import Dict, Mapping
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+
+# Falhas que costumam passar sozinhas (página lenta, re-renderização, overlay)
+TRANSIENT = ("timeout", "stale", "intercepted")
+
+# Tentativas extras por chamada de etapa (o orçamento global limita o total)
+MAX_STEP_RETRIES = 2
+
+# Campos de múltipla escolha: o checkpoint acumula os itens de cada etapa
+LIST_KEYS = ("hobbies", "subjects")
+
+
+def classify(exc: BaseException) -> str:
+    """Categoria da falha de uma etapa: timeout, stale, intercepted, assertion ou other."""
+    if isinstance(exc, TimeoutException):
+        return "timeout"
+    if isinstance(exc, StaleElementReferenceException):
+        return "stale"
+    if isinstance(exc, (ElementClickInterceptedException, ElementNotInteractableException)):
+        return "intercepted"
+    if isinstance(exc, AssertionError):
+        return "assertion"
+    return "other"
+
+
+def state_matches(state: Mapping[str, object], key: str, expected) -> bool:
+    """
+    Confere um valor esperado contra o estado lido do formulário (`read_form_state`).
+
+    `hobbies`/`subjects` esperam um item (ou lista de itens) presente na lista;
+    `birth_date` espera a tupla (dia, mês por extenso, ano) e compara com o
+    texto do input ("10 Oct 1990"); `picture` compara só o nome do arquivo.
+    """
+    value = state.get(key)
+    if key in LIST_KEYS:
+        items = expected if isinstance(expected, (list, tuple)) else [expected]
+        return all(str(item) in (value or []) for item in items)
+    if key == "birth_date":
+        day, month, year = expected
+        return value == f"{int(day):02d} {str(month)[:3]} {year}"
+    if key == "picture":
+        return value == Path(str(expected)).name
+    return (value or "") == str(expected)
+
+
+def merge_checkpoint(checkpoint: Dict[str, object], values: Mapping[str, object]) -> None:
+    """Acrescenta ao checkpoint os valores deixados por uma etapa concluída."""
+    for key, value in values.items():
+        if key in LIST_KEYS:
+            items = checkpoint.setdefault(key, [])
+            if value not in items:
+                items.append(value)
+        else:
+            checkpoint[key] = value
+
+
+class RetryBudget:
+    """
+    Orçamento global de novas tentativas de etapa (por processo do pytest).
+
+    Comentário (PT-BR): Compartilhado por todos os testes do processo (cada
+    worker do xdist tem o seu), evita que um ambiente degradado transforme cada
+    falha em várias execuções lentas da mesma etapa.
+    """
+
+    def __init__(self, total: int):
+        self.total = max(0, int(total))
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return self.total - self.used
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.used >= self.total:
+                return False
+            self.used += 1
+            return True
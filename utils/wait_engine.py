@@ -0,0 +1,296 @@
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+# Sobreposições conhecidas do demoqa.com que podem interceptar cliques
+DEFAULT_OVERLAYS = (
+    "#fixedban",
+    "#adplus-anchor",
+    "footer",
+    "[id^='google_ads_iframe']",
+)
+
+# Comentário (PT-BR): Sonda única em JS. Para cada localizador retorna, em uma só
+# chamada, presença, visibilidade, habilitação, se está no viewport e qual
+# elemento (se algum) cobre o centro do alvo. Com `recover=true`, aplica a
+# recuperação direcionada no mesmo round trip: remove overlays conhecidos,
+# fecha popups (datepicker/menus) ou centraliza o elemento no viewport.
+_PROBE_JS = """
+var locs = arguments[0], cond = arguments[1], recover = arguments[2], overlays = arguments[3];
+function find(l) {
+  var by = l[0], v = l[1];
+  try {
+    if (by === 'id') return document.getElementById(v);
+    if (by === 'css selector') return document.querySelector(v);
+    if (by === 'class name') return document.getElementsByClassName(v)[0] || null;
+    if (by === 'name') return document.getElementsByName(v)[0] || null;
+    if (by === 'tag name') return document.getElementsByTagName(v)[0] || null;
+    if (by === 'xpath') return document.evaluate(v, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  } catch (e) {}
+  return null;
+}
+function describe(n) {
+  if (!n || !n.tagName) return null;
+  var cls = (typeof n.className === 'string' && n.className.trim()) ? '.' + n.className.trim().split(/\\s+/).join('.') : '';
+  return n.tagName.toLowerCase() + (n.id ? '#' + n.id : '') + cls;
+}
+var out = {ready: document.readyState, items: [], recovered: []};
+var elements = [];
+locs.forEach(function (l) {
+  var el = find(l);
+  var st = {present: !!el, visible: false, enabled: false, in_view: false, obstructed_by: null};
+  if (el) {
+    var cs = window.getComputedStyle(el);
+    var r = el.getBoundingClientRect();
+    st.visible = r.width > 0 && r.height > 0 && cs.visibility !== 'hidden' && cs.display !== 'none' && parseFloat(cs.opacity || '1') > 0;
+    st.enabled = !el.disabled;
+    st.in_view = r.top >= 0 && r.left >= 0 && r.bottom <= window.innerHeight && r.right <= window.innerWidth;
+    if (st.visible && cond === 'clickable') {
+      if (!st.in_view && recover) {
+        el.scrollIntoView({block: 'center'});
+        r = el.getBoundingClientRect();
+        st.in_view = true;
+        out.recovered.push('scroll');
+      }
+      var top = document.elementFromPoint(r.left + r.width / 2, r.top + r.height / 2);
+      if (top && top !== el && !el.contains(top) && !(top.contains && top.contains(el))) {
+        st.obstructed_by = describe(top);
+        if (recover) {
+          var removed = false;
+          overlays.forEach(function (sel) {
+            document.querySelectorAll(sel).forEach(function (o) {
+              if (o === top || o.contains(top)) { o.remove(); removed = true; }
+            });
+          });
+          if (removed) {
+            out.recovered.push('overlay');
+          } else if (top.closest && top.closest('.react-datepicker-popper, [class*="menu"]')) {
+            var ae = document.activeElement;
+            if (ae) {
+              ae.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', bubbles: true}));
+              if (ae.blur) ae.blur();
+            }
+            out.recovered.push('close_popup');
+          } else {
+            el.scrollIntoView({block: 'center'});
+            out.recovered.push('scroll');
+          }
+        }
+      }
+    }
+  }
+  elements.push(el);
+  out.items.push(st);
+});
+return [elements, out];
+"""
+
+# Comentário (PT-BR): Prontidão para captura ("render quiescence") em uma única
+# chamada assíncrona: documento carregado, nenhuma animação/transição finita em
+# execução, nenhuma mutação do DOM na janela `quiet` e dois quadros
+# (requestAnimationFrame) estáveis em seguida. `limit` limita a espera; um timer
+# próprio garante o retorno mesmo se o rAF estiver suspenso (aba em segundo plano).
+_SETTLE_JS = """
+var quiet = arguments[0], limit = arguments[1], done = arguments[arguments.length - 1];
+var t0 = performance.now(), last = t0, finished = false, mutations = 0;
+var obs = new MutationObserver(function (list) { mutations += list.length; last = performance.now(); });
+try {
+  obs.observe(document.documentElement || document, {subtree: true, childList: true, attributes: true, characterData: true});
+} catch (e) {}
+function running() {
+  try {
+    return document.getAnimations().filter(function (a) {
+      if (a.playState !== 'running') return false;
+      var t = a.effect && a.effect.getComputedTiming ? a.effect.getComputedTiming() : null;
+      return !(t && t.iterations === Infinity);
+    }).length;
+  } catch (e) { return 0; }
+}
+function finish(reason) {
+  if (finished) return;
+  finished = true;
+  obs.disconnect();
+  done({reason: reason, elapsed_ms: Math.round(performance.now() - t0), mutations: mutations, animations: running()});
+}
+setTimeout(function () { finish('timeout'); }, limit);
+function tick() {
+  if (finished) return;
+  if (document.readyState === 'complete' && running() === 0 && performance.now() - last >= quiet) {
+    requestAnimationFrame(function () {
+      requestAnimationFrame(function () {
+        if (running() === 0 && performance.now() - last >= quiet) finish('settled'); else setTimeout(tick, 16);
+      });
+    });
+    return;
+  }
+  setTimeout(tick, 16);
+}
+tick();
+"""
+
+
+class WaitEngine:
+    """
+    Espera central com orçamento de tempo por teste e polling adaptativo.
+
+    Comentário (PT-BR): Substitui o padrão "espera clicável -> refresh -> nova
+    espera -> presença". Cada tentativa é uma única avaliação JS que verifica
+    todas as condições; o intervalo entre tentativas cresce de `min_poll` até
+    `max_poll`. Em vez de `driver.refresh()`, aplica recuperações direcionadas
+    (overlay, popup aberto, rolagem) e conta quantas vezes cada uma ocorreu.
+    Ao esgotar o timeout com o elemento presente, devolve-o mesmo assim
+    (`presence_fallback`), preservando o comportamento anterior dos fillers.
+    """
+
+    def __init__(
+        self,
+        driver,
+        budget_s: Optional[float] = None,
+        min_poll: float = 0.05,
+        max_poll: float = 0.5,
+        backoff: float = 1.6,
+        overlays: Sequence[str] = DEFAULT_OVERLAYS,
+    ):
+        self.driver = driver
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.overlays = list(overlays)
+        self.metrics: Counter = Counter()
+        self._budget_s = budget_s
+        self._budget_left = budget_s
+
+    # --- Orçamento por teste ---
+    def begin_test(self, budget_s: Optional[float] = None) -> None:
+        if budget_s is not None:
+            self._budget_s = budget_s
+        self._budget_left = self._budget_s
+
+    @property
+    def budget_left(self) -> Optional[float]:
+        return self._budget_left
+
+    def pop_metrics(self) -> Dict[str, int]:
+        data = dict(self.metrics)
+        self.metrics.clear()
+        return data
+
+    def record(self, name: str, n: int = 1) -> None:
+        """Registra uma recuperação feita fora do motor (ex.: nova navegação)."""
+        self.metrics[name] += n
+
+    # --- Sonda ---
+    def probe(self, locators: Iterable[Tuple[str, str]], condition: str = "present", recover: bool = False):
+        locs = [[by, value] for by, value in locators]
+        try:
+            elements, out = self.driver.execute_script(_PROBE_JS, locs, condition, recover, self.overlays)
+        except WebDriverException:
+            # Página em navegação/recarga: trata como "ainda não pronto"
+            self.metrics["probe_errors"] += 1
+            return [None] * len(locs), {"ready": "loading", "items": [{"present": False}] * len(locs), "recovered": []}
+        self.metrics["probes"] += 1
+        for name in out.get("recovered") or []:
+            self.metrics[f"recover_{name}"] += 1
+        return elements, out
+
+    @staticmethod
+    def _satisfied(st: dict, condition: str) -> bool:
+        if not st.get("present"):
+            return False
+        if condition == "present":
+            return True
+        if not st.get("visible"):
+            return False
+        if condition == "visible":
+            return True
+        return bool(st.get("enabled")) and not st.get("obstructed_by")
+
+    def _effective_timeout(self, timeout: float) -> float:
+        if self._budget_left is None:
+            return timeout
+        if self._budget_left <= 0:
+            self.metrics["budget_exhausted"] += 1
+            raise TimeoutException(f"Orçamento de espera do teste esgotado ({self._budget_s:.1f}s)")
+        return min(timeout, self._budget_left)
+
+    # --- Esperas ---
+    def wait_all(
+        self,
+        locators: Sequence[Tuple[str, str]],
+        condition: str = "present",
+        timeout: float = 20.0,
+        fallback_presence: bool = True,
+    ) -> List:
+        """Aguarda todos os localizadores satisfazerem a condição; retorna os elementos."""
+        limit = self._effective_timeout(timeout)
+        timeline = getattr(self.driver, "_command_timeline", None)
+        t0 = time.perf_counter()
+        try:
+            if timeline is not None:
+                with timeline.phase("wait"):
+                    return self._poll(locators, condition, limit, fallback_presence)
+            return self._poll(locators, condition, limit, fallback_presence)
+        finally:
+            if self._budget_left is not None:
+                self._budget_left -= time.perf_counter() - t0
+
+    def _poll(self, locators, condition, limit, fallback_presence):
+        self.metrics["waits"] += 1
+        deadline = time.perf_counter() + limit
+        interval = self.min_poll
+        attempt = 0
+        while True:
+            elements, out = self.probe(locators, condition, recover=attempt > 0)
+            items = out.get("items") or []
+            if items and all(self._satisfied(st, condition) for st in items):
+                if attempt > 0:
+                    self.metrics["retried_waits"] += 1
+                return elements
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+            interval = min(self.max_poll, interval * self.backoff)
+            attempt += 1
+        if fallback_presence and condition != "present" and elements and all(e is not None for e in elements):
+            self.metrics["presence_fallback"] += 1
+            return elements
+        self.metrics["timeouts"] += 1
+        raise TimeoutException(
+            f"Timeout ({limit:.1f}s) aguardando {list(locators)} [{condition}]; último estado: {out}"
+        )
+
+    # --- Prontidão para captura ---
+    def settle(self, quiet_ms: int = 100, max_ms: int = 2000) -> Dict[str, object]:
+        """
+        Aguarda a página ficar visualmente estável (ver `_SETTLE_JS`), até `max_ms`.
+
+        Retorna `reason` (`settled`/`timeout`/`error`) e o tempo gasto; nunca falha.
+        """
+        timeline = getattr(self.driver, "_command_timeline", None)
+        try:
+            if timeline is not None:
+                with timeline.phase("wait"):
+                    out = self.driver.execute_async_script(_SETTLE_JS, int(quiet_ms), int(max_ms))
+            else:
+                out = self.driver.execute_async_script(_SETTLE_JS, int(quiet_ms), int(max_ms))
+            out = dict(out or {})
+        except WebDriverException:
+            out = {"reason": "error", "elapsed_ms": 0}
+        self.metrics["settles"] += 1
+        self.metrics["settle_ms"] += int(out.get("elapsed_ms") or 0)
+        if out.get("reason") != "settled":
+            self.metrics[f"settle_{out.get('reason')}"] += 1
+        return out
+
+    def present(self, locator: Tuple[str, str], timeout: float = 20.0):
+        return self.wait_all([locator], "present", timeout)[0]
+
+    def visible(self, locator: Tuple[str, str], timeout: float = 20.0, fallback_presence: bool = False):
+        return self.wait_all([locator], "visible", timeout, fallback_presence)[0]
+
+    def clickable(self, locator: Tuple[str, str], timeout: float = 20.0, fallback_presence: bool = True):
+        return self.wait_all([locator], "clickable", timeout, fallback_presence)[0]